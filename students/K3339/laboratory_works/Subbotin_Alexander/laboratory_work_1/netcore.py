@@ -0,0 +1,518 @@
+"""
+Общее ядро серверов лабораторной работы 1.
+
+Цикл событий на selectors в одном потоке принимает соединения, читает из
+них и отправляет накопленное, закрывает простаивающие соединения и
+останавливается по SIGINT/SIGTERM, дав соединениям дописать ответы.
+Протокол задачи - объект Handler: цикл вызывает его методы при событиях,
+а обработчик отвечает через Connection.sendall/sendfile, которые не
+блокируют, а ставят данные в очередь соединения.
+
+    server = Server(MyHandler(), 'localhost', 8080, workers=4, processes=2)
+    server.serve_forever()
+
+- udp=True - датаграммы вместо соединений: за одно пробуждение читается
+  до DATAGRAM_BATCH датаграмм через recvfrom_into в заранее выделенный
+  буфер, ответ - Server.sendto;
+- workers - пул потоков для долгой работы (Server.submit), результат
+  возвращается в цикл событий;
+- processes - столько процессов (только Unix): для TCP с общим слушающим
+  сокетом, для UDP у каждого процесса свой сокет с SO_REUSEPORT, и ядро
+  распределяет датаграммы по адресу отправителя;
+- metrics - счётчики соединений, байтов и датаграмм, hooks - функции
+  hook(event, conn), вызываемые при accept, close, timeout и error.
+"""
+import heapq
+import os
+import selectors
+import signal
+import socket
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+BACKLOG = 1024
+RECV_SIZE = 256 * 1024
+DATAGRAM_SIZE = 64 * 1024
+DATAGRAM_BATCH = 64
+ACCEPT_BATCH = 64
+IDLE_TIMEOUT = 60
+SHUTDOWN_GRACE = 5.0
+# Пока в очереди отправки больше WRITE_HIGH байт, из соединения не читаем
+WRITE_HIGH = 1024 * 1024
+SENDMSG_MAX_BUFFERS = 1024
+FILE_CHUNK = 256 * 1024
+TICK = 1.0
+
+COUNTERS = ('accepted', 'active', 'closed', 'timeouts', 'errors',
+            'bytes_in', 'bytes_out', 'datagrams_in', 'datagrams_out', 'dropped')
+
+
+class Handler:
+    """Протокол задачи; все методы вызываются из цикла событий"""
+
+    def connection_made(self, conn):
+        pass
+
+    def data_received(self, conn, data):
+        pass
+
+    def eof_received(self, conn):
+        """Клиент закончил отправку; по умолчанию закрываем, дописав ответы"""
+        conn.close()
+
+    def connection_lost(self, conn):
+        pass
+
+    def datagram_received(self, server, data, addr):
+        """data - memoryview буфера, который следующая датаграмма перезапишет:
+        то, что нужно после возврата, копируйте через bytes(data)"""
+        pass
+
+
+class _FilePart:
+    """Кусок файла в очереди отправки; дескриптор свой, файл вызывающего можно закрыть"""
+
+    def __init__(self, file, offset, count):
+        self.fd = os.dup(file.fileno())
+        self.offset = offset
+        self.remaining = count
+
+    def close(self):
+        os.close(self.fd)
+
+
+class Connection:
+    def __init__(self, server, sock, addr):
+        self.server = server
+        self.sock = sock
+        self.addr = addr
+        self.timeout = server.timeout
+        self.last_active = time.monotonic()
+        # Данные обработчика: разборщик, имя клиента и т.п.
+        self.state = None
+        self.closed = False
+        self._out = deque()
+        self._buffered = 0
+        self._closing = False
+        self._events = selectors.EVENT_READ
+
+    @property
+    def buffered(self):
+        """Байт, ждущих отправки (файлы не считаются)"""
+        return self._buffered
+
+    def sendall(self, data):
+        """Ставит данные в очередь; что влезает в буфер сокета, уходит сразу"""
+        if self.closed or self._closing or not data:
+            return
+        self._out.append(data)
+        self._buffered += len(data)
+        if len(self._out) == 1:
+            self._flush()
+        self._update()
+
+    def writelines(self, buffers):
+        if self.closed or self._closing:
+            return
+        for data in buffers:
+            if data:
+                self._out.append(data)
+                self._buffered += len(data)
+        if self._out and not (self._events & selectors.EVENT_WRITE):
+            self._flush()
+        self._update()
+
+    def sendfile(self, file, offset=0, count=None):
+        """Как socket.sendfile, но без ожидания: кусок файла встаёт в очередь"""
+        if self.closed or self._closing:
+            return
+        if count is None:
+            count = os.fstat(file.fileno()).st_size - offset
+        if count <= 0:
+            return
+        if hasattr(os, 'sendfile'):
+            self._out.append(_FilePart(file, offset, count))
+        else:
+            file.seek(offset)
+            data = file.read(count)
+            self._out.append(data)
+            self._buffered += len(data)
+        if len(self._out) == 1:
+            self._flush()
+        self._update()
+
+    def close(self):
+        """Закрыть, когда уйдёт всё из очереди отправки"""
+        if self.closed:
+            return
+        self._closing = True
+        if not self._out:
+            self.abort()
+        else:
+            self._update()
+
+    def abort(self):
+        """Закрыть сразу, отбросив неотправленное"""
+        if self.closed:
+            return
+        self.closed = True
+        self.server._forget(self)
+        for part in self._out:
+            if isinstance(part, _FilePart):
+                part.close()
+        self._out.clear()
+        self._buffered = 0
+        self.sock.close()
+
+    def _flush(self):
+        """Отправляет из очереди, пока сокет принимает; False - соединение закрыто"""
+        out = self._out
+        try:
+            while out:
+                head = out[0]
+                if isinstance(head, _FilePart):
+                    sent = os.sendfile(self.sock.fileno(), head.fd, head.offset, min(head.remaining, FILE_CHUNK))
+                    head.offset += sent
+                    head.remaining -= sent
+                    self.server.metrics['bytes_out'] += sent
+                    if sent == 0 or head.remaining <= 0:
+                        out.popleft().close()
+                else:
+                    buffers = []
+                    for part in out:
+                        if isinstance(part, _FilePart) or len(buffers) == SENDMSG_MAX_BUFFERS:
+                            break
+                        buffers.append(part)
+                    sent = self.sock.sendmsg(buffers) if len(buffers) > 1 else self.sock.send(buffers[0])
+                    self._buffered -= sent
+                    self.server.metrics['bytes_out'] += sent
+                    while sent:
+                        size = len(out[0])
+                        if sent >= size:
+                            out.popleft()
+                            sent -= size
+                        else:
+                            out[0] = memoryview(out[0])[sent:]
+                            sent = 0
+                self.last_active = time.monotonic()
+        except BlockingIOError:
+            return True
+        except OSError:
+            self.abort()
+            return False
+        if self._closing:
+            self.abort()
+            return False
+        return True
+
+    def _update(self):
+        if self.closed:
+            return
+        events = 0
+        if self._out:
+            events |= selectors.EVENT_WRITE
+        if not self._closing and self._buffered < WRITE_HIGH:
+            events |= selectors.EVENT_READ
+        # Пустой маски не бывает: без очереди отправки нет и превышения WRITE_HIGH
+        if events != self._events:
+            self._events = events
+            self.server._selector.modify(self.sock, events, self._on_event)
+
+    def _on_event(self, mask):
+        server = self.server
+        if mask & selectors.EVENT_WRITE and self._out:
+            if not self._flush():
+                return
+        if mask & selectors.EVENT_READ and not self._closing:
+            try:
+                data = self.sock.recv(RECV_SIZE)
+            except BlockingIOError:
+                data = None
+            except OSError:
+                self.abort()
+                return
+            if data is not None:
+                self.last_active = time.monotonic()
+                if data:
+                    server.metrics['bytes_in'] += len(data)
+                    server._call(server.handler.data_received, self, data)
+                else:
+                    server._call(server.handler.eof_received, self)
+        self._update()
+
+
+class Server:
+    def __init__(self, handler, host, port, udp=False, workers=0, processes=1,
+                 timeout=IDLE_TIMEOUT, backlog=BACKLOG, grace=SHUTDOWN_GRACE, rcvbuf=None):
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.udp = udp
+        self.processes = max(1, processes)
+        self.timeout = timeout
+        self.backlog = backlog
+        self.grace = grace
+        self.rcvbuf = rcvbuf
+        self.metrics = dict.fromkeys(COUNTERS, 0)
+        self.hooks = []
+        self.stopping = False
+        self._workers = workers
+        self._pool = None
+        self._sock = None
+        self._datagram_buffer = None
+        self._selector = None
+        self._connections = set()
+        self._timers = []
+        self._timer_seq = 0
+        # deque.append и popleft атомарны: очередь можно пополнять из потоков пула
+        # и из обработчика сигнала без блокировки
+        self._ready = deque()
+        self._wake_r = self._wake_w = None
+        self._stop_at = None
+
+    def emit(self, event, conn=None):
+        for hook in self.hooks:
+            hook(event, conn)
+
+    def call_later(self, delay, callback, *args):
+        """Вызвать callback в цикле событий через delay секунд"""
+        self._timer_seq += 1
+        heapq.heappush(self._timers, (time.monotonic() + delay, self._timer_seq, callback, args))
+
+    def call_soon_threadsafe(self, callback, *args):
+        """Вызвать callback в цикле событий; можно звать из любого потока"""
+        self._ready.append((callback, args))
+        try:
+            self._wake_w.send(b'\0')
+        except (BlockingIOError, OSError):
+            pass
+
+    def submit(self, fn, *args, callback=None):
+        """
+        fn(*args) в пуле потоков; callback(результат, исключение) - снова в
+        цикле событий, где можно отвечать через Connection. Без пула
+        (workers=0) fn выполняется сразу.
+        """
+        if self._pool is None:
+            try:
+                result, error = fn(*args), None
+            except Exception as e:
+                result, error = None, e
+            if callback is not None:
+                self._call(callback, result, error)
+            return
+
+        def done(future):
+            if callback is not None:
+                self.call_soon_threadsafe(callback, None if future.exception() else future.result(),
+                                          future.exception())
+
+        self._pool.submit(fn, *args).add_done_callback(done)
+
+    def sendto(self, data, addr):
+        try:
+            self._sock.sendto(data, addr)
+            self.metrics['datagrams_out'] += 1
+        except BlockingIOError:
+            # Буфер отправки полон - для UDP ответ просто теряется
+            self.metrics['dropped'] += 1
+
+    def stop(self):
+        """Перестать принимать и закрыть соединения, дав им дописать ответы"""
+        if self.stopping:
+            return
+        self.stopping = True
+        self._stop_at = time.monotonic() + self.grace
+        self._selector.unregister(self._sock)
+        self._sock.close()
+        for conn in list(self._connections):
+            conn.close()
+
+    def create_socket(self, reuse_port=False):
+        if self.udp:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            if reuse_port:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        else:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if self.rcvbuf:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.rcvbuf)
+        sock.bind((self.host, self.port))
+        if not self.udp:
+            sock.listen(max(1, min(self.backlog, socket.SOMAXCONN)))
+        sock.setblocking(False)
+        return sock
+
+    def serve_forever(self):
+        """Запуск; возвращается после остановки по SIGINT/SIGTERM"""
+        if self.processes > 1 and not hasattr(os, 'fork'):
+            raise RuntimeError("Несколько процессов доступны только на Unix")
+        reuse_port = self.udp and self.processes > 1
+        if reuse_port and not hasattr(socket, 'SO_REUSEPORT'):
+            raise RuntimeError("Несколько процессов UDP требуют SO_REUSEPORT")
+        if self.processes == 1:
+            self._sock = self.create_socket()
+            self._run()
+            return
+
+        # TCP: процессы наследуют слушающий сокет, соединения между ними делит accept.
+        # UDP: из одного общего сокета процессы читали бы по очереди, мешая друг
+        # другу, поэтому у каждого свой сокет с SO_REUSEPORT
+        if not reuse_port:
+            self._sock = self.create_socket()
+        children = []
+        for _ in range(self.processes):
+            pid = os.fork()
+            if pid == 0:
+                try:
+                    if reuse_port:
+                        self._sock = self.create_socket(reuse_port=True)
+                    self._run()
+                finally:
+                    os._exit(0)
+            children.append(pid)
+        if self._sock is not None:
+            self._sock.close()
+
+        def forward(signum, frame):
+            for pid in children:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+
+        signal.signal(signal.SIGTERM, forward)
+        signal.signal(signal.SIGINT, forward)
+        while children:
+            pid, _ = os.wait()
+            children.remove(pid)
+
+    def _run(self):
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, self._on_wake)
+        self._selector.register(self._sock, selectors.EVENT_READ,
+                                self._on_datagrams if self.udp else self._on_accept)
+        if self.udp:
+            self._datagram_buffer = bytearray(DATAGRAM_SIZE)
+        if self._workers:
+            self._pool = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix='netcore')
+
+        def request_stop(signum, frame):
+            # Сам обработчик сигнала только будит цикл, остановка - в цикле
+            self.call_soon_threadsafe(self.stop)
+
+        signal.signal(signal.SIGTERM, request_stop)
+        signal.signal(signal.SIGINT, request_stop)
+        try:
+            self._loop()
+        finally:
+            for conn in list(self._connections):
+                conn.abort()
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            self._selector.close()
+            self._wake_r.close()
+            self._wake_w.close()
+            if not self.stopping:
+                self._sock.close()
+
+    def _loop(self):
+        check_at = time.monotonic() + TICK
+        while True:
+            now = time.monotonic()
+            delay = min(check_at, self._timers[0][0] if self._timers else check_at) - now
+            for key, mask in self._selector.select(max(0, delay)):
+                key.data(mask)
+
+            now = time.monotonic()
+            while self._timers and self._timers[0][0] <= now:
+                _, _, callback, args = heapq.heappop(self._timers)
+                self._call(callback, *args)
+            if now >= check_at:
+                check_at = now + TICK
+                self._close_idle(now)
+            if self.stopping and (not self._connections or now >= self._stop_at):
+                return
+
+    def _close_idle(self, now):
+        for conn in list(self._connections):
+            if conn.timeout and now - conn.last_active > conn.timeout:
+                self.metrics['timeouts'] += 1
+                self.emit('timeout', conn)
+                conn.abort()
+
+    def _call(self, callback, *args):
+        """Вызов кода обработчика: его исключение закрывает одно соединение, а не сервер"""
+        try:
+            callback(*args)
+        except Exception as e:
+            self.metrics['errors'] += 1
+            conn = args[0] if args and isinstance(args[0], Connection) else None
+            print(f"Ошибка: {e!r}")
+            self.emit('error', conn)
+            if conn is not None:
+                conn.abort()
+
+    def _on_wake(self, mask):
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+        while self._ready:
+            callback, args = self._ready.popleft()
+            self._call(callback, *args)
+
+    def _on_accept(self, mask):
+        for _ in range(ACCEPT_BATCH):
+            try:
+                sock, addr = self._sock.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                # Кончились дескрипторы и т.п. - соединение подождёт в очереди listen
+                print(f"Ошибка accept: {e}")
+                return
+            sock.setblocking(False)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            conn = Connection(self, sock, addr)
+            self._connections.add(conn)
+            self._selector.register(sock, selectors.EVENT_READ, conn._on_event)
+            self.metrics['accepted'] += 1
+            self.metrics['active'] += 1
+            self.emit('accept', conn)
+            self._call(self.handler.connection_made, conn)
+
+    def _on_datagrams(self, mask):
+        # recvfrom выделял бы по DATAGRAM_SIZE байт на каждую датаграмму
+        buffer = self._datagram_buffer
+        view = memoryview(buffer)
+        for _ in range(DATAGRAM_BATCH):
+            try:
+                size, addr = self._sock.recvfrom_into(buffer)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                continue
+            self.metrics['datagrams_in'] += 1
+            self.metrics['bytes_in'] += size
+            self._call(self.handler.datagram_received, self, view[:size], addr)
+
+    def _forget(self, conn):
+        """Вызывается из Connection.abort"""
+        if conn not in self._connections:
+            return
+        self._connections.discard(conn)
+        try:
+            self._selector.unregister(conn.sock)
+        except (KeyError, ValueError):
+            pass
+        self.metrics['active'] -= 1
+        self.metrics['closed'] += 1
+        self.emit('close', conn)
+        self._call(self.handler.connection_lost, conn)
@@ -0,0 +1,102 @@
+"""
+Нагрузка на UDP сервер: поток датаграмм с заданной скоростью.
+
+Каждый процесс (--processes) открывает --sockets сокетов - с разных
+портов, чтобы при SO_REUSEPORT датаграммы расходились по процессам
+сервера, - и по очереди отправляет с них датаграммы размером --size со
+скоростью --rate в секунду (0 - сколько получится), одновременно
+вычитывая ответы. После --duration секунд ответы ждутся ещё --grace
+секунд. Потери - доля датаграмм, на которые не пришёл ответ.
+
+    python server.py --fast --workers 2
+    python blaster.py --rate 50000 --duration 5
+    python blaster.py --rate 0 --sockets 8 --processes 2
+"""
+import argparse
+import multiprocessing
+import socket
+import time
+
+HOST = 'localhost'
+PORT = 8080
+BURST = 64
+
+
+def blast(args, results):
+    sockets = []
+    for _ in range(args.sockets):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        sock.connect((args.host, args.port))
+        sock.setblocking(False)
+        sockets.append(sock)
+    payload = b'x' * args.size
+    buffer = bytearray(2048)
+    rate = args.rate / args.processes
+    sent = received = send_errors = 0
+
+    def drain():
+        nonlocal received
+        for sock in sockets:
+            try:
+                while True:
+                    sock.recv_into(buffer)
+                    received += 1
+            except (BlockingIOError, ConnectionRefusedError):
+                pass
+
+    started = time.perf_counter()
+    deadline = started + args.duration
+    now = started
+    while now < deadline:
+        target = BURST if not rate else min(BURST, int(rate * (now - started)) - sent)
+        for i in range(target):
+            try:
+                sockets[(sent + i) % len(sockets)].send(payload)
+            except (BlockingIOError, ConnectionRefusedError, OSError):
+                send_errors += 1
+        sent += max(target, 0)
+        drain()
+        now = time.perf_counter()
+    elapsed = now - started
+
+    grace_deadline = time.perf_counter() + args.grace
+    while time.perf_counter() < grace_deadline:
+        drain()
+        time.sleep(0.01)
+    for sock in sockets:
+        sock.close()
+    results.put((sent - send_errors, send_errors, received, elapsed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--rate', type=int, default=50_000, help='датаграмм в секунду на все процессы, 0 - без ограничения')
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--grace', type=float, default=1.0, help='сколько ждать ответы после отправки, с')
+    parser.add_argument('--size', type=int, default=64, help='байт в датаграмме')
+    parser.add_argument('--sockets', type=int, default=4, help='сокетов на процесс')
+    parser.add_argument('--processes', type=int, default=1)
+    args = parser.parse_args()
+
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=blast, args=(args, results)) for _ in range(args.processes)]
+    for worker in workers:
+        worker.start()
+    totals = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    sent = sum(t[0] for t in totals)
+    errors = sum(t[1] for t in totals)
+    received = sum(t[2] for t in totals)
+    elapsed = max(t[3] for t in totals)
+    loss = 1 - received / sent if sent else 0.0
+    print(f"Отправлено {sent} датаграмм ({sent / elapsed:.0f}/с), ошибок отправки {errors}")
+    print(f"Получено ответов {received} ({received / elapsed:.0f}/с), потери {loss * 100:.2f}%")
+
+
+if __name__ == '__main__':
+    main()
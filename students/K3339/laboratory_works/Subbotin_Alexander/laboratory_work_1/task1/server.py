@@ -1,7 +1,19 @@
+import argparse
+import os
+import queue
 import socket
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import netcore
 
 HOST = 'localhost'
 PORT = 8080
+RESPONSE = b"Hello, client"
+RCVBUF_SIZE = 4 * 1024 * 1024
+REPORT_INTERVAL = 1.0
+LOG_QUEUE_SIZE = 10_000
 
 def udp_server():
     conn = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -19,5 +31,75 @@ def udp_server():
         response = "Hello, client"
         conn.sendto(response.encode(), client_addr)
 
+def start_logger():
+    """
+    Печать в отдельном потоке: цикл приёма только кладёт строку в очередь.
+    Если поток не успевает, строки отбрасываются, а не тормозят приём.
+    """
+    lines = queue.Queue(LOG_QUEUE_SIZE)
+
+    def writer():
+        while True:
+            print(lines.get())
+
+    threading.Thread(target=writer, name='udp-log', daemon=True).start()
+    return lines
+
+class EchoHandler(netcore.Handler):
+    """Отвечает на каждую датаграмму; с verbose печатает их из отдельного потока"""
+
+    def __init__(self, verbose=False):
+        self.verbose = verbose
+        self.log = None
+
+    def datagram_received(self, server, data, addr):
+        server.sendto(RESPONSE, addr)
+        if self.verbose:
+            # Поток печати запускается в каждом процессе после fork
+            if self.log is None:
+                self.log = start_logger()
+            try:
+                self.log.put_nowait(f"Запрос от {addr}: {bytes(data)!r}")
+            except queue.Full:
+                pass
+
+def report(server, last):
+    """Раз в REPORT_INTERVAL печатает число принятых и отправленных датаграмм"""
+    metrics = server.metrics
+    received = metrics['datagrams_in'] - last['datagrams_in']
+    if received:
+        print(f"[{os.getpid()}] принято {received / REPORT_INTERVAL:.0f} датаграмм/с, "
+              f"отправлено {metrics['datagrams_out'] - last['datagrams_out']}, "
+              f"не отправлено {metrics['dropped'] - last['dropped']}")
+    server.call_later(REPORT_INTERVAL, report, server, dict(metrics))
+
+def udp_server_fast(host=HOST, port=PORT, workers=1, verbose=False, rcvbuf=RCVBUF_SIZE):
+    """
+    Сервер на общем ядре (netcore): неблокирующий сокет, после каждого
+    пробуждения пачка датаграмм читается в заранее выделенный буфер;
+    у каждого из workers процессов свой сокет с SO_REUSEPORT.
+    """
+    server = netcore.Server(EchoHandler(verbose), host, port, udp=True, processes=workers, rcvbuf=rcvbuf)
+    server.call_later(REPORT_INTERVAL, report, server, dict(server.metrics))
+    print(f"Сервер запущен на порту: {port} (быстрый режим, процессов: {workers})")
+    server.serve_forever()
+    print("\nСервер остановлен")
+
 if __name__ == "__main__":
-    udp_server()
+    parser = argparse.ArgumentParser(description='UDP сервер')
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--fast', action='store_true',
+                        help='неблокирующий приём пачками без печати каждой датаграммы')
+    parser.add_argument('--workers', type=int, default=1, help='процессов с SO_REUSEPORT в быстром режиме')
+    parser.add_argument('--verbose', action='store_true', help='в быстром режиме печатать датаграммы из отдельного потока')
+    parser.add_argument('--rcvbuf', type=int, default=RCVBUF_SIZE, help='размер буфера приёма сокета')
+    args = parser.parse_args()
+    try:
+        if args.fast:
+            udp_server_fast(args.host, args.port, args.workers, args.verbose, args.rcvbuf)
+        else:
+            HOST, PORT = args.host, args.port
+            udp_server()
+    except KeyboardInterrupt:
+        print("\nСервер остановлен")
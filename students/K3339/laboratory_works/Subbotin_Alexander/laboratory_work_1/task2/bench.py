@@ -0,0 +1,123 @@
+"""
+Пропускная способность сервера площадей в операциях (площадях) в секунду.
+
+Режимы:
+- connect - новое соединение на каждый запрос, как раньше;
+- single  - одиночные запросы по постоянному соединению, до --depth
+            запросов отправляются, не дожидаясь ответов (1 - запрос-ответ);
+- batch   - пакеты по --batch-size пар, до --depth пакетов в пути.
+
+Каждый из --clients процессов открывает своё соединение.
+
+    python server.py
+    python bench.py --mode single --depth 1
+    python bench.py --mode single --depth 64 --clients 4
+    python bench.py --mode batch --batch-size 10000 --depth 4
+"""
+import argparse
+import multiprocessing
+import random
+import socket
+import struct
+import time
+
+import protocol
+from protocol import AREA, ERROR, FrameDecoder, encode_area, encode_batch, encode_frame
+
+HOST = 'localhost'
+PORT = 8080
+
+
+def run_connect(args, deadline):
+    ops = 0
+    payload = b'3.5 2'
+    while time.perf_counter() < deadline:
+        conn = socket.create_connection((args.host, args.port))
+        # Закрываем сбросом, чтобы за прогон не кончились порты в TIME_WAIT
+        conn.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+        conn.sendall(encode_frame(AREA, 1, payload))
+        decoder = FrameDecoder()
+        frames = []
+        while not frames:
+            data = conn.recv(protocol.RECV_SIZE)
+            if not data:
+                raise ConnectionError("Сервер закрыл соединение")
+            frames = decoder.feed(data)
+        conn.close()
+        ops += 1
+    return ops, ops
+
+
+def run_pipelined(args, deadline):
+    """Держит до args.depth запросов в пути; возвращает (площадей, запросов)"""
+    conn = socket.create_connection((args.host, args.port))
+    conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    decoder = FrameDecoder()
+    if args.mode == 'batch':
+        bases = [random.uniform(1, 100) for _ in range(args.batch_size)]
+        heights = [random.uniform(1, 100) for _ in range(args.batch_size)]
+        payload = encode_batch(0, bases, heights)[protocol.FRAME_HEADER.size:]
+        kind, per_request = protocol.BATCH, args.batch_size
+    else:
+        payload = encode_area(0, 3.5, 2)[protocol.FRAME_HEADER.size:]
+        kind, per_request = AREA, 1
+
+    request_id = outstanding = answered = 0
+    while True:
+        sending = time.perf_counter() < deadline
+        if not sending and not outstanding:
+            break
+        if sending and outstanding < args.depth:
+            count = args.depth - outstanding
+            conn.sendall(b''.join([encode_frame(kind, request_id + i, payload) for i in range(count)]))
+            request_id += count
+            outstanding += count
+        data = conn.recv(protocol.RECV_SIZE)
+        if not data:
+            raise ConnectionError("Сервер закрыл соединение")
+        for reply_kind, _, reply in decoder.feed(data):
+            if reply_kind == ERROR:
+                raise RuntimeError(reply.decode('utf-8'))
+            outstanding -= 1
+            answered += 1
+    conn.close()
+    return answered * per_request, answered
+
+
+def worker(args, results):
+    deadline = time.perf_counter() + args.duration
+    if args.mode == 'connect':
+        results.put(run_connect(args, deadline))
+    else:
+        results.put(run_pipelined(args, deadline))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--mode', choices=('connect', 'single', 'batch'), default='single')
+    parser.add_argument('--depth', type=int, default=64, help='запросов в пути на соединение')
+    parser.add_argument('--batch-size', type=int, default=10_000, help='пар в пакете')
+    parser.add_argument('--clients', type=int, default=1, help='процессов-клиентов')
+    parser.add_argument('--duration', type=float, default=5.0)
+    args = parser.parse_args()
+
+    results = multiprocessing.Queue()
+    started = time.perf_counter()
+    clients = [multiprocessing.Process(target=worker, args=(args, results)) for _ in range(args.clients)]
+    for client in clients:
+        client.start()
+    totals = [results.get() for _ in clients]
+    for client in clients:
+        client.join()
+    elapsed = time.perf_counter() - started
+
+    ops = sum(t[0] for t in totals)
+    requests = sum(t[1] for t in totals)
+    print(f"{args.mode}: {ops} площадей за {elapsed:.1f} с - {ops / elapsed:,.0f} оп/с, "
+          f"{requests / elapsed:,.0f} запросов/с")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,32 +1,66 @@
+import argparse
 import socket
 
+import protocol
+from protocol import ERROR, RESULT, FrameDecoder, encode_area
+
 HOST = 'localhost'
 PORT = 8080
 
-def tcp_client():
+def receive(conn, decoder):
+    """Ответ на единственный отправленный запрос; None, если сервер закрыл соединение"""
+    while True:
+        data = conn.recv(protocol.RECV_SIZE)
+        if not data:
+            return None
+        frames = decoder.feed(data)
+        if frames:
+            return frames[0]
+
+def tcp_client(host=HOST, port=PORT):
+    conn = None
     try:
-        conn = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        conn.connect((HOST, PORT))
-        
+        conn = socket.create_connection((host, port))
+        decoder = FrameDecoder()
+
         print("\n=== Вычисление площади параллелограмма ===")
         print("Формула: S = a * h")
-        
-        base = input("Введите основание параллелограмма: ")
-        height = input("Введите высоту параллелограмма: ")
-        
-        message = f"{base} {height}"
-        conn.send(message.encode('utf-8'))
-        
-        response = conn.recv(1024).decode('utf-8')
-        print(f"\nОтвет от сервера: {response}")
-        
+        print("Пустое основание - выход")
+
+        request_id = 0
+        while True:
+            base = input("\nВведите основание параллелограмма: ")
+            if not base.strip():
+                break
+            height = input("Введите высоту параллелограмма: ")
+
+            request_id += 1
+            conn.sendall(encode_area(request_id, base, height))
+
+            frame = receive(conn, decoder)
+            if frame is None:
+                print("Сервер закрыл соединение")
+                break
+            kind, _, payload = frame
+            if kind == RESULT:
+                print(f"Ответ от сервера: Площадь параллелограмма: {payload.decode('utf-8')}")
+            elif kind == ERROR:
+                print(f"Ответ от сервера: {payload.decode('utf-8')}")
+
     except ConnectionRefusedError:
         print("Ошибка: Не удалось подключиться к серверу")
+    except (KeyboardInterrupt, EOFError):
+        pass
     except Exception as e:
         print(f"Ошибка: {e}")
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
         print("Соединение закрыто")
 
 if __name__ == "__main__":
-    tcp_client()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='TCP клиент: площадь параллелограмма')
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    args = parser.parse_args()
+    tcp_client(args.host, args.port)
@@ -0,0 +1,121 @@
+"""
+Протокол вычисления площади параллелограмма, общий для server.py и client.py.
+
+Соединение постоянное, запросы и ответы - кадры
+[длина: 4 байта][номер запроса: 4 байта][вид: 1 байт][данные], big-endian.
+Номер выбирает клиент, сервер возвращает его в ответе, поэтому клиент
+может отправить много запросов подряд, не дожидаясь ответов, и ответы на
+большие пакеты могут прийти позже ответов на запросы, отправленные после.
+
+Виды кадров:
+- AREA: "основание высота" текстом -> RESULT с площадью текстом;
+- BATCH: n оснований и затем n высот, float64 little-endian ->
+  RESULTS с n площадями в том же формате;
+- ERROR: ответ с текстом ошибки на любой запрос.
+
+Пакеты считаются через NumPy, если он установлен, иначе через array.
+"""
+import operator
+import struct
+import sys
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+FRAME_HEADER = struct.Struct('!IIB')
+MAX_PAYLOAD = 16 * 1024 * 1024
+MAX_BATCH = MAX_PAYLOAD // 16
+RECV_SIZE = 256 * 1024
+
+AREA = 1
+BATCH = 2
+RESULT = 3
+RESULTS = 4
+ERROR = 5
+
+
+class ProtocolError(Exception):
+    """Кадр длиннее MAX_PAYLOAD или пакет неверного размера"""
+
+
+def encode_frame(kind, request_id, payload=b'') -> bytes:
+    if len(payload) > MAX_PAYLOAD:
+        raise ProtocolError(f"Кадр длиннее {MAX_PAYLOAD} байт")
+    return FRAME_HEADER.pack(len(payload), request_id, kind) + payload
+
+
+def encode_area(request_id, base, height) -> bytes:
+    return encode_frame(AREA, request_id, f"{base} {height}".encode('utf-8'))
+
+
+def _to_bytes(values):
+    """Последовательность чисел -> float64 little-endian"""
+    if numpy is not None:
+        return numpy.asarray(values, dtype='<f8').tobytes()
+    packed = array('d', values)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _from_bytes(data):
+    if numpy is not None:
+        return numpy.frombuffer(data, dtype='<f8')
+    values = array('d')
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def encode_batch(request_id, bases, heights) -> bytes:
+    if len(bases) != len(heights):
+        raise ProtocolError("Оснований и высот должно быть поровну")
+    return encode_frame(BATCH, request_id, _to_bytes(bases) + _to_bytes(heights))
+
+
+def batch_areas(payload) -> bytes:
+    """Данные кадра BATCH -> данные ответа RESULTS"""
+    if len(payload) % 16:
+        raise ProtocolError("Размер пакета не кратен 16 байтам")
+    values = _from_bytes(payload)
+    count = len(values) // 2
+    if numpy is not None:
+        return (values[:count] * values[count:]).astype('<f8', copy=False).tobytes()
+    return _to_bytes(map(operator.mul, values[:count], values[count:]))
+
+
+def decode_results(payload):
+    """Данные кадра RESULTS -> площади (numpy.ndarray или array)"""
+    return _from_bytes(payload)
+
+
+class FrameDecoder:
+    """Собирает кадры из поступающих кусков данных"""
+
+    def __init__(self, max_size=MAX_PAYLOAD):
+        self._buffer = bytearray()
+        self._max_size = max_size
+
+    def feed(self, data) -> list:
+        """Добавляет прочитанные байты, возвращает список (вид, номер, данные)"""
+        buffer = self._buffer
+        buffer += data
+        frames = []
+        pos = 0
+        end = len(buffer)
+        while end - pos >= FRAME_HEADER.size:
+            size, request_id, kind = FRAME_HEADER.unpack_from(buffer, pos)
+            if size > self._max_size:
+                raise ProtocolError(f"Кадр {size} байт длиннее {self._max_size}")
+            start = pos + FRAME_HEADER.size
+            if end - start < size:
+                break
+            frames.append((kind, request_id, buffer[start:start + size]))
+            pos = start + size
+        if pos:
+            del buffer[:pos]
+        return frames
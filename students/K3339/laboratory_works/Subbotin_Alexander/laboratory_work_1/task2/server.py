@@ -1,8 +1,21 @@
-import socket
+import argparse
+import os
+import sys
+
+import protocol
+from protocol import AREA, BATCH, ERROR, RESULT, RESULTS, FrameDecoder, ProtocolError, encode_frame
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import netcore
 
 HOST = 'localhost'
 PORT = 8080
-QUEUE = 10
+QUEUE = 128
+CLIENT_TIMEOUT = 60
+WORKERS = 4
+# Пакеты меньше стольких пар считаются сразу в цикле событий, большие - в пуле,
+# чтобы запросы, пришедшие за большим пакетом, не ждали его
+BATCH_INLINE = 4096
 
 def calculate_parallelogram_area(base, height):
     try:
@@ -11,47 +24,106 @@ def calculate_parallelogram_area(base, height):
     except (ValueError, TypeError):
         return None
 
-def tcp_server():
-    conn = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    conn.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-    conn.bind((HOST, PORT))
-    conn.listen(QUEUE)
-    print(f"TCP сервер запущен на {HOST}:{PORT}")
+def error_frame(request_id, message):
+    return encode_frame(ERROR, request_id, message.encode('utf-8'))
 
-    while True:
+def handle_request(kind, request_id, payload, log=None):
+    """Один запрос -> кадр ответа"""
+    if kind == AREA:
+        data = payload.decode('utf-8', 'replace')
         try:
-            clientsocket, addr = conn.accept()
-            print(f"Подключился клиент: {addr}")
-            
-            data = clientsocket.recv(1024).decode('utf-8').strip()
-            print(f"Получены данные: {data}")
-            
-            try:
-                base, height = data.split()
-                area = calculate_parallelogram_area(base, height)
-                
-                if area is not None:
-                    response = f"Площадь параллелограмма: {area}"
-                    print(f"Вычислена площадь: {area}")
-                else:
-                    response = "неверные параметры"
-                    print("Ошибка в расчете")
-                    
-            except ValueError:
-                response = "неверный формат данных"
-                print("Ошибка формата данных")
-            
-            clientsocket.send(response.encode('utf-8'))
-            print(f"Отправлен ответ: {response}")
-            
-            clientsocket.close()
-            
-        except KeyboardInterrupt:
-            print("\nСервер остановлен")
+            base, height = data.split()
+        except ValueError:
+            return error_frame(request_id, "неверный формат данных")
+        area = calculate_parallelogram_area(base, height)
+        if log is not None:
+            print(f"{log} #{request_id}: {data} -> {area}")
+        if area is None:
+            return error_frame(request_id, "неверные параметры")
+        return encode_frame(RESULT, request_id, str(area).encode('utf-8'))
+    if kind == BATCH:
+        try:
+            return encode_frame(RESULTS, request_id, protocol.batch_areas(payload))
+        except ProtocolError as e:
+            return error_frame(request_id, str(e))
+    return error_frame(request_id, f"неизвестный вид запроса {kind}")
+
+class ClientState:
+    def __init__(self):
+        self.decoder = FrameDecoder()
+        self.requests = 0
+        self.pending = 0
+        self.eof = False
+
+class AreaHandler(netcore.Handler):
+    """
+    Ответы на все запросы из одного куска данных отправляются одной
+    записью; большие пакеты считаются в пуле и отправляются, когда готовы,
+    со своим номером.
+    """
+
+    def __init__(self, verbose=False):
+        self.verbose = verbose
+
+    def connection_made(self, conn):
+        conn.state = ClientState()
+        print(f"Подключился клиент: {conn.addr}")
+
+    def data_received(self, conn, data):
+        state = conn.state
+        try:
+            frames = state.decoder.feed(data)
+        except ProtocolError as e:
+            conn.sendall(error_frame(0, str(e)))
+            conn.close()
+            return
+        log = f"{conn.addr[0]}:{conn.addr[1]}" if self.verbose else None
+        replies = []
+        for kind, request_id, payload in frames:
+            if kind == BATCH and len(payload) >= BATCH_INLINE * 16:
+                state.pending += 1
+                conn.server.submit(handle_request, kind, request_id, payload,
+                                   callback=lambda frame, error: self.batch_done(conn, frame, error))
+            else:
+                replies.append(handle_request(kind, request_id, payload, log))
+        state.requests += len(frames)
+        conn.writelines(replies)
+
+    def batch_done(self, conn, frame, error):
+        state = conn.state
+        state.pending -= 1
+        if error is not None:
+            print(f"Ошибка: {error}")
+            conn.abort()
+            return
+        conn.sendall(frame)
+        if state.eof and not state.pending:
             conn.close()
-            break
-        except Exception as e:
-            print(f"Ошибка: {e}")
+
+    def eof_received(self, conn):
+        # Клиент закончил отправку, но может ещё ждать ответы на пакеты из пула
+        conn.state.eof = True
+        if not conn.state.pending:
+            conn.close()
+
+    def connection_lost(self, conn):
+        print(f"Клиент {conn.addr} отключился, запросов: {conn.state.requests}")
+
+def tcp_server(host=HOST, port=PORT, workers=WORKERS, processes=1, verbose=False):
+    server = netcore.Server(AreaHandler(verbose), host, port, workers=workers, processes=processes,
+                            timeout=CLIENT_TIMEOUT, backlog=QUEUE)
+    print(f"TCP сервер запущен на {host}:{port}")
+    print("Пакеты считаются через NumPy" if protocol.numpy is not None
+          else "NumPy не установлен, пакеты считаются через array")
+    server.serve_forever()
+    print("\nСервер остановлен")
 
 if __name__ == "__main__":
-    tcp_server()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='TCP сервер: площадь параллелограмма')
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--workers', type=int, default=WORKERS, help='потоков для больших пакетов')
+    parser.add_argument('--processes', type=int, default=1, help='процессов с общим слушающим сокетом')
+    parser.add_argument('--verbose', action='store_true', help='печатать каждый одиночный запрос')
+    args = parser.parse_args()
+    tcp_server(args.host, args.port, args.workers, args.processes, args.verbose)
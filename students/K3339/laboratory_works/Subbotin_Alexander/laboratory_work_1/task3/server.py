@@ -1,44 +1,279 @@
-import socket
+import argparse
+import gzip
+import mimetypes
+import os
+import shutil
+import sys
+import threading
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from urllib.parse import unquote, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import netcore
 
 HOST = 'localhost'
 PORT = 8080
+# Отдельный каталог, чтобы исходники сервера не отдавались по HTTP
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+INDEX = 'index.html'
+CLIENT_TIMEOUT = 10
+MAX_REQUEST_SIZE = 16 * 1024
+# Файлы меньше CACHE_FILE_LIMIT держим в памяти, всего не больше CACHE_SIZE байт
+CACHE_SIZE = 32 * 1024 * 1024
+CACHE_FILE_LIMIT = 1024 * 1024
+# Файлы не меньше SENDFILE_MIN отправляются через sendfile, минуя память процесса
+SENDFILE_MIN = 64 * 1024
+COMPRESSIBLE = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+
+cache = OrderedDict()
+cache_size = 0
+cache_lock = threading.Lock()
+
+
+def read_cached(path, stat):
+    """Содержимое файла из LRU-кэша; запись сбрасывается при смене mtime или размера"""
+    global cache_size
+    key = (stat.st_mtime_ns, stat.st_size)
+    with cache_lock:
+        item = cache.get(path)
+        if item is not None and item[0] == key:
+            cache.move_to_end(path)
+            return item[1]
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) != stat.st_size:
+        # Файл меняется прямо сейчас - отдаём прочитанное, но не кэшируем
+        return data
+
+    with cache_lock:
+        old = cache.pop(path, None)
+        if old is not None:
+            cache_size -= len(old[1])
+        cache[path] = (key, data)
+        cache_size += len(data)
+        while cache_size > CACHE_SIZE:
+            _, (_, evicted) = cache.popitem(last=False)
+            cache_size -= len(evicted)
+    return data
+
+
+def resolve_path(root, target):
+    """Путь к файлу внутри root по пути из запроса или None"""
+    path = unquote(urlsplit(target).path)
+    if '\0' in path:
+        # realpath бросила бы ValueError
+        return None
+    full = os.path.realpath(os.path.join(root, path.lstrip('/')))
+    if full != root and not full.startswith(root + os.sep):
+        return None
+    if os.path.isdir(full):
+        full = os.path.join(full, INDEX)
+    return full if os.path.isfile(full) else None
+
 
-def http_server():
-    server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-    server_socket.bind((HOST, PORT))
-    server_socket.listen(5)
-    print(f"HTTP сервер запущен на http://{HOST}:{PORT}")
+def parse_request(data):
+    """Строка запроса и заголовки из начала data (тело GET/HEAD не нужно)"""
+    head = bytes(data).split(b'\r\n\r\n', 1)[0].decode('latin-1')
+    lines = head.split('\r\n')
+    parts = lines[0].split(' ')
+    if len(parts) != 3:
+        return None
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+    return parts[0], parts[1], headers
 
-    while True:
+
+def parse_range(header, size):
+    """
+    Диапазон из заголовка Range: (начало, конец включительно), None - отдать
+    файл целиком, False - диапазон за пределами файла.
+    Несколько диапазонов сразу не поддерживаются - тогда файл отдаётся целиком.
+    """
+    if not header or not header.startswith('bytes=') or ',' in header:
+        return None
+    start, sep, end = header[6:].strip().partition('-')
+    # int() приняла бы и знак: bytes=--5 дал бы отрицательную длину
+    if not sep or not (start or end) or not all(part.isascii() and part.isdigit() for part in (start, end) if part):
+        return None
+    if not start:
+        length = int(end)
+        if length == 0:
+            return False
+        return max(0, size - length), size - 1
+    start = int(start)
+    end = int(end) if end else size - 1
+    if start >= size or end < start:
+        return False
+    return start, min(end, size - 1)
+
+
+def not_modified(headers, etag, mtime):
+    if_none_match = headers.get('if-none-match')
+    if if_none_match is not None:
+        return if_none_match.strip() == '*' or etag in (tag.strip() for tag in if_none_match.split(','))
+    if_modified_since = headers.get('if-modified-since')
+    if if_modified_since:
         try:
-            client_connection, client_address = server_socket.accept()
-            print(f'Подключение от {client_address}')
-
-            with open(r'C:\Users\Александр\itmo course\TonikX-ITMO_ICT_WebDevelopment_2025-2026\students\K3339\laboratory_works\Subbotin_Alexander\laboratory_work_1\task3\index.html', 'r', encoding="utf-8") as f:
-                html_content = f.read()
-            html_bytes = html_content.encode('utf-8')
-
-            request = client_connection.recv(1024).decode('utf-8')
-            print(f'Запрос клиента:\n{request}')
-
-            http_response = (
-                "HTTP/1.1 200 OK\r\n"
-                "Content-Type: text/html; charset=UTF-8\r\n"
-                f"Content-Length: {len(html_bytes)}\r\n"
-                "Connection: close\r\n"
-                "\r\n" + html_content
-            )
-
-            client_connection.sendall(http_response.encode('utf-8'))
-            client_connection.close()
-            
-        except KeyboardInterrupt:
-            print("\nСервер остановлен")
-            server_socket.close()
-            break
-        except Exception as e:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def send_simple(conn, status, extra_headers=''):
+    body = status.encode('utf-8')
+    conn.sendall((
+        f"HTTP/1.1 {status}\r\n"
+        "Content-Type: text/plain; charset=UTF-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"{extra_headers}"
+        "Connection: close\r\n"
+        "\r\n"
+    ).encode('utf-8') + body)
+
+
+def serve_file(conn, root, method, target, headers):
+    path = resolve_path(root, target)
+    if path is None:
+        send_simple(conn, '404 Not Found')
+        return '404'
+
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    extra = ''
+    # Заранее сжатый вариант рядом с файлом (index.html.gz), если клиент принимает gzip
+    if 'gzip' in headers.get('accept-encoding', '') and not headers.get('range'):
+        gz_path = path + '.gz'
+        if os.path.isfile(gz_path) and os.stat(gz_path).st_mtime_ns >= os.stat(path).st_mtime_ns:
+            path = gz_path
+            extra = "Content-Encoding: gzip\r\n"
+    if content_type.startswith(COMPRESSIBLE):
+        extra += "Vary: Accept-Encoding\r\n"
+    if content_type.startswith('text/'):
+        content_type += '; charset=UTF-8'
+
+    stat = os.stat(path)
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}{"-gz" if path.endswith(".gz") else ""}"'
+    validators = (f"ETag: {etag}\r\n"
+                  f"Last-Modified: {formatdate(stat.st_mtime, usegmt=True)}\r\n"
+                  "Cache-Control: no-cache\r\n")
+
+    if not_modified(headers, etag, stat.st_mtime):
+        conn.sendall(f"HTTP/1.1 304 Not Modified\r\n{validators}{extra}Connection: close\r\n\r\n".encode('utf-8'))
+        return '304'
+
+    size = stat.st_size
+    status = '200 OK'
+    start, end = 0, size - 1
+    byte_range = parse_range(headers.get('range'), size)
+    if byte_range is False:
+        send_simple(conn, '416 Range Not Satisfiable', f"Content-Range: bytes */{size}\r\n")
+        return '416'
+    if byte_range:
+        start, end = byte_range
+        status = '206 Partial Content'
+        extra += f"Content-Range: bytes {start}-{end}/{size}\r\n"
+    length = end - start + 1
+
+    conn.sendall((
+        f"HTTP/1.1 {status}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {length}\r\n"
+        "Accept-Ranges: bytes\r\n"
+        f"{validators}{extra}"
+        "Connection: close\r\n"
+        "\r\n"
+    ).encode('utf-8'))
+    if method == 'HEAD' or length == 0:
+        return status[:3]
+
+    if size <= CACHE_FILE_LIMIT:
+        data = read_cached(path, stat)
+        conn.sendall(memoryview(data)[start:end + 1])
+    elif length >= SENDFILE_MIN:
+        with open(path, 'rb') as f:
+            conn.sendfile(f, start, length)
+    else:
+        with open(path, 'rb') as f:
+            f.seek(start)
+            conn.sendall(f.read(length))
+    return status[:3]
+
+
+class StaticHandler(netcore.Handler):
+    """
+    Копит начало запроса до пустой строки, отвечает и закрывает соединение.
+    conn.sendall и conn.sendfile ядра не блокируют: ответ встаёт в очередь
+    соединения, а цикл событий тем временем обслуживает других клиентов.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    def connection_made(self, conn):
+        conn.state = bytearray()
+
+    def data_received(self, conn, data):
+        buffer = conn.state
+        buffer += data
+        if b'\r\n\r\n' not in buffer:
+            if len(buffer) > MAX_REQUEST_SIZE:
+                send_simple(conn, '400 Bad Request')
+                conn.close()
+            return
+        try:
+            request = parse_request(buffer)
+            if request is None:
+                send_simple(conn, '400 Bad Request')
+                return
+            method, target, headers = request
+            if method not in ('GET', 'HEAD'):
+                send_simple(conn, '405 Method Not Allowed', "Allow: GET, HEAD\r\n")
+                return
+            code = serve_file(conn, self.root, method, target, headers)
+            print(f'{conn.addr[0]}:{conn.addr[1]} {method} {target} {code}')
+        except (OSError, ValueError) as e:
             print(f"Ошибка: {e}")
+        finally:
+            conn.close()
+
+
+def precompress(root):
+    """Создаёт file.gz рядом с текстовыми файлами, если его нет или он устарел"""
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            content_type = mimetypes.guess_type(path)[0] or ''
+            if name.endswith('.gz') or not content_type.startswith(COMPRESSIBLE):
+                continue
+            gz_path = path + '.gz'
+            if os.path.exists(gz_path) and os.stat(gz_path).st_mtime_ns >= os.stat(path).st_mtime_ns:
+                continue
+            with open(path, 'rb') as src, gzip.open(gz_path, 'wb', compresslevel=9) as dst:
+                shutil.copyfileobj(src, dst)
+            print(f"Сжат {os.path.relpath(path, root)}")
+
+
+def http_server(host=HOST, port=PORT, root=ROOT, processes=1):
+    root = os.path.realpath(root)
+    server = netcore.Server(StaticHandler(root), host, port, processes=processes,
+                            timeout=CLIENT_TIMEOUT, backlog=128)
+    print(f"HTTP сервер запущен на http://{host}:{port}, каталог {root}")
+    server.serve_forever()
+    print("\nСервер остановлен")
+
 
 if __name__ == "__main__":
-    http_server()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Сервер статических файлов')
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--root', default=ROOT, help='каталог с файлами (по умолчанию static рядом с сервером)')
+    parser.add_argument('--precompress', action='store_true', help='создать .gz для текстовых файлов')
+    parser.add_argument('--processes', type=int, default=1, help='процессов с общим слушающим сокетом')
+    args = parser.parse_args()
+    if args.precompress:
+        precompress(os.path.realpath(args.root))
+    http_server(args.host, args.port, args.root, args.processes)
@@ -0,0 +1,260 @@
+"""
+Нагрузочный тест чата: задержка рассылки (fan-out) на большом числе клиентов.
+
+Подключает --clients клиентов (пачками по --batch), каждый представляется
+и читает входящие строки. --senders из них раз в --interval секунд пишут
+сообщение с отметкой времени; для каждого полученного сообщения считается
+задержка от отправки до получения, а для каждого сообщения целиком - время,
+за которое его получили все клиенты. --slow клиентов представляются и
+больше ничего не читают: в режиме async сервер должен их отключить,
+не задерживая остальных. Пропускную способность в сообщениях в секунду
+меряет protocol_bench.py.
+
+С --rooms клиенты расходятся по комнатам по кругу (/join room<n>), и на
+каждом шаге сообщение пишется в каждую комнату. Для десятков тысяч
+соединений клиенты делятся между --processes процессами, у каждого свой
+адрес источника 127.0.0.x - иначе не хватает локальных портов.
+
+Сервер запускается с --no-join-messages, иначе каждый вход порождает
+рассылку на всех уже подключённых.
+
+    python chat_load.py --mode async --clients 10000
+    python chat_load.py --mode threads --clients 1000 --slow 5
+    python chat_load.py --mode sharded --workers 4 --rooms 100 --clients 50000 --processes 4
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+from protocol import RECV_SIZE, FrameDecoder, encode_message
+
+HOST = 'localhost'
+PORT = 8090
+SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server.py')
+MARK = 'bench'
+SLOW_RCVBUF = 4096
+
+
+def percentile(samples, q):
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+def start_server(mode, host, port, extra_args=()):
+    popen_kwargs = {'start_new_session': True} if os.name == 'posix' else {}
+    proc = subprocess.Popen(
+        [sys.executable, SERVER, '--mode', mode, '--host', host, '--port', str(port), '--no-join-messages',
+         *extra_args],
+        stdout=subprocess.DEVNULL,
+        **popen_kwargs,
+    )
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            # Соединение без имени сервер просто закрывает
+            socket.create_connection((host, port), timeout=0.5).close()
+            return proc
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Сервер не запустился на {host}:{port}")
+
+
+def stop_server(proc):
+    if os.name == 'posix':
+        os.killpg(proc.pid, signal.SIGTERM)
+    else:
+        proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+async def connect(host, port, name, rcvbuf=None, local_addr=None):
+    if rcvbuf:
+        # Маленький приёмный буфер: данные упираются в сервер, а не копятся в ядре клиента
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+        if local_addr:
+            sock.bind(local_addr)
+        sock.setblocking(False)
+        await asyncio.get_running_loop().sock_connect(sock, (host, port))
+        reader, writer = await asyncio.open_connection(sock=sock, limit=1024 * 1024)
+    else:
+        reader, writer = await asyncio.open_connection(host, port, limit=1024 * 1024, local_addr=local_addr)
+    decoder = FrameDecoder()
+    while not decoder.feed(await asyncio.wait_for(reader.read(RECV_SIZE), 30)):
+        pass
+    writer.write(encode_message(name))
+    await writer.drain()
+    return reader, writer
+
+
+async def receive(reader, stats):
+    """Читает сообщения и отмечает время получения сообщений теста"""
+    decoder = FrameDecoder()
+    try:
+        while True:
+            data = await reader.read(RECV_SIZE)
+            if not data:
+                stats['closed'] += 1
+                return
+            now = time.perf_counter()
+            for text in decoder.feed(data):
+                _, sep, payload = text.partition(f']: {MARK} ')
+                if not sep:
+                    continue
+                msg_id, sent = payload.split()[:2]
+                stats['latencies'].append(now - float(sent))
+                stats['last_seen'][msg_id] = now
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+
+
+async def was_dropped(reader):
+    """Дочитывает накопившееся у медленного клиента; True, если сервер закрыл соединение"""
+    try:
+        while await asyncio.wait_for(reader.read(1024 * 1024), 1):
+            pass
+        return True
+    except ConnectionError:
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+def client_room(args, i):
+    return f'room{i % args.rooms}'
+
+
+async def run(args, part=0, barrier=None):
+    """Клиенты с номерами part, part + processes, ...; возвращает собранную статистику"""
+    stats = {'latencies': [], 'last_seen': {}, 'closed': 0}
+    # Каждому процессу свой адрес источника: иначе на 50 000 соединений
+    # к одному порту не хватает локальных портов
+    local_addr = (f'127.0.0.{part + 2}', 0) if args.processes > 1 else None
+    total = args.clients + args.slow
+    mine = list(range(part, total, args.processes))
+    connections = {}
+    started = time.perf_counter()
+    for first in range(0, len(mine), args.batch):
+        batch = mine[first:first + args.batch]
+        opened = await asyncio.gather(*(
+            connect(args.host, args.port, f'user{i}', SLOW_RCVBUF if i >= args.clients else None, local_addr)
+            for i in batch))
+        for i, (reader, writer) in zip(batch, opened):
+            if args.rooms > 1:
+                writer.write(encode_message(f'/join {client_room(args, i)}'))
+            connections[i] = (reader, writer)
+    connect_time = time.perf_counter() - started
+
+    readers = [asyncio.create_task(receive(reader, stats))
+               for i, (reader, _) in connections.items() if i < args.clients]
+    if barrier is not None:
+        await asyncio.get_running_loop().run_in_executor(None, barrier.wait)
+    await asyncio.sleep(1)
+
+    # В каждой комнате на каждом шаге пишет один из первых --senders её участников
+    sent_at = {}
+    padding = 'x' * args.payload
+    for n in range(args.messages):
+        for room in range(args.rooms):
+            i = room + args.rooms * (n % args.senders)
+            if i not in connections:
+                continue
+            msg_id = f'{room}-{n}'
+            sent_at[msg_id] = time.perf_counter()
+            connections[i][1].write(encode_message(f'{MARK} {msg_id} {sent_at[msg_id]!r} {padding}'))
+        await asyncio.sleep(args.interval)
+    await asyncio.sleep(args.settle)
+
+    for task in readers:
+        task.cancel()
+    slow = [reader for i, (reader, _) in connections.items() if i >= args.clients]
+    dropped = sum(await asyncio.gather(*(was_dropped(reader) for reader in slow)))
+    for _, writer in connections.values():
+        writer.transport.abort()
+    stats.update(sent_at=sent_at, dropped=dropped, connected=len(connections), connect_time=connect_time)
+    return stats
+
+
+def run_part(args, part, barrier, results):
+    results.put(asyncio.run(run(args, part, barrier)))
+
+
+def report(args, parts):
+    latencies = [latency for stats in parts for latency in stats['latencies']]
+    sent_at = {}
+    last_seen = {}
+    for stats in parts:
+        sent_at.update(stats['sent_at'])
+        for msg_id, seen in stats['last_seen'].items():
+            last_seen[msg_id] = max(seen, last_seen.get(msg_id, 0))
+    connected = sum(stats['connected'] for stats in parts)
+    connect_time = max(stats['connect_time'] for stats in parts)
+    expected = args.messages * args.clients
+
+    print(f"Подключено {connected} клиентов за {connect_time:.1f} с")
+    fanout = [last_seen[msg_id] - sent for msg_id, sent in sent_at.items() if msg_id in last_seen]
+    print(f"Получено {len(latencies)} из {expected} доставок "
+          f"({args.messages * args.rooms} сообщений в {args.rooms} комнатах, {args.clients} получателей)")
+    print(f"  задержка доставки: p50 {percentile(latencies, 0.5) * 1000:.1f} мс, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.1f} мс, max {max(latencies, default=0) * 1000:.1f} мс")
+    print(f"  сообщение у всех:  p50 {percentile(fanout, 0.5) * 1000:.1f} мс, "
+          f"max {max(fanout, default=0) * 1000:.1f} мс")
+    print(f"  соединений читателей закрыто сервером: {sum(stats['closed'] for stats in parts)}")
+    if args.slow:
+        print(f"  медленных клиентов отключено: {sum(stats['dropped'] for stats in parts)} из {args.slow}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--mode', choices=('threads', 'async', 'sharded', 'core'), default=None,
+                        help='запустить сервер в этом режиме (иначе нужен уже запущенный)')
+    parser.add_argument('--workers', type=int, default=None, help='процессов сервера в режиме sharded')
+    parser.add_argument('--clients', type=int, default=10_000)
+    parser.add_argument('--rooms', type=int, default=1, help='клиенты расходятся по комнатам по кругу')
+    parser.add_argument('--slow', type=int, default=0, help='клиентов, которые не читают входящие')
+    parser.add_argument('--batch', type=int, default=500, help='одновременных подключений при старте')
+    parser.add_argument('--senders', type=int, default=10, help='сколько участников каждой комнаты пишут по очереди')
+    parser.add_argument('--messages', type=int, default=50, help='сообщений в каждую комнату')
+    parser.add_argument('--interval', type=float, default=0.2, help='пауза между сообщениями, с')
+    parser.add_argument('--payload', type=int, default=32, help='байт текста в сообщении')
+    parser.add_argument('--settle', type=float, default=5.0, help='сколько ждать доставки в конце, с')
+    parser.add_argument('--processes', type=int, default=1,
+                        help='процессов с клиентами (у каждого свой адрес 127.0.0.x)')
+    args = parser.parse_args()
+
+    extra_args = ('--workers', str(args.workers)) if args.workers else ()
+    proc = start_server(args.mode, args.host, args.port, extra_args) if args.mode else None
+    try:
+        if args.processes == 1:
+            parts = [asyncio.run(run(args))]
+        else:
+            barrier = multiprocessing.Barrier(args.processes)
+            results = multiprocessing.Queue()
+            workers = [multiprocessing.Process(target=run_part, args=(args, part, barrier, results))
+                       for part in range(args.processes)]
+            for worker in workers:
+                worker.start()
+            parts = [results.get() for _ in workers]
+            for worker in workers:
+                worker.join()
+        report(args, parts)
+    finally:
+        if proc is not None:
+            stop_server(proc)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,17 +1,19 @@
 import socket
 import threading
 
+from protocol import MAX_TEXT_SIZE, RECV_SIZE, FrameDecoder, ProtocolError, encode_message
+
 HOST = 'localhost'
 PORT = 8080
 
-def receive_messages(client_socket):
+def receive_messages(client_socket, decoder):
     while True:
         try:
-            message = client_socket.recv(1024).decode('utf-8')
-            if message:
-                print(message)
-            else:
+            data = client_socket.recv(RECV_SIZE)
+            if not data:
                 break
+            for message in decoder.feed(data):
+                print(message)
         except:
             break
 
@@ -21,7 +23,9 @@ def send_messages(client_socket):
             message = input()
             if message.lower() == 'exit':
                 break
-            client_socket.send(message.encode('utf-8'))
+            client_socket.sendall(encode_message(message, MAX_TEXT_SIZE))
+        except ProtocolError as e:
+            print(f"Не отправлено: {e}")
         except:
             break
 
@@ -31,15 +35,21 @@ def start_client():
     try:
         client_socket.connect((HOST, PORT))
 
-        name_request = client_socket.recv(1024).decode('utf-8')
-        print(name_request, end='')
+        decoder = FrameDecoder()
+        name_request = []
+        while not name_request:
+            data = client_socket.recv(RECV_SIZE)
+            if not data:
+                raise ConnectionError("Сервер закрыл соединение")
+            name_request = decoder.feed(data)
+        print(name_request[0], end='')
 
         name = input()
         if not name:
             name = "Anonymous"
-        client_socket.send(name.encode('utf-8'))
+        client_socket.sendall(encode_message(name))
 
-        receive_thread = threading.Thread(target=receive_messages, args=(client_socket,))
+        receive_thread = threading.Thread(target=receive_messages, args=(client_socket, decoder))
         receive_thread.daemon = True
         receive_thread.start()
         
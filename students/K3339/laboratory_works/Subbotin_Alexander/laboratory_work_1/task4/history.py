@@ -0,0 +1,118 @@
+"""
+История чата фиксированного размера.
+
+В памяти хранятся последние capacity сообщений (deque с maxlen), старые
+вытесняются сами, так что память не растёт, сколько бы ни писали в чат.
+Если задан каталог path, сообщения дописываются в сегменты history.<n>
+в формате кадров protocol.py. Сегмент закрывается после capacity
+сообщений, и хранятся только два последних - в них всегда есть не
+меньше capacity последних сообщений. При старте сегменты читаются по
+порядку, оборванный при сбое последний кадр отрезается.
+
+Запись не ждёт fsync: история переживает перезапуск сервера, но не
+сбой питания.
+"""
+import os
+import threading
+from collections import deque
+from itertools import islice
+
+from protocol import RECV_SIZE, FrameDecoder, encode_messages
+
+HISTORY_SIZE = 1000
+KEEP_SEGMENTS = 2
+
+
+class ChatHistory:
+    """Последние capacity сообщений, при path - с копией на диске"""
+
+    def __init__(self, capacity=HISTORY_SIZE, path=None):
+        if capacity < 1:
+            raise ValueError("Размер истории должен быть положительным")
+        self._messages = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._capacity = capacity
+        self._path = path
+        self._file = None
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+            segments = self._segments()
+            self._segment_records = 0
+            for number in segments:
+                self._segment_records = self._load_segment(self._segment_path(number))
+            # Продолжаем последний сегмент
+            self._segment = segments[-1] if segments else 1
+            self._file = open(self._segment_path(self._segment), 'ab')
+
+    def _segment_path(self, number):
+        return os.path.join(self._path, f'history.{number}')
+
+    def _segments(self):
+        numbers = []
+        for name in os.listdir(self._path):
+            prefix, _, number = name.partition('.')
+            if prefix == 'history' and number.isdigit():
+                numbers.append(int(number))
+        return sorted(numbers)
+
+    def _load_segment(self, path):
+        """Читает сегмент в память; возвращает число сообщений в нём"""
+        decoder = FrameDecoder()
+        count = 0
+        with open(path, 'rb') as f:
+            while True:
+                data = f.read(RECV_SIZE)
+                if not data:
+                    break
+                messages = decoder.feed(data)
+                self._messages.extend(messages)
+                count += len(messages)
+            size = f.tell()
+        if decoder.pending:
+            with open(path, 'r+b') as f:
+                f.truncate(size - decoder.pending)
+        return count
+
+    def extend(self, messages):
+        # Кодируем до сохранения: сообщение, которое нельзя отправить кадром,
+        # не попадает ни в память, ни на диск (ProtocolError)
+        data = encode_messages(messages)
+        with self._lock:
+            self._messages.extend(messages)
+            if self._file is not None:
+                self._file.write(data)
+                self._file.flush()
+                self._segment_records += len(messages)
+                if self._segment_records >= self._capacity:
+                    self._rotate()
+
+    def append(self, message):
+        self.extend((message,))
+
+    def _rotate(self):
+        self._file.close()
+        self._segment += 1
+        self._segment_records = 0
+        self._file = open(self._segment_path(self._segment), 'ab')
+        for number in self._segments():
+            if number <= self._segment - KEEP_SEGMENTS:
+                os.remove(self._segment_path(number))
+
+    def recent(self, count):
+        """Последние count сообщений (не больше capacity)"""
+        with self._lock:
+            if count <= 0:
+                return []
+            # deque не режется срезом: идём с конца и разворачиваем
+            result = list(islice(reversed(self._messages), count))
+        result.reverse()
+        return result
+
+    def __len__(self):
+        return len(self._messages)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
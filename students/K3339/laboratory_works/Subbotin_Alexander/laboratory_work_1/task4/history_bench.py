@@ -0,0 +1,86 @@
+"""
+Память и скорость истории чата на длинной переписке.
+
+Пишет --messages сообщений пачками по --batch в ChatHistory (в памяти и с
+каталогом на диске) и каждые 10% печатает RSS процесса, размер файлов
+истории и скорость записи. Для сравнения то же для обычного списка, в
+который история раньше дописывалась без ограничения (--list-messages,
+по умолчанию меньше - список растёт на сотни байт на сообщение).
+В конце история с диска загружается заново и проверяется, что последние
+сообщения совпали.
+
+    python history_bench.py --messages 10000000
+"""
+import argparse
+import os
+import resource
+import tempfile
+import time
+
+from history import HISTORY_SIZE, ChatHistory
+
+
+def rss_mb():
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except OSError:
+        # Не Linux: пиковое значение вместо текущего
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def dir_size_mb(path):
+    if path is None:
+        return 0.0
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path)) / 1024 / 1024
+
+
+def fill(label, history, messages, batch, path=None):
+    print(f"{label}:")
+    step = max(batch, messages // 10 // batch * batch)
+    started = last = time.perf_counter()
+    for first in range(0, messages, batch):
+        history.extend([f"[user{i % 100}]: сообщение номер {i}" for i in range(first, first + batch)])
+        written = first + batch
+        if written % step == 0 or written >= messages:
+            now = time.perf_counter()
+            rate = step / (now - last) if now > last else 0.0
+            last = now
+            print(f"  {written:>10} сообщений: RSS {rss_mb():7.1f} МБ, на диске {dir_size_mb(path):6.2f} МБ, "
+                  f"{rate:9.0f} сообщений/с")
+    elapsed = time.perf_counter() - started
+    print(f"  всего {messages / elapsed:.0f} сообщений/с")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=10_000_000)
+    parser.add_argument('--list-messages', type=int, default=1_000_000)
+    parser.add_argument('--batch', type=int, default=100)
+    parser.add_argument('--size', type=int, default=HISTORY_SIZE, help='ёмкость истории')
+    args = parser.parse_args()
+
+    fill(f"ChatHistory({args.size}) в памяти", ChatHistory(args.size), args.messages, args.batch)
+
+    with tempfile.TemporaryDirectory() as path:
+        history = ChatHistory(args.size, path)
+        fill(f"ChatHistory({args.size}) с каталогом на диске", history, args.messages, args.batch, path)
+        expected = history.recent(args.size)
+        history.close()
+
+        started = time.perf_counter()
+        reloaded = ChatHistory(args.size, path)
+        load_ms = (time.perf_counter() - started) * 1000
+        assert reloaded.recent(args.size) == expected
+        reloaded.close()
+        print(f"  загрузка с диска: {load_ms:.1f} мс, последние {len(expected)} сообщений совпали")
+
+    chat_history = []
+    before = rss_mb()
+    fill("список без ограничения", chat_history, args.list_messages, args.batch)
+    print(f"  прирост RSS: {rss_mb() - before:.1f} МБ")
+
+
+if __name__ == '__main__':
+    main()
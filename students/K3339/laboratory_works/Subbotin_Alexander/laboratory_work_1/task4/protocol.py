@@ -0,0 +1,73 @@
+"""
+Формат сообщений чата, общий для server.py и client.py.
+
+Каждое сообщение - кадр [длина: 4 байта, big-endian][текст в UTF-8].
+Несколько кадров можно склеить и отправить одной записью (encode_messages),
+а FrameDecoder собирает кадры из кусков, как их отдаёт recv: кадр может
+прийти частями или вместе с соседними, текст декодируется только целиком,
+поэтому многобайтовый символ на границе recv не ломается.
+"""
+import struct
+
+FRAME_HEADER = struct.Struct('!I')
+MAX_MESSAGE_SIZE = 64 * 1024
+# Текст от клиента короче кадра: сервер дописывает к нему "[имя]: ", и
+# результат должен остаться не длиннее MAX_MESSAGE_SIZE
+MAX_TEXT_SIZE = MAX_MESSAGE_SIZE - 1024
+RECV_SIZE = 64 * 1024
+
+
+class ProtocolError(Exception):
+    """Кадр длиннее MAX_MESSAGE_SIZE или не в UTF-8"""
+
+
+def encode_message(text: str, max_size=MAX_MESSAGE_SIZE) -> bytes:
+    data = text.encode('utf-8')
+    if len(data) > max_size:
+        raise ProtocolError(f"Сообщение длиннее {max_size} байт")
+    return FRAME_HEADER.pack(len(data)) + data
+
+
+def encode_messages(texts) -> bytes:
+    """Несколько кадров одним буфером - для отправки одной записью"""
+    return b''.join([encode_message(text) for text in texts])
+
+
+class FrameDecoder:
+    """Собирает кадры из поступающих кусков данных"""
+
+    def __init__(self, max_size=MAX_MESSAGE_SIZE):
+        self._buffer = bytearray()
+        self._max_size = max_size
+
+    def feed(self, data) -> list:
+        """Добавляет прочитанные байты, возвращает список целых сообщений"""
+        buffer = self._buffer
+        buffer += data
+        messages = []
+        pos = 0
+        end = len(buffer)
+        view = memoryview(buffer)
+        try:
+            while end - pos >= FRAME_HEADER.size:
+                (size,) = FRAME_HEADER.unpack_from(buffer, pos)
+                if size > self._max_size:
+                    raise ProtocolError(f"Кадр {size} байт длиннее {self._max_size}")
+                start = pos + FRAME_HEADER.size
+                if end - start < size:
+                    break
+                try:
+                    messages.append(str(view[start:start + size], 'utf-8'))
+                except UnicodeDecodeError:
+                    raise ProtocolError("Сообщение не в UTF-8") from None
+                pos = start + size
+        finally:
+            view.release()
+        if pos:
+            del buffer[:pos]
+        return messages
+
+    @property
+    def pending(self) -> int:
+        """Байт недособранного кадра"""
+        return len(self._buffer)
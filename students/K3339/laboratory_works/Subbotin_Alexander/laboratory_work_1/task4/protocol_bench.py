@@ -0,0 +1,123 @@
+"""
+Пропускная способность протокола чата в сообщениях в секунду.
+
+Сначала кодирование и разбор кадров в одном процессе: --messages
+сообщений кодируются по одному и пачками, затем поток байтов режется на
+куски случайной длины и собирается FrameDecoder (с проверкой, что
+сообщения совпали). Затем сервер в каждом режиме из --modes: --senders
+клиентов отправляют по --messages сообщений пачками по --batch кадров
+в одну запись, --receivers клиентов их читают; время считается до
+получения последнего сообщения последним клиентом.
+
+    python protocol_bench.py --modes threads,async --batch 1,16
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from chat_load import HOST, PORT, connect, start_server, stop_server
+from protocol import RECV_SIZE, FrameDecoder, encode_message, encode_messages
+
+
+def bench_codec(count, payload):
+    texts = [f"сообщение {i} {'x' * payload}" for i in range(count)]
+
+    started = time.perf_counter()
+    data = b''.join([encode_message(text) for text in texts])
+    encode_one = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batched = b''.join([encode_messages(texts[i:i + 64]) for i in range(0, count, 64)])
+    encode_batch = time.perf_counter() - started
+    assert batched == data
+
+    rng = random.Random(1)
+    chunks = []
+    pos = 0
+    while pos < len(data):
+        size = rng.randint(1, RECV_SIZE)
+        chunks.append(data[pos:pos + size])
+        pos += size
+
+    decoder = FrameDecoder()
+    decoded = []
+    started = time.perf_counter()
+    for chunk in chunks:
+        decoded += decoder.feed(chunk)
+    decode = time.perf_counter() - started
+    assert decoded == texts and decoder.pending == 0
+
+    print(f"Кодек: {count} сообщений по {len(data) // count} байт")
+    print(f"  кодирование по одному: {count / encode_one:12.0f} сообщений/с")
+    print(f"  кодирование пачками:   {count / encode_batch:12.0f} сообщений/с")
+    print(f"  разбор кусков recv:    {count / decode:12.0f} сообщений/с")
+
+
+async def receive_count(reader, expected, prefix):
+    decoder = FrameDecoder()
+    received = 0
+    while received < expected:
+        data = await reader.read(RECV_SIZE)
+        if not data:
+            break
+        received += sum(1 for text in decoder.feed(data) if text.startswith(prefix))
+    return received
+
+
+async def send_all(writer, name, messages, batch, payload):
+    padding = 'x' * payload
+    for first in range(0, messages, batch):
+        writer.write(encode_messages(f'{name} {i} {padding}' for i in range(first, min(messages, first + batch))))
+        await writer.drain()
+
+
+async def bench_server(args, batch):
+    senders = [await connect(args.host, args.port, f's{i}') for i in range(args.senders)]
+    receivers = [await connect(args.host, args.port, f'r{i}') for i in range(args.receivers)]
+    await asyncio.sleep(0.5)
+
+    expected = args.senders * args.messages
+    started = time.perf_counter()
+    counters = [asyncio.create_task(receive_count(reader, expected, '[s')) for reader, _ in receivers]
+    await asyncio.gather(*(send_all(writer, f's{i}', args.messages, batch, args.payload)
+                           for i, (_, writer) in enumerate(senders)))
+    received = await asyncio.wait_for(asyncio.gather(*counters), 120)
+    elapsed = time.perf_counter() - started
+
+    for _, writer in senders + receivers:
+        writer.transport.abort()
+    delivered = sum(received)
+    return expected / elapsed, delivered / elapsed, delivered == expected * args.receivers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--modes', default='threads,async')
+    parser.add_argument('--batch', default='1,16', help='кадров в одной записи отправителя')
+    parser.add_argument('--senders', type=int, default=4)
+    parser.add_argument('--receivers', type=int, default=16)
+    parser.add_argument('--messages', type=int, default=20_000, help='сообщений на отправителя')
+    parser.add_argument('--payload', type=int, default=32)
+    args = parser.parse_args()
+
+    bench_codec(args.senders * args.messages * 4, args.payload)
+
+    print(f"Через сервер: {args.senders} отправителей по {args.messages} сообщений, "
+          f"{args.receivers} получателей")
+    for mode in args.modes.split(','):
+        for batch in map(int, args.batch.split(',')):
+            proc = start_server(mode, args.host, args.port)
+            try:
+                sent, delivered, complete = asyncio.run(bench_server(args, batch))
+            finally:
+                stop_server(proc)
+            note = '' if complete else '  (доставлено не всё)'
+            print(f"  {mode:<8} пачка {batch:>3}: принято {sent:9.0f} сообщений/с, "
+                  f"доставлено {delivered:10.0f} сообщений/с{note}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Комнаты чата.
+
+Состав комнаты - frozenset, который при входе и выходе заменяется новым
+под блокировкой этой комнаты (копирование при записи). Рассылка читает
+текущий frozenset без блокировки: это снимок, который не меняется, пока
+по нему идёт отправка, поэтому входы и выходы не ждут медленных рассылок,
+а рассылки не ждут друг друга. У каждой комнаты своя блокировка и своя
+история; общий словарь комнат блокируется только при создании и удалении
+комнаты.
+
+Опустевшая комната (кроме DEFAULT_ROOM) удаляется, иначе каждое имя из
+/join навсегда занимало бы историю, а с history_dir ещё и открытый файл.
+История на диске читается заново при следующем входе в комнату, история
+в памяти пропадает вместе с комнатой.
+"""
+import os
+import threading
+
+from history import HISTORY_SIZE, ChatHistory
+
+DEFAULT_ROOM = 'general'
+MAX_ROOM_NAME = 64
+
+
+def valid_room_name(name):
+    return 0 < len(name) <= MAX_ROOM_NAME and name.isprintable()
+
+
+class Room:
+    def __init__(self, name, history):
+        self.name = name
+        self.members = frozenset()
+        self.history = history
+        # Комната удалена из Rooms, войти в неё уже нельзя
+        self.closed = False
+        self._lock = threading.Lock()
+
+    def add(self, member):
+        """Добавляет участника; возвращает, сколько их стало, 0 - комната уже удалена"""
+        with self._lock:
+            if self.closed:
+                return 0
+            self.members = self.members | {member}
+            return len(self.members)
+
+    def remove(self, member):
+        """Убирает участника; возвращает, сколько их осталось"""
+        with self._lock:
+            self.members = self.members - {member}
+            return len(self.members)
+
+    def close_if_empty(self):
+        with self._lock:
+            if not self.members:
+                self.closed = True
+            return self.closed
+
+
+class Rooms:
+    """Комнаты по именам; с history_dir история каждой комнаты хранится на диске"""
+
+    def __init__(self, history_size=HISTORY_SIZE, history_dir=None):
+        self._rooms = {}
+        self._lock = threading.Lock()
+        self._history_size = history_size
+        self._history_dir = history_dir
+
+    def get(self, name, create=True, persistent=True):
+        room = self._rooms.get(name)
+        if room is None and create:
+            with self._lock:
+                room = self._rooms.get(name)
+                if room is None:
+                    room = self._rooms[name] = Room(name, self.new_history(name if persistent else None))
+        return room
+
+    def join(self, name, member, persistent=True):
+        """Комната name с новым участником; удалённую тем временем комнату создаёт заново"""
+        while True:
+            room = self.get(name, persistent=persistent)
+            if room.add(member):
+                return room
+
+    def new_history(self, name=None):
+        path = None
+        if name is not None and self._history_dir is not None:
+            # Имя комнаты - любой текст, в имени каталога только hex
+            path = os.path.join(self._history_dir, name.encode('utf-8').hex())
+        return ChatHistory(self._history_size, path)
+
+    def discard(self, name):
+        with self._lock:
+            room = self._rooms.pop(name, None)
+        if room is not None:
+            room.history.close()
+
+    def discard_if_empty(self, room):
+        """Удаляет комнату, если в ней никого нет; DEFAULT_ROOM не удаляется"""
+        if room.name == DEFAULT_ROOM:
+            return False
+        with self._lock:
+            if self._rooms.get(room.name) is not room or not room.close_if_empty():
+                return False
+            del self._rooms[room.name]
+        room.history.close()
+        return True
+
+    def close(self):
+        with self._lock:
+            for room in self._rooms.values():
+                room.history.close()
@@ -1,138 +1,736 @@
+import argparse
+import asyncio
+import json
+import os
+import signal
 import socket
+import sys
 import threading
+import zlib
+
+from history import HISTORY_SIZE
+from protocol import MAX_TEXT_SIZE, RECV_SIZE, FrameDecoder, ProtocolError, encode_message, encode_messages
+from rooms import DEFAULT_ROOM, MAX_ROOM_NAME, Rooms, valid_room_name
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import netcore
 
 HOST = 'localhost'
 PORT = 8080
+BACKLOG = 1024
+MODES = ('threads', 'async', 'sharded', 'core')
+# Режим async: сообщений в очереди клиента и секунд на отправку ему пачки,
+# после которых клиент считается медленным и отключается
+OUTBOX_SIZE = 256
+SLOW_CLIENT_TIMEOUT = 5
+# Режим core: сколько байт может ждать отправки клиенту, прежде чем он будет отключён
+SLOW_CLIENT_BUFFER = 1024 * 1024
+NAME_TIMEOUT = 30
+# Имя длиннее обрезается: с ним "[имя]: текст" укладывается в кадр (MAX_TEXT_SIZE)
+MAX_NAME_LENGTH = 32
+# Кадры между шардами несут списки сообщений целиком (снимок истории)
+RELAY_MAX_FRAME = 2 ** 31
+# Сколько последних сообщений истории получает вошедший клиент
+HISTORY_REPLAY = 10
+# Пока в буфере транспорта меньше этого, сообщения пишутся в него напрямую
+WRITE_BUFFER_LIMIT = 64 * 1024
+HELP = f"Команды: /join <комната> (до {MAX_ROOM_NAME} символов), /leave - вернуться в {DEFAULT_ROOM}, exit"
 
-clients = {}
-chat_history = []
-clients_lock = threading.Lock()
+rooms = Rooms()
+history_replay = HISTORY_REPLAY
+announce_joins = True
 
-def remove_client_silent(client_socket):
-    with clients_lock:
-        if client_socket in clients:
-            client_name = clients[client_socket]
-            del clients[client_socket]
-            print(f"Клиент {client_name} отключен")
-    
-    try:
-        client_socket.close()
-    except:
-        pass
+def raise_keyboard_interrupt(signum, frame):
+    """SIGTERM завершает сервер так же, как Ctrl+C"""
+    raise KeyboardInterrupt
+
+def parse_client_name(message):
+    return message.strip()[:MAX_NAME_LENGTH] or "Anonymous"
 
-def broadcast_message(message: str, sender_name: str = '', exclude_client: bool = None):
+def format_messages(messages, sender_name=''):
     if sender_name:
-        formatted_message = f"[{sender_name}]: {message}"
-    else:
-        formatted_message = message
-    
-    chat_history.append(formatted_message)
-    
-    with clients_lock:
-        disconnected_clients = []
-        for client_socket in list(clients.keys()):
-            if client_socket != exclude_client:
-                try:
-                    client_socket.send(formatted_message.encode('utf-8'))
-                except:
-                    disconnected_clients.append(client_socket)
-        
-        for client in disconnected_clients:
-            remove_client_silent(client)
-
-def remove_client(client_socket):
-    with clients_lock:
-        if client_socket in clients:
-            client_name = clients[client_socket]
-            del clients[client_socket]
-            print(f"Клиент {client_name} отключен")
-            
-            broadcast_message(f"{client_name} покинул чат", exclude_client=client_socket)
-    
-    try:
-        client_socket.close()
-    except:
-        pass
+        return [f"[{sender_name}]: {message}" for message in messages]
+    return list(messages)
+
+def history_messages(room):
+    recent = room.history.recent(history_replay)
+    if not recent:
+        return []
+    return [f"--- История комнаты {room.name} ---", *recent, "--- Конец истории ---"]
+
+def split_commands(messages):
+    """
+    Делит пачку сообщений клиента на действия по порядку: ('say', [тексты])
+    для идущих подряд обычных сообщений, ('join', комната), ('exit', None)
+    и ('reply', текст) - ответ только этому клиенту.
+    """
+    actions = []
+    texts = []
+    for message in messages:
+        message = message.strip()
+        if not message:
+            continue
+        if message.lower() != 'exit' and not message.startswith('/'):
+            texts.append(message)
+            continue
+        if texts:
+            actions.append(('say', texts))
+            texts = []
+        command, _, argument = message.partition(' ')
+        command = command.lower()
+        argument = argument.strip()
+        if command == 'exit':
+            actions.append(('exit', None))
+        elif command == '/join' and valid_room_name(argument):
+            actions.append(('join', argument))
+        elif command == '/leave':
+            actions.append(('join', DEFAULT_ROOM))
+        else:
+            actions.append(('reply', HELP))
+    if texts:
+        actions.append(('say', texts))
+    return actions
+
+# ----- режим threads: поток на клиента -----
+
+def broadcast_messages(room, messages, sender_name: str = ''):
+    """Рассылает несколько сообщений одной записью в каждый сокет комнаты"""
+    formatted_messages = format_messages(messages, sender_name)
+    room.history.extend(formatted_messages)
+    data = encode_messages(formatted_messages)
+    # room.members - неизменяемый снимок состава: рассылка идёт без блокировок,
+    # медленный клиент задерживает только этот поток
+    for client_socket in room.members:
+        try:
+            client_socket.sendall(data)
+        except OSError:
+            # Сокет закроет поток этого клиента: recv вернёт пустой ответ
+            try:
+                client_socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+def enter_room(client_socket, client_name, room_name, announcement):
+    room = rooms.join(room_name, client_socket)
+    history = history_messages(room)
+    if history:
+        try:
+            client_socket.sendall(encode_messages(history))
+        except OSError:
+            room.remove(client_socket)
+            rooms.discard_if_empty(room)
+            raise
+    if announce_joins:
+        broadcast_messages(room, [announcement])
+    return room
+
+def leave_room(client_socket, room, announcement):
+    room.remove(client_socket)
+    if announce_joins:
+        broadcast_messages(room, [announcement])
+    rooms.discard_if_empty(room)
+
+def recv_messages(client_socket, decoder):
+    """Читает из сокета, пока не соберётся хотя бы одно сообщение; None - соединение закрыто"""
+    while True:
+        data = client_socket.recv(RECV_SIZE)
+        if not data:
+            return None
+        messages = decoder.feed(data)
+        if messages:
+            return messages
 
 def handle_client(client_socket):
     client_name = None
-    
+    room = None
+    decoder = FrameDecoder(max_size=MAX_TEXT_SIZE)
+
     try:
-        client_socket.send("Введите ваше имя: ".encode('utf-8'))
-        client_name = client_socket.recv(1024).decode('utf-8').strip()
-        
-        if not client_name:
-            client_name = "Anonymous"
-        
-        with clients_lock:
-            clients[client_socket] = client_name
-        
+        client_socket.sendall(encode_message("Введите ваше имя: "))
+        messages = recv_messages(client_socket, decoder)
+        if messages is None:
+            return
+        client_name = parse_client_name(messages[0])
+        pending = messages[1:]
+
         print(f"Клиент {client_name} подключился")
-        
-        broadcast_message(f"{client_name} присоединился к чату")
-        
-        if chat_history:
-            history_text = "\n--- История чата ---\n" + "\n".join(chat_history[-10:]) + "\n--- Конец истории ---\n"
-            try:
-                client_socket.send(history_text.encode('utf-8'))
-            except:
-                pass
+        room = enter_room(client_socket, client_name, DEFAULT_ROOM, f"{client_name} присоединился к чату")
 
         while True:
             try:
-                message = client_socket.recv(1024).decode('utf-8').strip()
-                
-                if not message:
+                messages = pending or recv_messages(client_socket, decoder)
+                pending = None
+
+                if messages is None:
                     break
-                    
-                if message.lower() == 'exit':
+
+                exit_requested = False
+                for action, argument in split_commands(messages):
+                    if action == 'say':
+                        broadcast_messages(room, argument, client_name)
+                    elif action == 'join' and argument != room.name:
+                        leave_room(client_socket, room, f"{client_name} перешёл в комнату {argument}")
+                        room = enter_room(client_socket, client_name, argument,
+                                          f"{client_name} вошёл в комнату {argument}")
+                    elif action == 'reply':
+                        client_socket.sendall(encode_message(argument))
+                    elif action == 'exit':
+                        exit_requested = True
+                        break
+                if exit_requested:
                     break
-                
-                broadcast_message(message, client_name)
-                
+
+            except ProtocolError as e:
+                print(f"Клиент {client_name} нарушил протокол: {e}")
+                break
             except ConnectionResetError:
                 print(f"Клиент {client_name} неожиданно отключился")
                 break
             except Exception as e:
                 print(f"Ошибка получения сообщения от {client_name}: {e}")
                 break
-            
+
     except Exception as e:
         print(f"Ошибка при обработке клиента {client_name}: {e}")
     finally:
-        remove_client(client_socket)
+        if room is not None:
+            print(f"Клиент {client_name} отключен")
+            leave_room(client_socket, room, f"{client_name} покинул чат")
+        try:
+            client_socket.close()
+        except OSError:
+            pass
 
 def accept_connections(server_socket):
     while True:
         try:
             client_socket, client_address = server_socket.accept()
             print(f"Подключение от {client_address}")
-            
+
             client_thread = threading.Thread(target=handle_client, args=(client_socket,))
             client_thread.daemon = True
             client_thread.start()
-            
+
         except Exception as e:
             print(f"Ошибка при принятии подключения: {e}")
 
-def start_server():
+
+# ----- режимы async и sharded: цикл событий asyncio -----
+
+class AsyncClient:
+    """Клиент в режиме async: исходящие сообщения копятся в ограниченной очереди"""
+
+    def __init__(self, name, writer):
+        self.name = name
+        self.writer = writer
+        self.outbox = asyncio.Queue(OUTBOX_SIZE)
+        self.sender = None
+        self.room = None
+
+
+class ShardRelay:
+    """
+    Связь процесса с остальными в режиме sharded. Комната принадлежит
+    процессу crc32(имя) % workers: он хранит её историю и задаёт порядок
+    сообщений. Процесс, у которого есть участники чужой комнаты,
+    подписывается на неё у владельца, получает снимок истории и дальше
+    копии всех сообщений; свои сообщения в чужую комнату он отправляет
+    владельцу. Процессы связаны попарно Unix-сокетами, по ним идут кадры
+    protocol.py с JSON [вид, комната, данные].
+    """
+
+    def __init__(self, index, peers):
+        self.index = index
+        self.count = len(peers) + 1
+        self._peers = peers
+        self._writers = {}
+        # Владелец: комната -> номера подписанных процессов
+        self._subscribers = {}
+        # Подписчик: комната -> число ещё не пришедших снимков истории
+        # и клиенты, которые ждут снимок, чтобы получить историю
+        self._pending = {}
+        self._waiting = {}
+
+    async def start(self):
+        for index, sock in self._peers.items():
+            reader, writer = await asyncio.open_unix_connection(sock=sock, limit=RECV_SIZE)
+            self._writers[index] = writer
+            asyncio.create_task(self.listen(index, reader))
+
+    def owns(self, room_name):
+        return self.owner(room_name) == self.index
+
+    def owner(self, room_name):
+        return zlib.crc32(room_name.encode('utf-8')) % self.count
+
+    def send(self, index, kind, room_name, payload=None):
+        frame = encode_message(json.dumps([kind, room_name, payload], ensure_ascii=False), RELAY_MAX_FRAME)
+        self._writers[index].write(frame)
+
+    def forward(self, room_name, messages):
+        """Владелец отправляет сообщения комнаты подписчикам - один кадр на всех"""
+        subscribers = self._subscribers.get(room_name)
+        if subscribers:
+            frame = encode_message(json.dumps(['msg', room_name, messages], ensure_ascii=False), RELAY_MAX_FRAME)
+            for index in subscribers:
+                self._writers[index].write(frame)
+
+    def subscribe(self, room, client):
+        """Первый участник чужой комнаты в процессе: подписка; историю клиент получит со снимком"""
+        if room.members == {client}:
+            self._pending[room.name] = self._pending.get(room.name, 0) + 1
+            self.send(self.owner(room.name), 'sub', room.name)
+        if self._pending.get(room.name):
+            self._waiting.setdefault(room.name, []).append(client)
+            return False
+        return True
+
+    def has_subscribers(self, room_name):
+        return bool(self._subscribers.get(room_name))
+
+    def unsubscribe(self, room):
+        if not room.members:
+            self._waiting.pop(room.name, None)
+            self.send(self.owner(room.name), 'unsub', room.name)
+            rooms.discard(room.name)
+
+    async def listen(self, index, reader):
+        decoder = FrameDecoder(max_size=RELAY_MAX_FRAME)
+        while True:
+            try:
+                data = await reader.read(RECV_SIZE)
+            except ConnectionError:
+                # Соседний процесс завершился - сервер останавливается
+                return
+            if not data:
+                return
+            for text in decoder.feed(data):
+                kind, room_name, payload = json.loads(text)
+                try:
+                    self.dispatch(index, kind, room_name, payload)
+                except Exception as e:
+                    print(f"Ошибка обработки {kind} для комнаты {room_name}: {e}")
+
+    def dispatch(self, index, kind, room_name, payload):
+        if kind == 'pub':
+            publish(rooms.get(room_name), payload)
+        elif kind == 'sub':
+            self._subscribers.setdefault(room_name, set()).add(index)
+            self.send(index, 'hist', room_name, rooms.get(room_name).history.recent(history_replay))
+        elif kind == 'unsub':
+            subscribers = self._subscribers.get(room_name, set())
+            subscribers.discard(index)
+            if not subscribers:
+                self._subscribers.pop(room_name, None)
+                room = rooms.get(room_name, create=False)
+                if room is not None:
+                    rooms.discard_if_empty(room)
+        elif kind == 'hist':
+            self._pending[room_name] -= 1
+            if self._pending[room_name]:
+                # Снимок устарел: после него уже отправлена новая подписка
+                return
+            del self._pending[room_name]
+            room = rooms.get(room_name, create=False)
+            if room is None:
+                return
+            room.history = rooms.new_history()
+            room.history.extend(payload)
+            history = history_messages(room)
+            for client in self._waiting.pop(room_name, ()):
+                if client.room is room and history:
+                    client.writer.write(encode_messages(history))
+        elif kind == 'msg':
+            room = rooms.get(room_name, create=False)
+            # До последнего снимка сообщения не нужны: они в нём уже есть
+            if room is not None and not self._pending.get(room_name):
+                room.history.extend(payload)
+                deliver_local(room, encode_messages(payload))
+
+
+async_clients = {}
+shard = None
+
+
+def deliver_local(room, data):
+    """
+    Рассылка участникам комнаты в этом процессе: данные кладутся в очередь
+    каждого клиента, отправкой занимается его собственная задача.
+    Переполненная очередь означает, что клиент не успевает читать, -
+    его отключаем, а не ждём.
+    """
+    for client in room.members:
+        # Клиент успевает читать - пишем сразу в транспорт, без пробуждения задачи
+        if client.outbox.empty() and client.writer.transport.get_write_buffer_size() < WRITE_BUFFER_LIMIT:
+            client.writer.write(data)
+            continue
+        try:
+            client.outbox.put_nowait(data)
+        except asyncio.QueueFull:
+            drop_slow_client(client, "очередь сообщений переполнена")
+
+
+def publish(room, formatted_messages):
+    """Сообщения в комнату: владелец рассылает сам, иначе они уходят владельцу"""
+    if shard is not None and not shard.owns(room.name):
+        shard.send(shard.owner(room.name), 'pub', room.name, formatted_messages)
+        return
+    room.history.extend(formatted_messages)
+    deliver_local(room, encode_messages(formatted_messages))
+    if shard is not None:
+        shard.forward(room.name, formatted_messages)
+
+
+def enter_room_async(client, room_name, announcement):
+    room = rooms.join(room_name, client, persistent=shard is None or shard.owns(room_name))
+    client.room = room
+    if shard is None or shard.owns(room_name) or shard.subscribe(room, client):
+        history = history_messages(room)
+        if history:
+            client.writer.write(encode_messages(history))
+    if announce_joins:
+        publish(room, [announcement])
+
+
+def leave_room_async(client, announcement):
+    room = client.room
+    if room is None:
+        return
+    client.room = None
+    room.remove(client)
+    if announce_joins:
+        publish(room, [announcement])
+    if shard is not None and not shard.owns(room.name):
+        shard.unsubscribe(room)
+    elif shard is None or not shard.has_subscribers(room.name):
+        # Комнату владельца не удаляем, пока её история нужна подписчикам
+        rooms.discard_if_empty(room)
+
+
+def drop_slow_client(client: AsyncClient, reason: str):
+    if async_clients.pop(client.writer, None) is None:
+        return
+    print(f"Клиент {client.name} отключен как медленный: {reason}")
+    client.writer.transport.abort()
+    if client.sender is not None and client.sender is not asyncio.current_task():
+        client.sender.cancel()
+    leave_room_async(client, f"{client.name} покинул чат")
+
+
+async def send_outbox(client: AsyncClient):
+    """Отправляет накопившиеся сообщения клиента пачками"""
+    while True:
+        batch = [await client.outbox.get()]
+        while not client.outbox.empty():
+            batch.append(client.outbox.get_nowait())
+        client.writer.write(b''.join(batch))
+        try:
+            await asyncio.wait_for(client.writer.drain(), SLOW_CLIENT_TIMEOUT)
+        except asyncio.TimeoutError:
+            drop_slow_client(client, f"не принял данные за {SLOW_CLIENT_TIMEOUT} с")
+            return
+        except ConnectionError:
+            return
+
+
+async def handle_client_async(reader, writer):
+    client = None
+    stopping = False
+    decoder = FrameDecoder(max_size=MAX_TEXT_SIZE)
+    try:
+        writer.write(encode_message("Введите ваше имя: "))
+        await writer.drain()
+        messages = []
+        while not messages:
+            data = await asyncio.wait_for(reader.read(RECV_SIZE), NAME_TIMEOUT)
+            if not data:
+                return
+            messages = decoder.feed(data)
+        client = AsyncClient(parse_client_name(messages[0]), writer)
+        async_clients[writer] = client
+        client.sender = asyncio.create_task(send_outbox(client))
+        print(f"Клиент {client.name} подключился")
+        enter_room_async(client, DEFAULT_ROOM, f"{client.name} присоединился к чату")
+
+        messages = messages[1:]
+        while writer in async_clients:
+            for action, argument in split_commands(messages):
+                if action == 'say':
+                    publish(client.room, format_messages(argument, client.name))
+                elif action == 'join' and argument != client.room.name:
+                    leave_room_async(client, f"{client.name} перешёл в комнату {argument}")
+                    enter_room_async(client, argument, f"{client.name} вошёл в комнату {argument}")
+                elif action == 'reply':
+                    writer.write(encode_message(argument))
+                elif action == 'exit':
+                    return
+            data = await reader.read(RECV_SIZE)
+            if not data:
+                break
+            messages = decoder.feed(data)
+
+    except (ConnectionError, asyncio.TimeoutError):
+        pass
+    except asyncio.CancelledError:
+        # Сервер останавливается; обработчик верхнего уровня, отмену дальше не передаём,
+        # иначе start_server печатает её как ошибку
+        stopping = True
+    except ProtocolError as e:
+        print(f"Клиент {client.name if client else None} нарушил протокол: {e}")
+    except Exception as e:
+        print(f"Ошибка при обработке клиента {client.name if client else None}: {e}")
+    finally:
+        if client is not None and async_clients.pop(writer, None) is not None:
+            client.sender.cancel()
+            if not stopping:
+                print(f"Клиент {client.name} отключен")
+                leave_room_async(client, f"{client.name} покинул чат")
+        writer.close()
+
+
+async def serve_async(server_socket, relay=None):
+    global shard
+    shard = relay
+    if relay is not None:
+        await relay.start()
+    # start_server заново вызывает listen() на сокете - передаём ту же очередь
+    server = await asyncio.start_server(handle_client_async, sock=server_socket, backlog=BACKLOG)
+    # Сигналы завершают цикл событий штатно, а не исключением посреди обработки
+    # (в режиме sharded SIGTERM приходит дважды: всей группе и от родителя)
+    stopped = asyncio.get_running_loop().create_future()
+
+    def stop():
+        if not stopped.done():
+            stopped.set_result(None)
+
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            asyncio.get_running_loop().add_signal_handler(signum, stop)
+        except (NotImplementedError, RuntimeError):
+            pass
+    async with server:
+        await stopped
+
+
+# ----- режим core: общее ядро netcore -----
+
+class CoreClient:
+    """Клиент в режиме core: очередь отправки - очередь соединения ядра"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.name = None
+        self.room = None
+        self.decoder = FrameDecoder(max_size=MAX_TEXT_SIZE)
+
+
+def publish_core(room, formatted_messages):
+    """Рассылка одной записью в каждое соединение; не успевающий читать клиент отключается"""
+    room.history.extend(formatted_messages)
+    data = encode_messages(formatted_messages)
+    for client in room.members:
+        if client.conn.buffered > SLOW_CLIENT_BUFFER:
+            drop_core_client(client, f"не принял {client.conn.buffered} байт")
+        else:
+            client.conn.sendall(data)
+
+
+def enter_room_core(client, room_name, announcement):
+    room = rooms.join(room_name, client)
+    client.room = room
+    history = history_messages(room)
+    if history:
+        client.conn.sendall(encode_messages(history))
+    if announce_joins:
+        publish_core(room, [announcement])
+
+
+def leave_room_core(client, announcement):
+    room = client.room
+    if room is None:
+        return
+    client.room = None
+    room.remove(client)
+    if announce_joins and announcement:
+        publish_core(room, [announcement])
+    rooms.discard_if_empty(room)
+
+
+def drop_core_client(client, reason):
+    if client.conn.closed:
+        return
+    print(f"Клиент {client.name} отключен как медленный: {reason}")
+    # connection_lost обработчика выведет клиента из комнаты
+    client.conn.abort()
+
+
+class ChatHandler(netcore.Handler):
+    def connection_made(self, conn):
+        conn.state = CoreClient(conn)
+        conn.sendall(encode_message("Введите ваше имя: "))
+
+    def data_received(self, conn, data):
+        client = conn.state
+        try:
+            messages = client.decoder.feed(data)
+        except ProtocolError as e:
+            print(f"Клиент {client.name} нарушил протокол: {e}")
+            conn.close()
+            return
+        if client.name is None:
+            if not messages:
+                return
+            client.name = parse_client_name(messages[0])
+            # Таймаут только на ввод имени, дальше клиент может молчать сколько угодно
+            conn.timeout = 0
+            print(f"Клиент {client.name} подключился")
+            enter_room_core(client, DEFAULT_ROOM, f"{client.name} присоединился к чату")
+            messages = messages[1:]
+
+        for action, argument in split_commands(messages):
+            if client.room is None:
+                return
+            if action == 'say':
+                publish_core(client.room, format_messages(argument, client.name))
+            elif action == 'join' and argument != client.room.name:
+                leave_room_core(client, f"{client.name} перешёл в комнату {argument}")
+                enter_room_core(client, argument, f"{client.name} вошёл в комнату {argument}")
+            elif action == 'reply':
+                conn.sendall(encode_message(argument))
+            elif action == 'exit':
+                conn.close()
+                return
+
+    def connection_lost(self, conn):
+        client = conn.state
+        if client.room is None:
+            return
+        if conn.server.stopping:
+            # Сервер останавливается: прощания некому доставлять
+            leave_room_core(client, None)
+        else:
+            print(f"Клиент {client.name} отключен")
+            leave_room_core(client, f"{client.name} покинул чат")
+
+
+def create_socket(host, port, reuse_port=False):
     server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-    
+    if reuse_port:
+        # Свой слушающий сокет у каждого процесса, соединения распределяет ядро
+        server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    server_socket.bind((host, port))
+    server_socket.listen(BACKLOG)
+    return server_socket
+
+
+def serve_sharded(host, port, workers):
+    """Процессы-шарды со своими слушающими сокетами (SO_REUSEPORT), связанные попарно"""
+    if not hasattr(os, 'fork') or not hasattr(socket, 'SO_REUSEPORT'):
+        raise RuntimeError("Режим sharded доступен только на Unix")
+
+    pairs = {(i, j): socket.socketpair() for i in range(workers) for j in range(i + 1, workers)}
+    children = []
+    for index in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                peers = {}
+                for (i, j), (left, right) in pairs.items():
+                    if i == index:
+                        peers[j] = left
+                        right.close()
+                    elif j == index:
+                        peers[i] = right
+                        left.close()
+                    else:
+                        left.close()
+                        right.close()
+                asyncio.run(serve_async(create_socket(host, port, reuse_port=True), ShardRelay(index, peers)))
+            except KeyboardInterrupt:
+                pass
+            finally:
+                rooms.close()
+                os._exit(0)
+        children.append(pid)
+
+    for left, right in pairs.values():
+        left.close()
+        right.close()
     try:
-        server_socket.bind((HOST, PORT))
-        server_socket.listen(5)
-        print(f"Сервер запущен на {HOST}:{PORT}")
+        while children:
+            pid, _ = os.wait()
+            children.remove(pid)
+    except KeyboardInterrupt:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in children:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        raise
+
+
+def start_server(host=HOST, port=PORT, mode='threads', workers=None):
+    signal.signal(signal.SIGTERM, raise_keyboard_interrupt)
+    server_socket = None
+
+    try:
+        if mode == 'sharded':
+            workers = workers or os.cpu_count() or 1
+            print(f"Сервер запущен на {host}:{port} (режим: {mode}, процессов: {workers})")
+            serve_sharded(host, port, workers)
+            return
+
+        if mode == 'core':
+            server = netcore.Server(ChatHandler(), host, port, timeout=NAME_TIMEOUT, backlog=BACKLOG)
+            print(f"Сервер запущен на {host}:{port} (режим: {mode})")
+            server.serve_forever()
+            print("\nСервер остановлен")
+            return
+
+        server_socket = create_socket(host, port)
+        print(f"Сервер запущен на {host}:{port} (режим: {mode})")
         print("Ожидание подключений...")
-        
-        accept_connections(server_socket)
-        
+
+        if mode == 'async':
+            asyncio.run(serve_async(server_socket))
+        else:
+            accept_connections(server_socket)
+
     except KeyboardInterrupt:
         print("\nСервер остановлен")
     except Exception as e:
         print(f"Ошибка сервера: {e}")
     finally:
-        server_socket.close()
+        if server_socket is not None:
+            server_socket.close()
+        rooms.close()
 
 if __name__ == "__main__":
-    start_server()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Многопользовательский чат с комнатами')
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--mode', choices=MODES, default='threads',
+                        help='поток на клиента, asyncio с очередями на отправку, '
+                             'процессы asyncio с комнатами, распределёнными между ними, '
+                             'или общее ядро netcore')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='процессов в режиме sharded (по умолчанию число процессоров)')
+    parser.add_argument('--no-join-messages', action='store_true',
+                        help='не рассылать сообщения о входе и выходе (для нагрузочных тестов)')
+    parser.add_argument('--history-size', type=int, default=HISTORY_SIZE,
+                        help='сколько последних сообщений хранить в каждой комнате')
+    parser.add_argument('--history-dir', default=None,
+                        help='каталог для истории комнат на диске (по умолчанию только в памяти)')
+    parser.add_argument('--replay', type=int, default=HISTORY_REPLAY,
+                        help='сколько сообщений истории отправлять вошедшему в комнату')
+    args = parser.parse_args()
+    announce_joins = not args.no_join_messages
+    rooms = Rooms(args.history_size, args.history_dir)
+    history_replay = args.replay
+    start_server(args.host, args.port, args.mode, args.workers)
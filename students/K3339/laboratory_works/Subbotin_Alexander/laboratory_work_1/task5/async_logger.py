@@ -0,0 +1,76 @@
+"""
+Журнал сервера, который не задерживает обработку запросов.
+
+log() только добавляет строку в очередь в памяти. Отдельный поток раз в
+FLUSH_INTERVAL забирает всё накопившееся и пишет одной записью в поток
+вывода, поэтому вывод на медленный терминал не тормозит ответы. Если
+очередь переполнена (вывод не успевает), строка отбрасывается и
+учитывается в dropped.
+
+После fork поток записи в дочернем процессе не существует: журнал
+замечает смену pid и запускает свой поток в каждом процессе.
+"""
+import os
+import sys
+import threading
+from collections import deque
+
+LOG_QUEUE_SIZE = 100_000
+FLUSH_INTERVAL = 0.05
+
+
+class AsyncLogger:
+    def __init__(self, stream=None, queue_size=LOG_QUEUE_SIZE, flush_interval=FLUSH_INTERVAL):
+        self._stream = stream
+        self._queue_size = queue_size
+        self._flush_interval = flush_interval
+        # deque.append и popleft атомарны - блокировка на каждую строку не нужна
+        self._lines = deque()
+        self._pid = None
+        self._stopped = threading.Event()
+        self._thread = None
+        self.dropped = 0
+
+    def log(self, message):
+        if self._pid != os.getpid():
+            self._start()
+        if len(self._lines) >= self._queue_size:
+            self.dropped += 1
+            return
+        self._lines.append(message)
+
+    def close(self):
+        """Допечатать очередь и остановить поток"""
+        if self._thread is not None and self._pid == os.getpid():
+            self._stopped.set()
+            self._thread.join()
+        self._thread = None
+        self._pid = None
+
+    def _start(self):
+        self._pid = os.getpid()
+        self._lines = deque()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._writer, name='log-writer', daemon=True)
+        self._thread.start()
+
+    def _writer(self):
+        while True:
+            stopped = self._stopped.wait(self._flush_interval)
+            self._flush()
+            if stopped:
+                return
+
+    def _flush(self):
+        lines = self._lines
+        batch = []
+        while lines:
+            batch.append(lines.popleft())
+        if not batch:
+            return
+        stream = self._stream or sys.stdout
+        try:
+            stream.write('\n'.join(batch) + '\n')
+            stream.flush()
+        except (OSError, ValueError):
+            pass
@@ -0,0 +1,119 @@
+"""
+Пропускная способность сервера на больших ответах.
+
+Для каждого режима сервер запускается дважды - со scatter/gather
+отправкой (sendmsg, sendfile) и с --no-zero-copy (ответ склеивается в
+один буфер, файл читается в память) - и клиенты по keep-alive
+соединениям скачивают:
+- страницу журнала с --subjects дисциплинами;
+- статические файлы размером из --sizes (в МБ).
+
+    python body_bench.py --modes threads,async --subjects 10000 --sizes 1,32
+"""
+import argparse
+import multiprocessing
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+import server
+from loadgen import wait_for_port
+
+HOST = 'localhost'
+PORT = 8090
+
+
+def run_server(mode, port, static_dir, subjects, zero_copy):
+    sys.stdout = open(os.devnull, 'w')
+    for i in range(subjects):
+        server.GRADES[f"Дисциплина {i:06d}"] = ['5', '4', '3']
+    serv = server.MyHTTPServer(HOST, port, server.SERV_NAME, mode=mode, verbose=False,
+                               max_requests=10 ** 9, static_dir=static_dir, zero_copy=zero_copy)
+    serv.serve_forever()
+
+
+def read_response(sock, buf):
+    """Читает ответ целиком в buf; возвращает длину тела"""
+    head = b''
+    while b'\r\n\r\n' not in head:
+        chunk = sock.recv(4096)
+        if not chunk:
+            raise ConnectionError("Сервер закрыл соединение")
+        head += chunk
+    head, _, rest = head.partition(b'\r\n\r\n')
+    length = next(int(line.split(b':', 1)[1]) for line in head.split(b'\r\n')
+                  if line.lower().startswith(b'content-length:'))
+    received = len(rest)
+    view = memoryview(buf)
+    while received < length:
+        received += sock.recv_into(view[:min(len(buf), length - received)])
+    return length
+
+
+def client(port, path, deadline, totals):
+    buf = bytearray(1024 * 1024)
+    request = f'GET {path} HTTP/1.1\r\nHost: {HOST}\r\n\r\n'.encode()
+    received = requests = 0
+    with socket.create_connection((HOST, port)) as sock:
+        while time.perf_counter() < deadline:
+            sock.sendall(request)
+            received += read_response(sock, buf)
+            requests += 1
+    totals.append((received, requests))
+
+
+def measure(port, path, clients, duration):
+    totals = []
+    deadline = time.perf_counter() + duration
+    threads = [threading.Thread(target=client, args=(port, path, deadline, totals)) for _ in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    received = sum(r for r, _ in totals)
+    requests = sum(n for _, n in totals)
+    return received / elapsed / 1024 / 1024, requests / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modes', default='threads,async')
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--subjects', type=int, default=10_000)
+    parser.add_argument('--sizes', default='1,32', help='размеры статических файлов, МБ')
+    parser.add_argument('--clients', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=3.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as static_dir:
+        paths = ['/']
+        for size in args.sizes.split(','):
+            name = f'file_{size}mb.bin'
+            with open(os.path.join(static_dir, name), 'wb') as f:
+                f.write(os.urandom(int(float(size) * 1024 * 1024)))
+            paths.append(f'/static/{name}')
+
+        print(f"{args.clients} клиентов, {args.duration:.0f} с на замер, журнал: {args.subjects} дисциплин")
+        for mode in args.modes.split(','):
+            for zero_copy in (False, True):
+                proc = multiprocessing.Process(
+                    target=run_server, args=(mode, args.port, static_dir, args.subjects, zero_copy))
+                proc.start()
+                try:
+                    wait_for_port(HOST, args.port)
+                    label = f"{mode}, {'sendmsg/sendfile' if zero_copy else 'склейка'}"
+                    for path in paths:
+                        mb_per_sec, rps = measure(args.port, path, args.clients, args.duration)
+                        print(f"  {label:<26} {path:<24} {mb_per_sec:8.0f} МБ/с  {rps:8.0f} запросов/с")
+                finally:
+                    proc.terminate()
+                    proc.join()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,272 @@
+"""
+Хранилища журнала оценок для MyHTTPServer.
+
+MemoryGradesStore - словарь в памяти (как раньше GRADES), теряется при
+перезапуске. LogGradesStore - журнал на диске:
+
+- каждая оценка дописывается в конец сегмента лога log.<n> записью
+  [crc32][seq][длины][дисциплина][оценка];
+- добавление возвращается после fsync; одновременные добавления
+  объединяются в один fsync (group commit): первый ждущий поток
+  сбрасывает на диск всё, что успели дописать остальные;
+- после snapshot_every записей в фоне пишется снимок snapshot
+  (временный файл, fsync, os.replace), старые сегменты удаляются;
+- при старте снимок читается через mmap, затем проигрываются сегменты;
+  запись, оборванная на середине (сбой при записи), отбрасывается.
+
+Режимы commit: 'group' (по умолчанию), 'each' - свой fsync на каждую
+запись под блокировкой, 'none' - без fsync (данные в кэше ОС).
+"""
+import mmap
+import os
+import struct
+import threading
+import zlib
+
+COMMIT_MODES = ('group', 'each', 'none')
+SNAPSHOT_EVERY = 10_000
+
+# Запись лога: crc32(остаток записи), seq, длина дисциплины, длина оценки
+LOG_CRC = struct.Struct('<I')
+LOG_HEADER = struct.Struct('<QHH')
+LOG_RECORD = struct.Struct('<IQHH')
+# Снимок: сигнатура, seq последней вошедшей записи, число дисциплин;
+# дальше по каждой дисциплине длина и число оценок, байты, оценки с длинами
+SNAPSHOT_MAGIC = b'GRADES1\n'
+SNAPSHOT_HEADER = struct.Struct('<QI')
+SNAPSHOT_SUBJECT = struct.Struct('<HI')
+SNAPSHOT_GRADE = struct.Struct('<H')
+
+
+class MemoryGradesStore:
+    """Журнал в памяти процесса"""
+
+    def __init__(self, grades=None):
+        self._grades = grades if grades is not None else {}
+        self._lock = threading.Lock()
+
+    def add(self, subject, grade):
+        with self._lock:
+            self._grades.setdefault(subject, []).append(grade)
+
+    def get(self, subject):
+        """Копия оценок по дисциплине"""
+        with self._lock:
+            return list(self._grades.get(subject, ()))
+
+    def snapshot(self):
+        """Копия всего журнала"""
+        with self._lock:
+            return {subject: list(values) for subject, values in self._grades.items()}
+
+    def close(self):
+        pass
+
+
+class LogGradesStore(MemoryGradesStore):
+    """Журнал в памяти, продублированный логом и снимками в каталоге path"""
+
+    def __init__(self, path, commit='group', snapshot_every=SNAPSHOT_EVERY):
+        if commit not in COMMIT_MODES:
+            raise ValueError(f"Неизвестный режим commit: {commit}, доступны: {', '.join(COMMIT_MODES)}")
+        super().__init__()
+        self._path = path
+        self._commit = commit
+        self._snapshot_every = snapshot_every
+        self._cond = threading.Condition(self._lock)
+        self._seq = 0
+        self._written = 0
+        self._durable = 0
+        self._syncing = False
+        self._segment_records = 0
+        self._compacting = False
+        self.fsyncs = 0
+
+        os.makedirs(path, exist_ok=True)
+        self._seq = self._load()
+        self._written = self._durable = self._seq
+        # Продолжаем последний сегмент: оборванный хвост _load уже обрезал
+        segments = self._segments()
+        self._segment = segments[-1] if segments else 1
+        self._file = open(self._segment_path(self._segment), 'ab')
+
+    # ----- файлы -----
+
+    def _segment_path(self, number):
+        return os.path.join(self._path, f'log.{number}')
+
+    def _segments(self):
+        numbers = []
+        for name in os.listdir(self._path):
+            prefix, _, number = name.partition('.')
+            if prefix == 'log' and number.isdigit():
+                numbers.append(int(number))
+        return sorted(numbers)
+
+    def _load(self):
+        """Снимок + сегменты лога; возвращает seq последней записи"""
+        seq = self._load_snapshot()
+        for number in self._segments():
+            seq = self._replay_segment(self._segment_path(number), seq)
+        return seq
+
+    def _load_snapshot(self):
+        path = os.path.join(self._path, 'snapshot')
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return 0
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+                raise ValueError(f"{path}: не снимок журнала")
+            pos = len(SNAPSHOT_MAGIC)
+            seq, count = SNAPSHOT_HEADER.unpack_from(mm, pos)
+            pos += SNAPSHOT_HEADER.size
+            for _ in range(count):
+                size, grades_count = SNAPSHOT_SUBJECT.unpack_from(mm, pos)
+                pos += SNAPSHOT_SUBJECT.size
+                subject = mm[pos:pos + size].decode('utf-8')
+                pos += size
+                values = []
+                for _ in range(grades_count):
+                    (size,) = SNAPSHOT_GRADE.unpack_from(mm, pos)
+                    pos += SNAPSHOT_GRADE.size
+                    values.append(mm[pos:pos + size].decode('utf-8'))
+                    pos += size
+                self._grades[subject] = values
+        return seq
+
+    def _replay_segment(self, path, seq):
+        size = os.path.getsize(path)
+        if size == 0:
+            return seq
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = 0
+            while pos + LOG_RECORD.size <= size:
+                crc, record_seq, subject_size, grade_size = LOG_RECORD.unpack_from(mm, pos)
+                end = pos + LOG_RECORD.size + subject_size + grade_size
+                if end > size or zlib.crc32(mm[pos + LOG_CRC.size:end]) != crc:
+                    break
+                if record_seq > seq:
+                    data_start = pos + LOG_RECORD.size
+                    subject = mm[data_start:data_start + subject_size].decode('utf-8')
+                    grade = mm[data_start + subject_size:end].decode('utf-8')
+                    self._grades.setdefault(subject, []).append(grade)
+                    seq = record_seq
+                pos = end
+        if pos < size:
+            # Хвост оборванной записи: обрезаем, чтобы новые записи шли за целыми
+            with open(path, 'r+b') as f:
+                f.truncate(pos)
+        return seq
+
+    # ----- запись -----
+
+    def add(self, subject, grade):
+        subject_bytes = subject.encode('utf-8')
+        grade_bytes = grade.encode('utf-8')
+        if len(subject_bytes) > 0xFFFF or len(grade_bytes) > 0xFFFF:
+            raise ValueError("Дисциплина и оценка должны быть короче 64 КБ")
+        with self._lock:
+            self._seq += 1
+            body = LOG_HEADER.pack(self._seq, len(subject_bytes), len(grade_bytes)) + subject_bytes + grade_bytes
+            self._file.write(LOG_CRC.pack(zlib.crc32(body)) + body)
+            self._grades.setdefault(subject, []).append(grade)
+            self._written = seq = self._seq
+            self._segment_records += 1
+            if self._commit == 'each':
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self.fsyncs += 1
+                self._durable = seq
+            elif self._commit == 'none':
+                self._file.flush()
+            compact = self._segment_records >= self._snapshot_every and not self._compacting
+            if compact:
+                self._compacting = True
+        if self._commit == 'group':
+            self._wait_durable(seq)
+        if compact:
+            threading.Thread(target=self.compact, name='grades-snapshot', daemon=True).start()
+
+    def _wait_durable(self, seq):
+        """Ждёт, пока запись seq не окажется на диске; fsync делает один поток за всех"""
+        with self._cond:
+            while self._durable < seq:
+                if self._syncing:
+                    self._cond.wait()
+                    continue
+                self._syncing = True
+                self._file.flush()
+                target = self._written
+                fd = self._file.fileno()
+                self._cond.release()
+                try:
+                    os.fsync(fd)
+                finally:
+                    self._cond.acquire()
+                    self._syncing = False
+                    self._cond.notify_all()
+                self.fsyncs += 1
+                self._durable = max(self._durable, target)
+
+    def compact(self):
+        """
+        Пишет снимок журнала и удаляет сегменты лога, которые в него вошли.
+        Запускается сам после snapshot_every записей.
+        """
+        with self._cond:
+            while self._syncing:
+                self._cond.wait()
+            self._compacting = True
+            # Закрываем текущий сегмент: всё до seq попадёт в снимок
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._durable = self._written
+            done_segment = self._segment
+            self._segment += 1
+            self._file = open(self._segment_path(self._segment), 'ab')
+            self._segment_records = 0
+            seq = self._seq
+            grades = {subject: list(values) for subject, values in self._grades.items()}
+
+        try:
+            self._write_snapshot(grades, seq)
+            for number in self._segments():
+                if number <= done_segment:
+                    os.remove(self._segment_path(number))
+        finally:
+            with self._cond:
+                self._compacting = False
+                self._cond.notify_all()
+
+    def _write_snapshot(self, grades, seq):
+        path = os.path.join(self._path, 'snapshot')
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(SNAPSHOT_MAGIC + SNAPSHOT_HEADER.pack(seq, len(grades)))
+            for subject, values in grades.items():
+                subject_bytes = subject.encode('utf-8')
+                parts = [SNAPSHOT_SUBJECT.pack(len(subject_bytes), len(values)), subject_bytes]
+                for grade in values:
+                    grade_bytes = grade.encode('utf-8')
+                    parts += (SNAPSHOT_GRADE.pack(len(grade_bytes)), grade_bytes)
+                f.write(b''.join(parts))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        if hasattr(os, 'O_DIRECTORY'):
+            # Переименование тоже должно пережить сбой
+            dir_fd = os.open(self._path, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+    def close(self):
+        with self._cond:
+            while self._syncing or self._compacting:
+                self._cond.wait()
+            self._file.flush()
+            if self._commit != 'none':
+                os.fsync(self._file.fileno())
+            self._file.close()
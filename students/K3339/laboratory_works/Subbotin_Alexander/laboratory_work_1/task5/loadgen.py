@@ -0,0 +1,247 @@
+"""
+Нагрузочный генератор в стиле wrk для сервера журнала оценок.
+
+Держит N соединений, каждое в цикле отправляет GET / и ждёт ответ,
+считает запросы в секунду и перцентили задержки. Медленные клиенты
+(--slow) подключаются и молчат - так видно, как sync-режим встаёт.
+С --keep-alive соединение переиспользуется, пока сервер его не закроет,
+--pipeline N отправляет N запросов подряд, не дожидаясь ответов.
+Режимы sync и prefork обслуживают соединения по одному и keep-alive не
+поддерживают: в --compare они помечены *, их соединения закрывает сервер.
+Один процесс Python упирается примерно в несколько тысяч запросов
+в секунду, для быстрых режимов нагрузку дают несколько процессов (--processes).
+
+    python loadgen.py --connections 50 --duration 10
+    python loadgen.py --compare sync,threads,prefork,async --slow 2 --processes 4
+    python loadgen.py --compare threads,async --keep-alive --pipeline 8
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+from server import SERIAL_MODES
+
+HOST = 'localhost'
+PORT = 8080
+SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server.py')
+
+
+def percentile(samples, q):
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+async def read_response(reader):
+    """
+    Читает один ответ: заголовки и тело по Content-Length (или до закрытия).
+    Возвращает (статус, оставил ли сервер соединение открытым).
+    """
+    head = await reader.readuntil(b'\r\n\r\n')
+    status = int(head.split(b' ', 2)[1])
+    length = None
+    reusable = True
+    for line in head.split(b'\r\n')[1:]:
+        name, _, value = line.partition(b':')
+        name = name.strip().lower()
+        if name == b'content-length':
+            length = int(value)
+        elif name == b'connection':
+            reusable = value.strip().lower() != b'close'
+    if length is None:
+        await reader.read()
+        reusable = False
+    else:
+        await reader.readexactly(length)
+    return status, reusable
+
+
+async def worker(host, port, request, deadline, stats, keep_alive, pipeline=1):
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        answered = 0
+        reusable = False
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+                stats['connects'] += 1
+            writer.write(request * pipeline)
+            await writer.drain()
+            for _ in range(pipeline):
+                status, reusable = await read_response(reader)
+                stats['latencies'].append((time.perf_counter() - started) * 1000)
+                stats['ok' if status < 400 else 'errors'] += 1
+                answered += 1
+                if not reusable:
+                    break
+        except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+            # Без ответа остались запросы, отправленные после последнего принятого
+            stats['errors'] += pipeline - answered
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+            await asyncio.sleep(0.01)
+            continue
+        # Сервер закрыл соединение (Connection: close) раньше, чем ответил на весь
+        # конвейер - неотвеченные запросы клиент просто отправит заново
+        if not (keep_alive and reusable):
+            writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def slow_client(host, port, deadline):
+    """Подключается и ничего не отправляет до конца теста"""
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+        await asyncio.sleep(max(0.0, deadline - time.perf_counter()))
+        writer.close()
+    except OSError:
+        pass
+
+
+async def run_load(host, port, connections, duration, slow=0, keep_alive=False, pipeline=1, path='/', data=None):
+    connection = 'keep-alive' if keep_alive else 'close'
+    if data is None:
+        request = f'GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: {connection}\r\n\r\n'.encode()
+    else:
+        body = data.encode()
+        request = (f'POST {path} HTTP/1.1\r\nHost: {host}\r\nConnection: {connection}\r\n'
+                   f'Content-Type: application/x-www-form-urlencoded\r\n'
+                   f'Content-Length: {len(body)}\r\n\r\n').encode() + body
+    stats = {'ok': 0, 'errors': 0, 'connects': 0, 'latencies': []}
+    deadline = time.perf_counter() + duration
+    slow_tasks = [asyncio.create_task(slow_client(host, port, deadline)) for _ in range(slow)]
+    await asyncio.sleep(0.2 if slow else 0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(host, port, request, deadline, stats, keep_alive, pipeline) for _ in range(connections)))
+    elapsed = time.perf_counter() - started
+    for task in slow_tasks:
+        task.cancel()
+    await asyncio.gather(*slow_tasks, return_exceptions=True)
+
+    latencies = stats['latencies']
+    return {
+        'requests': stats['ok'],
+        'errors': stats['errors'],
+        'connects': stats['connects'],
+        'rps': stats['ok'] / elapsed if elapsed else 0.0,
+        'p50': percentile(latencies, 0.50),
+        'p99': percentile(latencies, 0.99),
+        'max': max(latencies) if latencies else 0.0,
+    }
+
+
+def _load_process(args):
+    host, port, load = args
+    return asyncio.run(run_load(host, port, **load))
+
+
+def run_load_processes(host, port, processes, **load):
+    """Запускает нагрузку в нескольких процессах и суммирует результаты"""
+    if processes <= 1:
+        return asyncio.run(run_load(host, port, **load))
+
+    # Медленные клиенты открывает только первый процесс
+    per_process = dict(load, connections=max(1, load['connections'] // processes))
+    per_process_args = [(host, port, dict(per_process, slow=load['slow'] if i == 0 else 0))
+                        for i in range(processes)]
+    with multiprocessing.Pool(processes) as pool:
+        results = pool.map(_load_process, per_process_args)
+    return {
+        'requests': sum(r['requests'] for r in results),
+        'errors': sum(r['errors'] for r in results),
+        'connects': sum(r['connects'] for r in results),
+        'rps': sum(r['rps'] for r in results),
+        'p50': max(r['p50'] for r in results),
+        'p99': max(r['p99'] for r in results),
+        'max': max(r['max'] for r in results),
+    }
+
+
+def print_result(label, result):
+    print(f"{label:<10} {result['rps']:>10.0f} req/s | ok {result['requests']:>7} | err {result['errors']:>5} | "
+          f"conn {result['connects']:>6} | "
+          f"p50 {result['p50']:>7.2f} ms | p99 {result['p99']:>8.2f} ms | max {result['max']:>8.2f} ms")
+
+
+def wait_for_port(host, port, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Сервер не запустился на {host}:{port}")
+
+
+def start_server(mode, host, port, extra_args=()):
+    popen_kwargs = {'start_new_session': True} if os.name == 'posix' else {}
+    proc = subprocess.Popen(
+        [sys.executable, SERVER, '--mode', mode, '--host', host, '--port', str(port), '--quiet', *extra_args],
+        stdout=subprocess.DEVNULL,
+        **popen_kwargs,
+    )
+    wait_for_port(host, port)
+    return proc
+
+
+def stop_server(proc):
+    if os.name == 'posix':
+        os.killpg(proc.pid, signal.SIGTERM)
+    else:
+        proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--connections', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--slow', type=int, default=0, help='медленных клиентов')
+    parser.add_argument('--keep-alive', action='store_true', help='переиспользовать соединения')
+    parser.add_argument('--pipeline', type=int, default=1, help='запросов подряд без ожидания ответа')
+    parser.add_argument('--path', default='/')
+    parser.add_argument('--data', help='тело формы: с ним отправляется POST, например subject=Math&grade=5')
+    parser.add_argument('--processes', type=int, default=1, help='процессов генератора нагрузки')
+    parser.add_argument('--compare', help='режимы через запятую: сервер запускается для каждого')
+    args = parser.parse_args()
+
+    load = dict(connections=args.connections, duration=args.duration, slow=args.slow,
+                keep_alive=args.keep_alive, pipeline=max(1, args.pipeline), path=args.path,
+                data=args.data)
+    if not args.compare:
+        print_result('server', run_load_processes(args.host, args.port, args.processes, **load))
+        return
+
+    print(f"{args.connections} соединений, {args.duration:.0f} с, медленных клиентов: {args.slow}")
+    modes = args.compare.split(',')
+    for mode in modes:
+        proc = start_server(mode, args.host, args.port)
+        label = f"{mode}*" if args.keep_alive and mode in SERIAL_MODES else mode
+        try:
+            print_result(label, run_load_processes(args.host, args.port, args.processes, **load))
+        finally:
+            stop_server(proc)
+    if args.keep_alive and any(mode in SERIAL_MODES for mode in modes):
+        print("* keep-alive выключен сервером: соединение на каждый запрос")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+"""
+Метрики сервера журнала оценок и их выдача в текстовом формате Prometheus.
+
+- http_requests_total{method, route, code} - запросы по маршрутам;
+- http_connections_active / http_connections_total - открытые и все
+  принятые соединения;
+- http_phase_seconds{phase} - гистограммы времени фаз parse (разбор
+  куска данных), handle (обработка запроса) и send (отправка ответов);
+- http_phase_quantile_seconds{phase, quantile} - перцентили тех же фаз;
+- log_lines_dropped_total - строки, которые не успел напечатать журнал.
+
+Гистограммы устроены как HdrHistogram: значение в микросекундах попадает
+в корзину, ширина которой растёт вдвое с каждой степенью двойки, а внутри
+каждой степени 64 равные корзины. Относительная погрешность перцентиля
+не больше 1/64 на любом масштабе - от микросекунд до часов, - а запись
+стоит несколько целочисленных операций. Для Prometheus корзины сводятся
+к фиксированным границам PROMETHEUS_BOUNDS.
+"""
+import threading
+
+SUB_BUCKET_BITS = 7
+# Значения больше 2 ** MAX_VALUE_BITS мкс (около 12 суток) попадают в последнюю корзину
+MAX_VALUE_BITS = 40
+MAX_VALUE = 1 << MAX_VALUE_BITS
+PROMETHEUS_BOUNDS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                     0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+PHASES = ('parse', 'handle', 'send')
+
+
+class Histogram:
+    """Счётчики по корзинам; не потокобезопасна - запись под блокировкой Metrics"""
+
+    SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+    HALF = SUB_BUCKETS // 2
+
+    def __init__(self):
+        self.counts = [0] * self.index(MAX_VALUE)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0
+
+    @classmethod
+    def index(cls, value):
+        """Номер корзины для значения в микросекундах"""
+        if value < cls.SUB_BUCKETS:
+            return value
+        # Степень двойки сверх SUB_BUCKET_BITS бит и старшие биты значения
+        shift = value.bit_length() - SUB_BUCKET_BITS
+        return (shift << (SUB_BUCKET_BITS - 1)) + (value >> shift)
+
+    @classmethod
+    def upper_bound(cls, index):
+        """Наибольшее значение (мкс), попадающее в корзину index"""
+        if index < cls.SUB_BUCKETS:
+            return index
+        shift, top = divmod(index - cls.SUB_BUCKETS, cls.HALF)
+        shift += 1
+        return ((top + cls.HALF + 1) << shift) - 1
+
+    def record(self, seconds):
+        value = int(seconds * 1_000_000)
+        if value < self.SUB_BUCKETS:
+            index = value
+        elif value < MAX_VALUE:
+            shift = value.bit_length() - SUB_BUCKET_BITS
+            index = (shift << (SUB_BUCKET_BITS - 1)) + (value >> shift)
+        else:
+            index = len(self.counts) - 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if value > self.max:
+            self.max = value
+
+    def percentiles(self, quantiles):
+        """Значения (с) для возрастающих quantiles: верхняя граница корзины с нужным рангом"""
+        result = []
+        if not self.count:
+            return [0.0] * len(quantiles)
+        ranks = [max(1, round(q * self.count)) for q in quantiles]
+        seen = 0
+        position = 0
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            seen += count
+            while position < len(ranks) and seen >= ranks[position]:
+                result.append(min(self.upper_bound(index), self.max) / 1_000_000)
+                position += 1
+            if position == len(ranks):
+                break
+        return result
+
+    def cumulative(self, bounds):
+        """Число значений не больше каждой из границ bounds (с)"""
+        limits = [int(bound * 1_000_000) for bound in bounds]
+        result = []
+        seen = 0
+        position = 0
+        for index, count in enumerate(self.counts):
+            upper = self.upper_bound(index)
+            while position < len(limits) and upper > limits[position]:
+                result.append(seen)
+                position += 1
+            if position == len(limits):
+                break
+            seen += count
+        result += [self.count] * (len(limits) - len(result))
+        return result
+
+
+def route_of(path, static_paths):
+    """Маршрут для метки: пути 404 не должны плодить метки"""
+    if path in ('/', '/metrics'):
+        return path
+    if path in static_paths:
+        return '/static'
+    return 'other'
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}
+        self.phases = {phase: Histogram() for phase in PHASES}
+        self.active = 0
+        self.connections = 0
+
+    def connection_opened(self):
+        with self._lock:
+            self.active += 1
+            self.connections += 1
+
+    def connection_closed(self):
+        with self._lock:
+            self.active -= 1
+
+    def observe(self, phase, seconds):
+        with self._lock:
+            self.phases[phase].record(seconds)
+
+    def request_done(self, method, route, status, seconds):
+        """Запрос обработан: счётчик маршрута и время фазы handle"""
+        key = (method, route, status[:3])
+        with self._lock:
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.phases['handle'].record(seconds)
+
+    def render(self, log_dropped=0):
+        """Текстовый формат Prometheus 0.0.4"""
+        with self._lock:
+            requests = sorted(self.requests.items())
+            active, connections = self.active, self.connections
+            phases = {phase: (histogram.cumulative(PROMETHEUS_BOUNDS), histogram.count, histogram.total,
+                              histogram.percentiles(QUANTILES))
+                      for phase, histogram in self.phases.items()}
+
+        lines = ['# HELP http_requests_total Обработанные запросы по маршрутам',
+                 '# TYPE http_requests_total counter']
+        for (method, route, code), count in requests:
+            lines.append(f'http_requests_total{{method="{method}",route="{route}",code="{code}"}} {count}')
+        lines += ['# HELP http_connections_active Открытые соединения',
+                  '# TYPE http_connections_active gauge',
+                  f'http_connections_active {active}',
+                  '# HELP http_connections_total Принятые соединения',
+                  '# TYPE http_connections_total counter',
+                  f'http_connections_total {connections}',
+                  '# HELP http_phase_seconds Время фаз parse, handle и send',
+                  '# TYPE http_phase_seconds histogram']
+        for phase, (cumulative, count, total, _) in phases.items():
+            for bound, seen in zip(PROMETHEUS_BOUNDS, cumulative):
+                lines.append(f'http_phase_seconds_bucket{{phase="{phase}",le="{bound:g}"}} {seen}')
+            lines += [f'http_phase_seconds_bucket{{phase="{phase}",le="+Inf"}} {count}',
+                      f'http_phase_seconds_sum{{phase="{phase}"}} {total:.6f}',
+                      f'http_phase_seconds_count{{phase="{phase}"}} {count}']
+        lines += ['# HELP http_phase_quantile_seconds Перцентили фаз по HDR-гистограмме',
+                  '# TYPE http_phase_quantile_seconds gauge']
+        for phase, (_, _, _, values) in phases.items():
+            for quantile, value in zip(QUANTILES, values):
+                lines.append(f'http_phase_quantile_seconds{{phase="{phase}",quantile="{quantile:g}"}} {value:.6f}')
+        lines += ['# HELP log_lines_dropped_total Строки журнала, отброшенные при переполнении очереди',
+                  '# TYPE log_lines_dropped_total counter',
+                  f'log_lines_dropped_total {log_dropped}']
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,56 @@
+"""
+Замер времени отдачи страницы журнала при большом числе дисциплин.
+
+Сравнивает:
+- полную сборку (так страница строилась на каждый GET до кэша);
+- GET из кэша и GET с If-None-Match (304);
+- GET после POST в существующую и в новую дисциплину.
+
+    python page_bench.py --subjects 10000
+"""
+import argparse
+import time
+
+import server
+
+
+def measure(label, func, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    ms = (time.perf_counter() - started) / repeat * 1000
+    print(f"  {label:<42} {ms:9.3f} мс")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--subjects', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    for i in range(args.subjects):
+        server.GRADES[f"Дисциплина {i:06d}"] = ['5', '4', '3']
+    serv = server.MyHTTPServer(server.HOST, server.PORT, server.SERV_NAME, verbose=False)
+
+    def get():
+        return serv.encode_response(serv.handle_get_grades())
+
+    def full_render():
+        serv.rebuild_grades_cache()
+        return get()
+
+    etag = serv.handle_get_grades()['headers']['ETag']
+    counter = iter(range(10 ** 9))
+
+    print(f"Дисциплин: {args.subjects}, страница {len(get()) / 1024:.0f} КБ")
+    measure("полная сборка страницы", full_render, args.repeat)
+    measure("GET из кэша", get, args.repeat)
+    measure("GET с If-None-Match (304)", lambda: serv.encode_response(serv.handle_get_grades(etag)), args.repeat)
+    measure("POST в существующую дисциплину + GET",
+            lambda: (serv.handle_post_grade('subject=Дисциплина 000042&grade=5'), get()), args.repeat)
+    measure("POST в новую дисциплину + GET",
+            lambda: (serv.handle_post_grade(f'subject=Новая {next(counter)}&grade=5'), get()), args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+"""
+Проверка и замер скорости RequestParser из server.py.
+
+Фаззинг: поток из случайных GET/POST запросов (тела по Content-Length и
+chunked) подаётся парсеру кусками случайной длины - от одного байта до
+целого потока - и результат сравнивается с ожидаемым. Затем парсеру
+скармливаются испорченные запросы: допустим только HTTPError.
+
+Бенчмарк: тот же поток подаётся кусками фиксированного размера,
+скорость считается в МБ/с входных данных.
+
+    python parser_bench.py --requests 5000 --rounds 200
+"""
+import argparse
+import random
+import time
+
+from server import HTTPError, RequestParser
+
+CHUNK_SIZES = (1, 16, 536, 1460, 16 * 1024, 64 * 1024)
+
+
+def make_request(rng):
+    """Случайный запрос: (байты, ожидаемый результат разбора)"""
+    path = '/' + ''.join(rng.choice('abcxyz/') for _ in range(rng.randint(0, 20)))
+    headers = {'host': 'localhost', 'user-agent': 'parser-bench'}
+    for i in range(rng.randint(0, 10)):
+        headers[f'x-extra-{i}'] = 'v' * rng.randint(0, 80)
+
+    kind = rng.choice(('get', 'length', 'chunked'))
+    body = ''
+    if kind != 'get':
+        body = f"subject={'s' * rng.randint(1, 2000)}&grade={rng.randint(2, 5)}"
+        if kind == 'length':
+            headers['content-length'] = str(len(body))
+        else:
+            headers['transfer-encoding'] = 'chunked'
+
+    head = f"{'GET' if kind == 'get' else 'POST'} {path} HTTP/1.1\r\n"
+    head += ''.join(f"{name}: {value}\r\n" for name, value in headers.items()) + "\r\n"
+    data = head.encode()
+    if kind == 'chunked':
+        raw = body.encode()
+        pos = 0
+        while pos < len(raw):
+            size = rng.randint(1, 700)
+            data += b'%x\r\n' % len(raw[pos:pos + size]) + raw[pos:pos + size] + b'\r\n'
+            pos += size
+        data += b'0\r\n\r\n'
+    else:
+        data += body.encode()
+
+    expected = {
+        'method': 'GET' if kind == 'get' else 'POST',
+        'path': path,
+        'protocol': 'HTTP/1.1',
+        'headers': headers,
+        'body': body,
+    }
+    return data, expected
+
+
+def make_stream(rng, count):
+    stream = bytearray()
+    expected = []
+    for _ in range(count):
+        data, req = make_request(rng)
+        stream += data
+        expected.append(req)
+    return bytes(stream), expected
+
+
+def feed_in_pieces(stream, sizes):
+    parser = RequestParser()
+    parsed = []
+    view = memoryview(stream)
+    pos = 0
+    for size in sizes:
+        parsed += parser.feed(view[pos:pos + size])
+        pos += size
+        if pos >= len(stream):
+            break
+    assert not parser.has_partial_request()
+    return parsed
+
+
+def fuzz_segmentation(rng, rounds, count):
+    for _ in range(rounds):
+        stream, expected = make_stream(rng, count)
+        max_piece = rng.choice((1, 7, 100, 2000, len(stream)))
+        sizes = iter(lambda: rng.randint(1, max_piece), None)
+        parsed = feed_in_pieces(stream, sizes)
+        assert parsed == expected, "разбор зависит от разбиения потока"
+
+
+def corrupt(rng, data):
+    data = bytearray(data)
+    action = rng.choice(('flip', 'cut', 'insert', 'duplicate'))
+    pos = rng.randrange(len(data))
+    if action == 'flip':
+        data[pos] = rng.randrange(256)
+    elif action == 'cut':
+        del data[pos:pos + rng.randint(1, 10)]
+    elif action == 'insert':
+        data[pos:pos] = bytes(rng.randrange(256) for _ in range(rng.randint(1, 10)))
+    else:
+        data[pos:pos] = data[max(0, pos - 20):pos]
+    return bytes(data)
+
+
+def fuzz_garbage(rng, rounds):
+    rejected = 0
+    for _ in range(rounds):
+        data = corrupt(rng, make_request(rng)[0])
+        parser = RequestParser()
+        try:
+            pos = 0
+            while pos < len(data):
+                size = rng.randint(1, 50)
+                parser.feed(data[pos:pos + size])
+                pos += size
+            parser.raise_pending_error()
+        except HTTPError:
+            rejected += 1
+    return rejected
+
+
+def benchmark(stream, count):
+    print(f"Поток: {count} запросов, {len(stream) / 1024 / 1024:.1f} МБ")
+    for size in CHUNK_SIZES:
+        started = time.perf_counter()
+        parsed = feed_in_pieces(stream, iter(lambda: size, None))
+        elapsed = time.perf_counter() - started
+        assert len(parsed) == count
+        print(f"  куски по {size:>6} Б: {len(stream) / 1024 / 1024 / elapsed:8.1f} МБ/с, "
+              f"{count / elapsed:9.0f} запросов/с")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=5000, help='запросов в потоке бенчмарка')
+    parser.add_argument('--rounds', type=int, default=200, help='раундов фаззинга')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    seed = args.seed if args.seed is not None else random.randrange(1 << 30)
+    rng = random.Random(seed)
+    print(f"seed {seed}")
+
+    fuzz_segmentation(rng, args.rounds, count=20)
+    print(f"Фаззинг разбиения: {args.rounds} потоков разобраны одинаково при любом разбиении")
+    rejected = fuzz_garbage(rng, args.rounds)
+    print(f"Фаззинг мусора: {rejected} из {args.rounds} испорченных запросов отклонены HTTPError, "
+          f"других исключений нет")
+
+    stream, _ = make_stream(rng, args.requests)
+    benchmark(stream, args.requests)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,122 +1,784 @@
-import socket 
+import argparse
+import asyncio
+import bisect
+import html
+import mimetypes
+import os
+import re
+import signal
+import socket
+import sys
+import threading
+import time
+import zlib
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
 from urllib.parse import parse_qs
 
+from async_logger import AsyncLogger
+from grades_store import COMMIT_MODES, SNAPSHOT_EVERY, LogGradesStore, MemoryGradesStore
+from metrics import Metrics, route_of
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import netcore
+
 GRADES = {}
+# Защищает кэш страницы журнала; сами оценки защищает хранилище
+GRADES_LOCK = threading.Lock()
 HOST = 'localhost'
 PORT = 8080
 SERV_NAME = 'GradesServer'
+BACKLOG = 128
+THREAD_WORKERS = 32
+CLIENT_TIMEOUT = 10
+KEEP_ALIVE_TIMEOUT = 5
+MAX_KEEP_ALIVE_REQUESTS = 100
+MAX_HEADER_SIZE = 64 * 1024
+MAX_BODY_SIZE = 1024 * 1024
+RECV_SIZE = 64 * 1024
+# Потоки netcore для POST в режиме core с журналом на диске: fsync не
+# останавливает цикл событий, а одновременные POST попадают в один group commit
+CORE_POST_THREADS = 8
+MODES = ('sync', 'threads', 'prefork', 'async', 'core')
+# Режимы, где соединения обслуживаются по одному (prefork - в единственном
+# процессе-воркере): keep-alive в них выключен, иначе одно молчащее
+# соединение останавливало бы всех остальных клиентов
+SERIAL_MODES = ('sync', 'prefork')
+GRADES_PLACEHOLDER = '<!--grades-->'
+GRADES_LIST_OPEN = '<h2>Журнал оценок:</h2><ul class="grades-list">'.encode('utf-8')
+GRADES_LIST_CLOSE = b'</ul>'
+GRADES_BLOCK_SIZE = 256
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+# Content-Length и размер чанка: только ASCII-цифры (str.isdigit и int()
+# принимают '²', '_', пробелы и знак)
+CONTENT_LENGTH_RE = re.compile(r'[0-9]+')
+CHUNK_SIZE_RE = re.compile(rb'[0-9A-Fa-f]+')
+# Не больше стольких буферов в одном sendmsg (IOV_MAX в Linux - 1024)
+SENDMSG_MAX_BUFFERS = 1024
+
+# Тело ответа из файла: отправляется sendfile без чтения в память процесса
+FileBody = namedtuple('FileBody', 'path size')
+EMPTY_GRADES_HTML = '<div class="empty-state">Оценок пока нет. Добавьте первую!</div>'.encode('utf-8')
+
+
+def raise_keyboard_interrupt(signum, frame):
+    """SIGTERM завершает сервер так же, как Ctrl+C"""
+    raise KeyboardInterrupt
+
+
+def sendmsg_all(sock, buffers):
+    """
+    Отправка списка буферов через sendmsg (scatter/gather) без склейки в один.
+    Ядро может принять только часть данных - остаток досылается.
+    """
+    views = [memoryview(buf).cast('B') for buf in buffers if len(buf)]
+    i = 0
+    while i < len(views):
+        sent = sock.sendmsg(views[i:i + SENDMSG_MAX_BUFFERS])
+        while sent:
+            size = views[i].nbytes
+            if sent >= size:
+                sent -= size
+                i += 1
+            else:
+                views[i] = views[i][sent:]
+                sent = 0
+
+
+class HTTPError(Exception):
+    """Ошибка в запросе клиента: отправляется ответом со статусом status"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class RequestParser:
+    """
+    Инкрементальный разбор HTTP/1.x запросов.
+
+    feed() принимает очередной кусок данных (bytes, bytearray или memoryview)
+    и возвращает список запросов, которые в нём закончились; начало
+    следующего запроса остаётся в буфере до следующего вызова. Буфер - один
+    bytearray: разделители ищутся со смещением, тело вырезается срезом
+    memoryview, заголовки декодируются один раз. Поддерживаются тела по
+    Content-Length и Transfer-Encoding: chunked.
+
+    Превышение лимитов и некорректный синтаксис поднимают HTTPError. Если
+    ошибка встретилась после запросов, уже разобранных в этом куске, feed()
+    возвращает их, а ошибку откладывает: raise_pending_error() поднимает её,
+    когда ответы на них отправлены (следующий feed() тоже).
+    """
+
+    def __init__(self, max_header_size=MAX_HEADER_SIZE, max_body_size=MAX_BODY_SIZE):
+        self._max_header_size = max_header_size
+        self._max_body_size = max_body_size
+        self._buf = bytearray()
+        self._pos = 0
+        # Докуда буфер уже просмотрен в поисках конца строки/заголовков
+        self._scanned = 0
+        self._state = 'head'
+        self._request = None
+        self._remaining = 0
+        self._chunks = None
+        self._error = None
+
+    def feed(self, data):
+        self.raise_pending_error()
+        self._buf += data
+        requests = []
+        try:
+            while True:
+                req = self._next_request()
+                if req is None:
+                    break
+                requests.append(req)
+        except HTTPError as e:
+            if not requests:
+                raise
+            self._error = e
+        finally:
+            # Разобранное начало буфера больше не нужно
+            if self._pos:
+                del self._buf[:self._pos]
+                self._scanned = max(0, self._scanned - self._pos)
+                self._pos = 0
+        return requests
+
+    def raise_pending_error(self):
+        """Поднимает ошибку, отложенную feed() до ответа на предыдущие запросы"""
+        if self._error is not None:
+            raise self._error
+
+    def has_partial_request(self):
+        """Есть ли в буфере начало ещё не законченного запроса"""
+        return self._state != 'head' or len(self._buf) > self._pos
+
+    def _find(self, sep):
+        """Поиск разделителя без повторного просмотра уже проверенных байтов"""
+        start = max(self._pos, self._scanned - len(sep) + 1)
+        end = self._buf.find(sep, start)
+        self._scanned = len(self._buf) if end == -1 else 0
+        return end
+
+    def _slice(self, start, end):
+        with memoryview(self._buf) as view:
+            return bytes(view[start:end])
+
+    def _next_request(self):
+        """Продвигает автомат разбора; возвращает запрос или None, если данных мало"""
+        buf = self._buf
+        while True:
+            if self._state == 'head':
+                # Пустые строки перед строкой запроса допускаются (RFC 9112, 2.2)
+                while buf.startswith(b'\r\n', self._pos):
+                    self._pos += 2
+                end = self._find(b'\r\n\r\n')
+                if end == -1:
+                    if len(buf) - self._pos > self._max_header_size:
+                        raise HTTPError('431 Request Header Fields Too Large', "Слишком большие заголовки")
+                    return None
+                if end - self._pos > self._max_header_size:
+                    raise HTTPError('431 Request Header Fields Too Large', "Слишком большие заголовки")
+                self._start_request(self._slice(self._pos, end))
+                self._pos = end + 4
+                if self._state == 'head':
+                    return self._finish(b'')
+
+            elif self._state == 'body':
+                end = self._pos + self._remaining
+                if len(buf) < end:
+                    return None
+                body = self._slice(self._pos, end)
+                self._pos = end
+                return self._finish(body)
+
+            elif self._state == 'chunk_size':
+                end = self._find(b'\r\n')
+                if end == -1:
+                    if len(buf) - self._pos > 1024:
+                        raise HTTPError('400 Bad Request', "Слишком длинная строка размера чанка")
+                    return None
+                # Перед расширениями ';...' допускаются пробелы и табы (BWS)
+                size_line = self._slice(self._pos, end).split(b';', 1)[0].rstrip(b' \t')
+                if not CHUNK_SIZE_RE.fullmatch(size_line):
+                    raise HTTPError('400 Bad Request', "Некорректный размер чанка")
+                size = int(size_line, 16)
+                self._pos = end + 2
+                if size == 0:
+                    self._state = 'trailers'
+                elif len(self._chunks) + size > self._max_body_size:
+                    raise HTTPError('413 Content Too Large', "Слишком большое тело запроса")
+                else:
+                    self._remaining = size
+                    self._state = 'chunk_data'
+
+            elif self._state == 'chunk_data':
+                end = self._pos + self._remaining
+                if len(buf) < end + 2:
+                    return None
+                if buf[end:end + 2] != b'\r\n':
+                    raise HTTPError('400 Bad Request', "Чанк не завершён CRLF")
+                with memoryview(buf) as view:
+                    self._chunks += view[self._pos:end]
+                self._pos = end + 2
+                self._state = 'chunk_size'
+
+            else:  # trailers: заголовки после последнего чанка не используются
+                if buf.startswith(b'\r\n', self._pos):
+                    self._pos += 2
+                else:
+                    end = self._find(b'\r\n\r\n')
+                    if end == -1:
+                        if len(buf) - self._pos > self._max_header_size:
+                            raise HTTPError('431 Request Header Fields Too Large', "Слишком большие трейлеры")
+                        return None
+                    self._pos = end + 4
+                body = bytes(self._chunks)
+                self._chunks = None
+                return self._finish(body)
+
+    def _start_request(self, head):
+        lines = head.decode('latin-1').split('\r\n')
+        parts = lines[0].split(' ')
+        if len(parts) != 3 or not parts[0] or not parts[1]:
+            raise HTTPError('400 Bad Request', "Некорректная строка запроса")
+        method, path, protocol = parts
+        if not protocol.startswith('HTTP/1.'):
+            raise HTTPError('505 HTTP Version Not Supported', f"Версия {protocol} не поддерживается")
+
+        headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(':')
+            if not sep or not name or name != name.strip():
+                raise HTTPError('400 Bad Request', "Некорректный заголовок")
+            name = name.lower()
+            value = value.strip()
+            headers[name] = f"{headers[name]}, {value}" if name in headers else value
+
+        self._request = {'method': method, 'path': path, 'protocol': protocol, 'headers': headers}
+        transfer_encoding = headers.get('transfer-encoding')
+        length = headers.get('content-length')
+        if transfer_encoding is not None:
+            # Оба заголовка сразу - классический вектор request smuggling
+            if length is not None:
+                raise HTTPError('400 Bad Request', "Content-Length вместе с Transfer-Encoding")
+            if transfer_encoding.lower() != 'chunked':
+                raise HTTPError('501 Not Implemented', f"Transfer-Encoding {transfer_encoding} не поддерживается")
+            self._chunks = bytearray()
+            self._state = 'chunk_size'
+        elif length is not None:
+            if not CONTENT_LENGTH_RE.fullmatch(length):
+                raise HTTPError('400 Bad Request', "Некорректный Content-Length")
+            self._remaining = int(length)
+            if self._remaining > self._max_body_size:
+                raise HTTPError('413 Content Too Large', "Слишком большое тело запроса")
+            self._state = 'body' if self._remaining else 'head'
+
+    def _finish(self, body):
+        req = self._request
+        req['body'] = body.decode('utf-8', errors='replace')
+        self._request = None
+        self._state = 'head'
+        return req
+
+
+class GradesFragment:
+    """
+    HTML списка оценок, собираемый по частям.
+
+    Дисциплины хранятся отсортированными блоками по GRADES_BLOCK_SIZE, у
+    каждого блока кэшируются готовые байты. Изменение дисциплины сбрасывает
+    кэш одного блока, поэтому после POST заново склеиваются только его
+    строки и уже готовые байты остальных блоков.
+    Вызывающий код держит GRADES_LOCK.
+    """
+
+    def __init__(self, grades):
+        self._items = {subject: self.render_item(subject, values) for subject, values in grades.items()}
+        order = sorted(self._items)
+        self._blocks = [order[i:i + GRADES_BLOCK_SIZE] for i in range(0, len(order), GRADES_BLOCK_SIZE)]
+        self._block_bytes = [None] * len(self._blocks)
+
+    @staticmethod
+    def render_item(subject, values):
+        """HTML одной строки журнала в байтах"""
+        return f'''
+                    <li class="grade-item">
+                        <span class="subject">{html.escape(subject)}</span>
+                        <span class="grade">{html.escape(", ".join(values))}</span>
+                    </li>
+                '''.encode('utf-8')
+
+    def _block_index(self, subject):
+        """Номер блока, в котором дисциплина есть или должна быть"""
+        lo, hi = 0, len(self._blocks) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._blocks[mid][-1] < subject:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def update(self, subject, values):
+        is_new = subject not in self._items
+        self._items[subject] = self.render_item(subject, values)
+        if not self._blocks:
+            self._blocks.append([subject])
+            self._block_bytes.append(None)
+            return
+
+        i = self._block_index(subject)
+        self._block_bytes[i] = None
+        if not is_new:
+            return
+        block = self._blocks[i]
+        bisect.insort(block, subject)
+        if len(block) > 2 * GRADES_BLOCK_SIZE:
+            self._blocks[i:i + 1] = [block[:GRADES_BLOCK_SIZE], block[GRADES_BLOCK_SIZE:]]
+            self._block_bytes[i:i + 1] = [None, None]
+
+    def parts(self):
+        """Куски HTML по порядку; склеиваются вызывающим вместе с оболочкой страницы"""
+        if not self._blocks:
+            return [EMPTY_GRADES_HTML]
+        for i, cached in enumerate(self._block_bytes):
+            if cached is None:
+                self._block_bytes[i] = b''.join([self._items[subject] for subject in self._blocks[i]])
+        return [GRADES_LIST_OPEN, *self._block_bytes, GRADES_LIST_CLOSE]
+
 
 class MyHTTPServer:
-    def __init__(self, host, port, server_name):
+    """
+    Режимы обработки соединений (mode):
+    - sync: клиенты обслуживаются по одному в цикле accept
+    - threads: пул из workers потоков
+    - prefork: процесс, принимающий соединения с унаследованного сокета
+      (только Unix)
+    - async: цикл событий asyncio
+    - core: общее ядро netcore (цикл на selectors)
+
+    Журнал оценок у каждого процесса свой, поэтому prefork и core
+    запускаются с одним процессом: с несколькими добавленная оценка была
+    бы видна только в ответах процесса, принявшего POST.
+
+    Ответ - список буферов: заранее закодированные заголовки и тело (или его
+    части) уходят одним sendmsg без склейки, файлы из static_dir - через
+    sendfile. zero_copy=False склеивает ответ в один буфер (для сравнения).
+
+    Соединения HTTP/1.1 остаются открытыми (keep-alive), пока клиент не
+    попросит Connection: close, не промолчит keep_alive_timeout секунд или
+    не отправит max_requests запросов. Запросы, пришедшие подряд без
+    ожидания ответа (pipelining), обрабатываются по очереди из буфера,
+    ответы на них уходят одним sendall. В режимах sync и prefork keep-alive
+    выключен (SERIAL_MODES): соединения там обслуживаются по одному, и
+    одно открытое соединение останавливало бы всех остальных клиентов.
+
+    GET /metrics отдаёт метрики процесса (metrics.py) в формате Prometheus.
+    Журнал запросов печатает отдельный поток (async_logger.py), обработка
+    запроса только кладёт строку в очередь.
+    """
+
+    def __init__(self, host, port, server_name, mode='sync', workers=None, backlog=BACKLOG, verbose=True,
+                 keep_alive=True, keep_alive_timeout=KEEP_ALIVE_TIMEOUT, max_requests=MAX_KEEP_ALIVE_REQUESTS,
+                 static_dir=STATIC_DIR, zero_copy=True, store=None):
+        if mode not in MODES:
+            raise ValueError(f"Неизвестный режим: {mode}, доступны: {', '.join(MODES)}")
+        self._workers = workers or (THREAD_WORKERS if mode == 'threads' else 1)
+        # Журнал и в памяти, и на диске у каждого процесса свой: добавленная
+        # оценка была бы видна только в ответах процесса, принявшего POST
+        if mode in ('prefork', 'core') and self._workers > 1:
+            raise ValueError(f"Режим {mode} с несколькими процессами не запускается: "
+                             "у каждого процесса свой журнал оценок")
         self._host = host
         self._port = port
         self._server_name = server_name
+        self._mode = mode
+        self._backlog = max(1, min(backlog, socket.SOMAXCONN))
+        self._verbose = verbose
+        self._keep_alive = keep_alive and mode not in SERIAL_MODES
+        self._keep_alive_timeout = keep_alive_timeout
+        self._max_requests = max(1, max_requests)
+        self._store = store if store is not None else MemoryGradesStore(GRADES)
+        self._logger = AsyncLogger()
+        self._metrics = Metrics()
+        # sendmsg есть не везде (Windows) - там ответ склеивается и уходит sendall.
+        # asyncio до Python 3.12 склеивает writelines сам, но файлы уходят sendfile
+        self._zero_copy = zero_copy and hasattr(socket.socket, 'sendmsg')
+        self._connection_headers = {}
+        self._static = self.load_static_files(static_dir)
+        self._not_found = self.handle_404()
+        # Оболочка страницы не меняется: кодируем её в байты один раз
+        self._page_head, self._page_tail = (
+            part.encode('utf-8') for part in self.generate_html_page().split(GRADES_PLACEHOLDER)
+        )
+        self.rebuild_grades_cache()
 
-    def serve_forever(self):
+    def log(self, message):
+        """Подробный журнал запросов; печатает поток AsyncLogger, а не обработчик"""
+        if self._verbose:
+            self._logger.log(message)
+
+    def log_error(self, message):
+        self._logger.log(message)
+
+    def create_socket(self):
         serv_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM, proto=0)
         serv_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        serv_sock.bind((self._host, self._port))
+        serv_sock.listen(self._backlog)
+        return serv_sock
+
+    def serve_forever(self):
+        if self._mode == 'core':
+            self.serve_core()
+            return
+        signal.signal(signal.SIGTERM, raise_keyboard_interrupt)
+        serv_sock = self.create_socket()
 
         try:
-            serv_sock.bind((self._host, self._port))
-            serv_sock.listen(5)
-            print(f"Сервер запущен на http://{self._host}:{self._port}")
+            keep_alive = (f"{self._keep_alive_timeout} с, до {self._max_requests} запросов"
+                          if self._keep_alive else "выключен")
+            print(f"Сервер запущен на http://{self._host}:{self._port} "
+                  f"(режим: {self._mode}, воркеров: {self._workers}, backlog: {self._backlog}, "
+                  f"keep-alive: {keep_alive})")
 
-            while True:
-                conn, addr = serv_sock.accept()
-                print(f"Подключение от {addr}")
-                try:
-                    self.serve_client(conn)
-                except Exception as e:
-                    print('Client serving failed', e)
+            if self._mode == 'sync':
+                self.accept_loop(serv_sock, self.serve_client)
+            elif self._mode == 'threads':
+                self.serve_threads(serv_sock)
+            elif self._mode == 'prefork':
+                self.serve_prefork(serv_sock)
+            else:
+                asyncio.run(self.serve_async(serv_sock))
         except KeyboardInterrupt:
             print("\nСервер остановлен")
         finally:
             serv_sock.close()
+            self._logger.close()
+
+    def accept_loop(self, serv_sock, dispatch):
+        while True:
+            conn, addr = serv_sock.accept()
+            self.log(f"Подключение от {addr}")
+            conn.settimeout(CLIENT_TIMEOUT)
+            try:
+                dispatch(conn)
+            except Exception as e:
+                self.log_error(f'Client serving failed {e}')
+
+    def serve_threads(self, serv_sock):
+        """Пул потоков; не больше workers * 4 принятых соединений ждут обработки,
+        остальные остаются в очереди listen (backlog)"""
+        slots = threading.BoundedSemaphore(self._workers * 4)
+
+        def dispatch(conn):
+            slots.acquire()
+            future = pool.submit(self.serve_client, conn)
+            future.add_done_callback(lambda _: slots.release())
+
+        with ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix='http') as pool:
+            self.accept_loop(serv_sock, dispatch)
+
+    def serve_prefork(self, serv_sock):
+        """Процессы-воркеры наследуют слушающий сокет, accept распределяет ядро.
+        Журнал у каждого процесса свой, поэтому процесс запускается один и
+        обслуживает соединения по очереди, без keep-alive"""
+        if not hasattr(os, 'fork'):
+            raise RuntimeError("Режим prefork доступен только на Unix")
+
+        children = []
+        for _ in range(self._workers):
+            pid = os.fork()
+            if pid == 0:
+                try:
+                    self.accept_loop(serv_sock, self.serve_client)
+                except KeyboardInterrupt:
+                    pass
+                finally:
+                    self._logger.close()
+                    os._exit(0)
+            children.append(pid)
+
+        try:
+            while children:
+                pid, _ = os.wait()
+                children.remove(pid)
+        except KeyboardInterrupt:
+            for pid in children:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+            for pid in children:
+                try:
+                    os.waitpid(pid, 0)
+                except ChildProcessError:
+                    pass
+            raise
+
+    async def serve_async(self, serv_sock):
+        server = await asyncio.start_server(self.serve_client_async, sock=serv_sock, backlog=self._backlog)
+        async with server:
+            await server.serve_forever()
+
+    async def serve_client_async(self, reader, writer):
+        parser = RequestParser()
+        served = 0
+        timeout = CLIENT_TIMEOUT
+        metrics = self._metrics
+        metrics.connection_opened()
+        try:
+            while True:
+                data = await asyncio.wait_for(reader.read(RECV_SIZE), timeout)
+                if not data:
+                    if parser.has_partial_request():
+                        self.log("Клиент закрыл соединение посреди запроса")
+                    break
+                started = time.perf_counter()
+                requests = parser.feed(data)
+                metrics.observe('parse', time.perf_counter() - started)
+                out, keep_alive, served = self.respond(requests, served)
+                if out:
+                    started = time.perf_counter()
+                    await self.send_parts_async(writer, out)
+                    metrics.observe('send', time.perf_counter() - started)
+                    self.log("Ответ отправлен")
+                if not keep_alive:
+                    break
+                parser.raise_pending_error()
+                if served:
+                    timeout = self._keep_alive_timeout
+        except HTTPError as e:
+            self.log(f"Некорректный запрос: {e}")
+            writer.write(self.encode_response(self.handle_bad_request(e)))
+            await writer.drain()
+        except asyncio.TimeoutError:
+            self.log("Соединение закрыто по таймауту" if served else "Клиент не прислал запрос")
+        except ConnectionResetError:
+            self.log("Клиент разорвал соединение")
+        except Exception as e:
+            self.log_error(f"Ошибка: {e}")
+        finally:
+            metrics.connection_closed()
+            writer.close()
+
+    def serve_core(self):
+        """
+        Сокет, accept, таймауты и остановку берёт на себя netcore.
+        С журналом на диске POST уходит в пул потоков netcore (Server.submit):
+        add() ждёт fsync, и в цикле событий это остановило бы все соединения
+        """
+        threads = CORE_POST_THREADS if isinstance(self._store, LogGradesStore) else 0
+        server = netcore.Server(CoreHTTPHandler(self, offload_posts=threads > 0), self._host, self._port, workers=threads,
+                                processes=self._workers, timeout=CLIENT_TIMEOUT, backlog=self._backlog)
+        keep_alive = (f"{self._keep_alive_timeout} с, до {self._max_requests} запросов"
+                      if self._keep_alive else "выключен")
+        print(f"Сервер запущен на http://{self._host}:{self._port} "
+              f"(режим: {self._mode}, процессов: {self._workers}, backlog: {self._backlog}, "
+              f"keep-alive: {keep_alive})")
+        server.serve_forever()
+        self._logger.close()
+        print("\nСервер остановлен")
 
     def serve_client(self, conn):
+        parser = RequestParser()
+        recv_buf = bytearray(RECV_SIZE)
+        recv_view = memoryview(recv_buf)
+        served = 0
+        metrics = self._metrics
+        metrics.connection_opened()
         try:
-            req = self.parse_request(conn)
-            if req:
-                resp = self.handle_request(req)
-                self.send_response(conn, resp)
+            while True:
+                n = conn.recv_into(recv_buf)
+                if not n:
+                    if parser.has_partial_request():
+                        self.log("Клиент закрыл соединение посреди запроса")
+                    break
+                started = time.perf_counter()
+                requests = parser.feed(recv_view[:n])
+                metrics.observe('parse', time.perf_counter() - started)
+                # Все запросы конвейера, пришедшие этим куском, получают ответ одной отправкой
+                out, keep_alive, served = self.respond(requests, served)
+                if out:
+                    started = time.perf_counter()
+                    self.send_parts(conn, out)
+                    metrics.observe('send', time.perf_counter() - started)
+                    self.log("Ответ отправлен")
+                if not keep_alive:
+                    break
+                parser.raise_pending_error()
+                if served:
+                    conn.settimeout(self._keep_alive_timeout)
+        except HTTPError as e:
+            self.log(f"Некорректный запрос: {e}")
+            conn.sendall(self.encode_response(self.handle_bad_request(e)))
+        except socket.timeout:
+            self.log("Соединение закрыто по таймауту" if served else "Клиент не прислал запрос")
         except ConnectionResetError:
-            print("Клиент разорвал соединение")
+            self.log("Клиент разорвал соединение")
         except Exception as e:
-            print(f"Ошибка: {e}")
+            self.log_error(f"Ошибка: {e}")
             self.send_error(conn, e)
         finally:
+            metrics.connection_closed()
+            recv_view.release()
             if conn:
                 conn.close()
 
-    def parse_request(self, conn):
-        """Парсинг HTTP запроса"""
-        try:
-            request_data = conn.recv(4096).decode('utf-8')
-            if not request_data:
-                return None
+    def respond(self, requests, served):
+        """
+        Обработка разобранных запросов по порядку.
+        Возвращает (части ответов, оставить ли соединение, обслужено запросов).
+        """
+        out = []
+        keep_alive = True
+        for req in requests:
+            started = time.perf_counter()
+            served += 1
+            parts, keep_alive = self.finish_request(req, self.handle_request(req), served, started)
+            out += parts
+            if not keep_alive:
+                break
+        return out, keep_alive, served
 
-            lines = request_data.split('\r\n')
-            request_line = lines[0]
-            
-            parts = request_line.split(' ')
-            if len(parts) != 3:
-                return None
-                
-            method, path, protocol = parts
+    def finish_request(self, req, resp, served, started):
+        """Части ответа на served-й запрос соединения и решение о keep-alive; учёт в метриках"""
+        keep_alive = self.wants_keep_alive(req, served)
+        parts = self.response_parts(resp, keep_alive, served)
+        self._metrics.request_done(req['method'], route_of(req['path'], self._static), resp['status'],
+                                   time.perf_counter() - started)
+        return parts, keep_alive
 
-            headers = {}
-            body_start = 0
-            for i, line in enumerate(lines[1:], 1):
-                if line == '':
-                    body_start = i + 1
-                    break
-                if ':' in line:
-                    key, value = line.split(':', 1)
-                    headers[key.strip().lower()] = value.strip()
-
-            # Извлекаем тело запроса
-            body = ''
-            if body_start < len(lines):
-                body = '\r\n'.join(lines[body_start:])
-
-            return {
-                'method': method,
-                'path': path,
-                'protocol': protocol,
-                'headers': headers,
-                'body': body
-            }
-        except Exception as e:
-            print(f"Ошибка парсинга запроса: {e}")
-            return None
+    def send_parts(self, conn, parts):
+        """Отправка частей ответов: буферы подряд - одним sendmsg, файлы - sendfile"""
+        if not self._zero_copy:
+            conn.sendall(self.join_parts(parts))
+            return
+        buffers = []
+        for part in parts:
+            if not isinstance(part, FileBody):
+                buffers.append(part)
+                continue
+            sendmsg_all(conn, buffers)
+            buffers = []
+            with open(part.path, 'rb') as f:
+                conn.sendfile(f, 0, part.size)
+        sendmsg_all(conn, buffers)
+
+    def send_parts_core(self, conn, parts):
+        """Как send_parts, но части встают в очередь соединения netcore"""
+        if not self._zero_copy:
+            conn.sendall(self.join_parts(parts))
+            return
+        buffers = []
+        for part in parts:
+            if not isinstance(part, FileBody):
+                buffers.append(part)
+                continue
+            conn.writelines(buffers)
+            buffers = []
+            with open(part.path, 'rb') as f:
+                conn.sendfile(f, 0, part.size)
+        conn.writelines(buffers)
+
+    async def send_parts_async(self, writer, parts):
+        if not self._zero_copy:
+            writer.write(self.join_parts(parts))
+            await writer.drain()
+            return
+        buffers = []
+        for part in parts:
+            if not isinstance(part, FileBody):
+                buffers.append(part)
+                continue
+            writer.writelines(buffers)
+            buffers = []
+            await writer.drain()
+            with open(part.path, 'rb') as f:
+                await asyncio.get_running_loop().sendfile(writer.transport, f, 0, part.size)
+        writer.writelines(buffers)
+        await writer.drain()
+
+    def wants_keep_alive(self, req, served):
+        """Оставить ли соединение открытым после ответа на served-й запрос"""
+        if not self._keep_alive or served >= self._max_requests:
+            return False
+        connection = req['headers'].get('connection', '').lower()
+        if req['protocol'] == 'HTTP/1.0':
+            return 'keep-alive' in connection
+        return 'close' not in connection
 
     def handle_request(self, req):
         """Обработка HTTP запроса"""
         method = req['method']
         path = req['path']
         
-        print(f"{method} {path}")
+        self.log(f"{method} {path}")
 
         if method == 'GET' and path == '/':
-            return self.handle_get_grades()
+            return self.handle_get_grades(req['headers'].get('if-none-match'))
         elif method == 'POST' and path == '/':
             return self.handle_post_grade(req['body'])
+        elif method == 'GET' and path in self._static:
+            return self._static[path]
+        elif method == 'GET' and path == '/metrics':
+            return self.handle_metrics()
         else:
-            return self.handle_404()
+            return self._not_found
+
+    def handle_metrics(self):
+        """Метрики этого процесса в текстовом формате Prometheus"""
+        body = self._metrics.render(self._logger.dropped).encode('utf-8')
+        return self.make_response('200 OK', {
+            'Content-Type': 'text/plain; version=0.0.4; charset=utf-8',
+            'Content-Length': str(len(body)),
+            'Cache-Control': 'no-cache',
+        }, body)
 
-    def handle_get_grades(self):
+    def handle_get_grades(self, if_none_match=None):
         """Обработка GET запроса - показ формы и оценок"""
-        html_content = self.generate_html_page()
-        
-        return {
-            'status': '200 OK',
-            'headers': {
-                'Content-Type': 'text/html; charset=utf-8',
-                'Content-Length': str(len(html_content.encode('utf-8'))),
-                'Connection': 'close'
-            },
-            'body': html_content
-        }
+        page = self.get_grades_page()
+        if if_none_match and page['etag'] in (tag.strip() for tag in if_none_match.split(',')):
+            return page['not_modified']
+        return page['response']
+
+    def rebuild_grades_cache(self):
+        """Полная сборка кэша журнала из хранилища (при старте)"""
+        with GRADES_LOCK:
+            self._grades_fragment = GradesFragment(self._store.snapshot())
+            self._page = None
+
+    def get_grades_page(self):
+        """
+        Готовые ответы 200 и 304 для страницы журнала.
+        Собираются заново только после изменения журнала в handle_post_grade.
+        Тело - список готовых кусков (оболочка и блоки журнала), в один
+        буфер оно не склеивается.
+        """
+        page = self._page
+        if page is not None:
+            return page
+        with GRADES_LOCK:
+            if self._page is None:
+                body = (self._page_head, *self._grades_fragment.parts(), self._page_tail)
+                crc = 0
+                for part in body:
+                    crc = zlib.crc32(part, crc)
+                length = sum(len(part) for part in body)
+                # ETag зависит только от содержимого, поэтому совпадает у всех воркеров prefork
+                etag = f'"{crc:08x}-{length:x}"'
+                response = self.make_response('200 OK', {
+                    'Content-Type': 'text/html; charset=utf-8',
+                    'Content-Length': str(length),
+                    'ETag': etag,
+                    'Cache-Control': 'no-cache',
+                }, body)
+                not_modified = self.make_response('304 Not Modified', {'ETag': etag, 'Cache-Control': 'no-cache'})
+                self._page = {'etag': etag, 'response': response, 'not_modified': not_modified}
+            return self._page
 
     def handle_post_grade(self, body):
         """Обработка POST запроса - добавление оценки"""
@@ -127,19 +789,22 @@ class MyHTTPServer:
             grade = form_data.get('grade', [''])[0].strip()
             
             if subject and grade:
-                # Добавляем оценку
-                if subject not in GRADES:
-                    GRADES[subject] = []
-                GRADES[subject].append(grade)
-                print(f"Добавлена оценка: {subject} - {grade}")
+                # Добавляем оценку (с хранилищем на диске - после fsync) и сбрасываем кэш страницы.
+                # Оценки берутся из хранилища под GRADES_LOCK, чтобы параллельный POST
+                # в ту же дисциплину не вернул в кэш старый список
+                self._store.add(subject, grade)
+                with GRADES_LOCK:
+                    self._grades_fragment.update(subject, self._store.get(subject))
+                    self._page = None
+                self.log(f"Добавлена оценка: {subject} - {grade}")
             else:
-                print("Некорректные данные формы")
+                self.log("Некорректные данные формы")
             
             # Возвращаем обновленную страницу
             return self.handle_get_grades()
             
         except Exception as e:
-            print(f"Ошибка обработки POST: {e}")
+            self.log_error(f"Ошибка обработки POST: {e}")
             return self.handle_get_grades()
 
     def handle_404(self):
@@ -158,162 +823,74 @@ class MyHTTPServer:
         </html>
         """
         
+        body = html_content.encode('utf-8')
+        return self.make_response('404 Not Found', {
+            'Content-Type': 'text/html; charset=utf-8',
+            'Content-Length': str(len(body)),
+        }, body)
+
+    def load_static_files(self, static_dir):
+        """
+        Ответы для файлов из static_dir (по пути /static/<имя>).
+        Заголовки считаются один раз при старте, тело отправляется sendfile;
+        после замены файла сервер нужно перезапустить.
+        """
+        static = {}
+        if not static_dir or not os.path.isdir(static_dir):
+            return static
+        for name in sorted(os.listdir(static_dir)):
+            path = os.path.join(static_dir, name)
+            if not os.path.isfile(path):
+                continue
+            stat = os.stat(path)
+            content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+            if content_type.startswith('text/'):
+                content_type += '; charset=utf-8'
+            response = self.make_response('200 OK', {
+                'Content-Type': content_type,
+                'Content-Length': str(stat.st_size),
+                'Last-Modified': formatdate(stat.st_mtime, usegmt=True),
+                'Cache-Control': 'public, max-age=3600',
+            })
+            response['file'] = FileBody(path, stat.st_size)
+            static[f'/static/{name}'] = response
+        return static
+
+    def handle_bad_request(self, err):
+        """Ответ на запрос, который не удалось разобрать"""
+        html_content = f"""
+        <!DOCTYPE html>
+        <html lang="ru">
+        <head>
+            <meta charset="UTF-8">
+            <title>{err.status}</title>
+        </head>
+        <body>
+            <h1>{err.status}</h1>
+            <p>{err}</p>
+        </body>
+        </html>
+        """
+
         return {
-            'status': '404 Not Found',
+            'status': err.status,
             'headers': {
                 'Content-Type': 'text/html; charset=utf-8',
                 'Content-Length': str(len(html_content.encode('utf-8'))),
-                'Connection': 'close'
             },
             'body': html_content
         }
 
     def generate_html_page(self):
-        """Генерация HTML страницы"""
-        grades_html = ""
-        if GRADES:
-            grades_html = '<h2>Журнал оценок:</h2><ul class="grades-list">'
-            for subject in sorted(GRADES.keys()):
-                grades_str = ", ".join(GRADES[subject])
-                grades_html += f'''
-                    <li class="grade-item">
-                        <span class="subject">{subject}</span>
-                        <span class="grade">{grades_str}</span>
-                    </li>
-                '''
-            grades_html += '</ul>'
-        else:
-            grades_html = '<div class="empty-state">Оценок пока нет. Добавьте первую!</div>'
-
-        html = f"""
+        """Генерация оболочки HTML страницы; журнал вставляется на место GRADES_PLACEHOLDER"""
+        page = f"""
         <!DOCTYPE html>
         <html lang="ru">
         <head>
             <meta charset="UTF-8">
             <meta name="viewport" content="width=device-width, initial-scale=1.0">
             <title>Журнал оценок</title>
-            <style>
-                body {{
-                    font-family: 'Segoe UI', Arial, sans-serif;
-                    max-width: 800px;
-                    margin: 0 auto;
-                    padding: 20px;
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    min-height: 100vh;
-                }}
-                .container {{
-                    background: white;
-                    padding: 40px;
-                    border-radius: 20px;
-                    box-shadow: 0 20px 40px rgba(0,0,0,0.1);
-                }}
-                h1 {{
-                    color: #333;
-                    text-align: center;
-                    margin-bottom: 40px;
-                    font-size: 2.5em;
-                }}
-                .form-section {{
-                    background: #f8f9ff;
-                    padding: 30px;
-                    border-radius: 15px;
-                    margin-bottom: 40px;
-                    border: 2px solid #e3e8ff;
-                }}
-                .form-group {{
-                    margin-bottom: 25px;
-                }}
-                label {{
-                    display: block;
-                    margin-bottom: 8px;
-                    font-weight: 600;
-                    color: #4a5568;
-                    font-size: 1.1em;
-                }}
-                input[type="text"], select {{
-                    width: 100%;
-                    padding: 15px;
-                    border: 2px solid #e2e8f0;
-                    border-radius: 10px;
-                    font-size: 16px;
-                    transition: all 0.3s ease;
-                    box-sizing: border-box;
-                }}
-                input[type="text"]:focus, select:focus {{
-                    border-color: #667eea;
-                    outline: none;
-                    box-shadow: 0 0 0 3px rgba(102, 126, 234, 0.1);
-                }}
-                button {{
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    padding: 15px 40px;
-                    border: none;
-                    border-radius: 10px;
-                    cursor: pointer;
-                    font-size: 18px;
-                    font-weight: 600;
-                    width: 100%;
-                    transition: transform 0.2s ease;
-                }}
-                button:hover {{
-                    transform: translateY(-2px);
-                    box-shadow: 0 10px 25px rgba(102, 126, 234, 0.3);
-                }}
-                .grades-section {{
-                    margin-top: 40px;
-                }}
-                .grades-list {{
-                    list-style: none;
-                    padding: 0;
-                }}
-                .grade-item {{
-                    background: linear-gradient(135deg, #ff9a9e 0%, #fecfef 100%);
-                    margin: 15px 0;
-                    padding: 20px;
-                    border-radius: 15px;
-                    display: flex;
-                    justify-content: space-between;
-                    align-items: center;
-                    box-shadow: 0 5px 15px rgba(0,0,0,0.1);
-                    transition: transform 0.2s ease;
-                }}
-                .grade-item:hover {{
-                    transform: translateY(-2px);
-                }}
-                .subject {{
-                    font-weight: 600;
-                    color: #2d3748;
-                    font-size: 1.2em;
-                }}
-                .grade {{
-                    color: #2d3748;
-                    font-size: 1.3em;
-                    font-weight: 700;
-                    background: white;
-                    padding: 8px 16px;
-                    border-radius: 8px;
-                }}
-                .empty-state {{
-                    text-align: center;
-                    color: #718096;
-                    font-style: italic;
-                    font-size: 1.2em;
-                    padding: 60px 20px;
-                    background: #f7fafc;
-                    border-radius: 15px;
-                    border: 2px dashed #cbd5e0;
-                }}
-                .server-info {{
-                    text-align: center;
-                    margin-top: 30px;
-                    padding: 20px;
-                    background: #edf2f7;
-                    border-radius: 10px;
-                    font-size: 0.9em;
-                    color: #4a5568;
-                }}
-            </style>
+            <link rel="stylesheet" href="/static/style.css">
         </head>
         <body>
             <div class="container">
@@ -343,7 +920,7 @@ class MyHTTPServer:
                 </div>
                 
                 <div class="grades-section">
-                    {grades_html}
+                    {GRADES_PLACEHOLDER}
                 </div>
                 
                 <div class="server-info">
@@ -353,28 +930,56 @@ class MyHTTPServer:
         </body>
         </html>
         """
-        return html
+        return page
 
-    def send_response(self, conn, resp):
-        """Отправка HTTP ответа"""
-        try:
-            # Формируем HTTP ответ
-            response_line = f"HTTP/1.1 {resp['status']}\r\n"
-            
-            # Добавляем заголовки
-            headers = ""
-            for key, value in resp['headers'].items():
-                headers += f"{key}: {value}\r\n"
-            
-            # Формируем полный ответ
-            full_response = response_line + headers + "\r\n" + resp['body']
-            
-            # Отправляем
-            conn.sendall(full_response.encode('utf-8'))
-            print("Ответ отправлен")
-            
-        except Exception as e:
-            print(f"Ошибка отправки ответа: {e}")
+    def make_response(self, status, headers, body=b''):
+        """Ответ с заранее закодированными строкой статуса и заголовками"""
+        head = f"HTTP/1.1 {status}\r\n" + "".join(f"{key}: {value}\r\n" for key, value in headers.items())
+        return {'status': status, 'headers': headers, 'head': head.encode('utf-8'), 'body': body}
+
+    def connection_header(self, keep_alive, served):
+        """Заголовок Connection (и Keep-Alive) с пустой строкой конца заголовков"""
+        key = served if keep_alive else 0
+        header = self._connection_headers.get(key)
+        if header is None:
+            if keep_alive:
+                header = (f"Connection: keep-alive\r\n"
+                          f"Keep-Alive: timeout={int(self._keep_alive_timeout)}, max={self._max_requests - served}"
+                          f"\r\n\r\n").encode('ascii')
+            else:
+                header = b"Connection: close\r\n\r\n"
+            self._connection_headers[key] = header
+        return header
+
+    def response_parts(self, resp, keep_alive=False, served=1):
+        """Ответ как список буферов (и FileBody) для send_parts"""
+        head = resp.get('head')
+        if head is None:
+            head = self.make_response(resp['status'], resp['headers'])['head']
+        parts = [head, self.connection_header(keep_alive, served)]
+        body = resp.get('file', resp['body'])
+        if isinstance(body, str):
+            parts.append(body.encode('utf-8'))
+        elif isinstance(body, (list, tuple)) and not isinstance(body, FileBody):
+            parts += body
+        else:
+            parts.append(body)
+        return parts
+
+    @staticmethod
+    def join_parts(parts):
+        """Склейка частей ответов в один буфер (файлы читаются целиком)"""
+        buffers = []
+        for part in parts:
+            if isinstance(part, FileBody):
+                with open(part.path, 'rb') as f:
+                    part = f.read()
+            buffers.append(part)
+        return b''.join(buffers)
+
+    def encode_response(self, resp, keep_alive=False, served=1):
+        """Сериализация HTTP ответа в байты одним буфером"""
+        return self.join_parts(self.response_parts(resp, keep_alive, served))
 
     def send_error(self, conn, err):
         """Отправка ошибки"""
@@ -408,9 +1013,175 @@ class MyHTTPServer:
             pass
 
 
+class CoreConnection:
+    def __init__(self):
+        self.parser = RequestParser()
+        self.served = 0
+        # Разобранные запросы, ждущие ответа, пока POST выполняется в пуле
+        self.pending = deque()
+        self.busy = False
+        self.eof = False
+
+
+class CoreHTTPHandler(netcore.Handler):
+    """
+    Обработка соединения в режиме core: то же, что serve_client, но по событиям.
+
+    POST с журналом на диске выполняется в пуле (Server.submit), ответ
+    отправляется из callback. Пока он выполняется, следующие запросы
+    соединения ждут в очереди, чтобы ответы на конвейер ушли по порядку.
+    """
+
+    def __init__(self, http_server, offload_posts=False):
+        self.http = http_server
+        self.offload_posts = offload_posts
+
+    def connection_made(self, conn):
+        conn.state = CoreConnection()
+        self.http._metrics.connection_opened()
+        self.http.log(f"Подключение от {conn.addr}")
+
+    def connection_lost(self, conn):
+        self.http._metrics.connection_closed()
+
+    def data_received(self, conn, data):
+        state = conn.state
+        metrics = self.http._metrics
+        try:
+            started = time.perf_counter()
+            requests = state.parser.feed(data)
+            metrics.observe('parse', time.perf_counter() - started)
+        except HTTPError as e:
+            if state.busy:
+                # 400 уйдёт после ответа на выполняющийся POST
+                state.pending.append(e)
+            else:
+                self.bad_request(conn, e)
+            return
+        # Запросы сверх max_requests без ответа: соединение закроется раньше
+        room = self.http._max_requests - state.served - len(state.pending) - state.busy
+        state.pending.extend(requests[:max(0, room)])
+        self.process(conn)
+
+    def process(self, conn):
+        """Отвечает на запросы из очереди, пока не встретит POST для пула"""
+        http = self.http
+        state = conn.state
+        out = []
+        keep_alive = True
+        while state.pending and keep_alive:
+            req = state.pending.popleft()
+            if isinstance(req, HTTPError):
+                self.send(conn, out)
+                self.bad_request(conn, req)
+                return
+            started = time.perf_counter()
+            if self.offload_posts and req['method'] == 'POST':
+                state.busy = True
+                conn.server.submit(http.handle_request, req,
+                                   callback=lambda resp, error: self.post_done(conn, req, started, resp, error))
+                break
+            state.served += 1
+            parts, keep_alive = http.finish_request(req, http.handle_request(req), state.served, started)
+            out += parts
+        self.send(conn, out)
+        if not keep_alive:
+            conn.close()
+        elif not state.busy:
+            self.idle(conn)
+
+    def post_done(self, conn, req, started, resp, error):
+        state = conn.state
+        state.busy = False
+        if conn.closed:
+            return
+        if error is not None:
+            self.http.log_error(f"Ошибка обработки POST: {error}")
+            conn.abort()
+            return
+        state.served += 1
+        parts, keep_alive = self.http.finish_request(req, resp, state.served, started)
+        self.send(conn, parts)
+        if not keep_alive:
+            conn.close()
+            return
+        self.process(conn)
+
+    def idle(self, conn):
+        """Очередь пуста: отложенная ошибка разбора, EOF или ожидание следующего запроса"""
+        state = conn.state
+        try:
+            state.parser.raise_pending_error()
+        except HTTPError as e:
+            self.bad_request(conn, e)
+            return
+        if state.eof:
+            conn.close()
+        elif state.served:
+            conn.timeout = self.http._keep_alive_timeout
+
+    def send(self, conn, out):
+        if not out:
+            return
+        started = time.perf_counter()
+        self.http.send_parts_core(conn, out)
+        self.http._metrics.observe('send', time.perf_counter() - started)
+        self.http.log("Ответ отправлен")
+
+    def bad_request(self, conn, err):
+        self.http.log(f"Некорректный запрос: {err}")
+        conn.sendall(self.http.encode_response(self.http.handle_bad_request(err)))
+        conn.close()
+
+    def eof_received(self, conn):
+        state = conn.state
+        if state.parser.has_partial_request():
+            self.http.log("Клиент закрыл соединение посреди запроса")
+        if state.busy or state.pending:
+            # Закроется, когда уйдут ответы на уже принятые запросы
+            state.eof = True
+            return
+        conn.close()
+
+
 if __name__ == '__main__':
-    serv = MyHTTPServer(HOST, PORT, SERV_NAME)
+    parser = argparse.ArgumentParser(description='Журнал оценок на сокетах')
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--mode', choices=MODES, default='sync', help='режим обработки соединений')
+    parser.add_argument('--workers', type=int, default=None,
+                        help=f'потоков (по умолчанию {THREAD_WORKERS}); в prefork и core процесс только один')
+    parser.add_argument('--backlog', type=int, default=BACKLOG, help='очередь listen')
+    parser.add_argument('--quiet', action='store_true', help='не печатать каждый запрос')
+    parser.add_argument('--no-keep-alive', action='store_true', help='закрывать соединение после каждого ответа')
+    parser.add_argument('--keep-alive-timeout', type=float, default=KEEP_ALIVE_TIMEOUT,
+                        help='секунд простоя до закрытия соединения')
+    parser.add_argument('--max-requests', type=int, default=MAX_KEEP_ALIVE_REQUESTS,
+                        help='запросов на одно соединение')
+    parser.add_argument('--static-dir', default=STATIC_DIR, help='каталог файлов для /static/')
+    parser.add_argument('--no-zero-copy', action='store_true',
+                        help='склеивать ответ в один буфер вместо sendmsg/sendfile')
+    parser.add_argument('--store', help='каталог журнала на диске (по умолчанию журнал только в памяти)')
+    parser.add_argument('--commit', choices=COMMIT_MODES, default='group', help='когда делать fsync лога')
+    parser.add_argument('--snapshot-every', type=int, default=SNAPSHOT_EVERY,
+                        help='записей лога между снимками')
+    args = parser.parse_args()
+
+    store = LogGradesStore(args.store, args.commit, args.snapshot_every) if args.store else None
+
+    try:
+        serv = MyHTTPServer(args.host, args.port, SERV_NAME, mode=args.mode, workers=args.workers,
+                            backlog=args.backlog, verbose=not args.quiet, keep_alive=not args.no_keep_alive,
+                            keep_alive_timeout=args.keep_alive_timeout, max_requests=args.max_requests,
+                            static_dir=args.static_dir, zero_copy=not args.no_zero_copy, store=store)
+    except ValueError as e:
+        if store:
+            store.close()
+        parser.error(str(e))
     try:
         serv.serve_forever()
     except KeyboardInterrupt:
-        pass
\ No newline at end of file
+        pass
+    finally:
+        if store:
+            store.close()
\ No newline at end of file
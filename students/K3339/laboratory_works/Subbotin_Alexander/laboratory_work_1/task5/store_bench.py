@@ -0,0 +1,74 @@
+"""
+Скорость записи оценок в LogGradesStore при разных режимах fsync.
+
+Сначала хранилище нагружается напрямую из потоков (как POST в режиме
+threads), затем сервер в режиме threads с --store получает POST-запросы
+от loadgen. Каталоги журнала создаются во временной папке на том же
+диске, что и --tmp.
+
+    python store_bench.py --threads 1,8,32 --adds 2000
+"""
+import argparse
+import asyncio
+import tempfile
+import threading
+import time
+
+from grades_store import LogGradesStore
+from loadgen import HOST, print_result, run_load, start_server, stop_server
+
+MODES = ('each', 'group', 'none')
+
+
+def bench_store(path, commit, threads, adds):
+    store = LogGradesStore(path, commit=commit)
+    per_thread = max(1, adds // threads)
+
+    def writer(n):
+        for i in range(per_thread):
+            store.add(f"Дисциплина {n}", str(2 + i % 4))
+
+    workers = [threading.Thread(target=writer, args=(n,)) for n in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    store.close()
+    total = per_thread * threads
+    per_fsync = f"{total / store.fsyncs:.1f}" if store.fsyncs else "-"
+    print(f"  commit={commit:<6} потоков {threads:>3}: {total / elapsed:9.0f} записей/с, "
+          f"fsync {store.fsyncs:>6} ({per_fsync} записей на fsync)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', default='1,8,32')
+    parser.add_argument('--adds', type=int, default=2000, help='записей на замер')
+    parser.add_argument('--tmp', default=None, help='где создавать каталоги журнала')
+    parser.add_argument('--port', type=int, default=8091)
+    parser.add_argument('--connections', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=5.0)
+    args = parser.parse_args()
+
+    print("Хранилище напрямую:")
+    for commit in MODES:
+        for threads in map(int, args.threads.split(',')):
+            with tempfile.TemporaryDirectory(dir=args.tmp) as path:
+                bench_store(path, commit, threads, args.adds)
+
+    print(f"POST через сервер (threads, {args.connections} keep-alive соединений):")
+    for commit in MODES:
+        with tempfile.TemporaryDirectory(dir=args.tmp) as path:
+            proc = start_server('threads', HOST, args.port, ('--store', path, '--commit', commit))
+            try:
+                result = asyncio.run(run_load(HOST, args.port, args.connections, args.duration,
+                                              keep_alive=True, data='subject=Bench&grade=5'))
+                print_result(commit, result)
+            finally:
+                stop_server(proc)
+
+
+if __name__ == '__main__':
+    main()
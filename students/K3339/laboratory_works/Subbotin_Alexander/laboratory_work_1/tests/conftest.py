@@ -0,0 +1,19 @@
+import importlib
+import os
+import sys
+
+LAB_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Модули заданий импортируют соседей без пакета (from protocol import ...),
+# и у заданий 2 и 4 свои protocol.py
+TASK_MODULES = ('protocol', 'history', 'rooms', 'server', 'grades_store', 'metrics', 'async_logger')
+
+
+def import_task(task, name):
+    """Импорт модуля name из каталога задания task с его соседями"""
+    for module in TASK_MODULES:
+        sys.modules.pop(module, None)
+    sys.path.insert(0, os.path.join(LAB_DIR, task))
+    try:
+        return importlib.import_module(name)
+    finally:
+        sys.path.pop(0)
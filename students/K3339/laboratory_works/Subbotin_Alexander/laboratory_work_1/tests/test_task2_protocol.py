@@ -0,0 +1,47 @@
+import pytest
+
+from conftest import import_task
+
+protocol = import_task('task2', 'protocol')
+FrameDecoder = protocol.FrameDecoder
+
+
+def test_frames_split_anywhere():
+    """Кадры собираются при любом разбиении, номер и вид сохраняются"""
+    data = (protocol.encode_area(1, 3, 4)
+            + protocol.encode_frame(protocol.ERROR, 2)
+            + protocol.encode_batch(0xFFFFFFFF, [1.5, 2.0], [2.0, 3.0]))
+    for size in (1, 5, 9, len(data)):
+        decoder = FrameDecoder()
+        frames = []
+        for i in range(0, len(data), size):
+            frames += decoder.feed(data[i:i + size])
+        assert [(kind, request_id) for kind, request_id, _ in frames] == [
+            (protocol.AREA, 1), (protocol.ERROR, 2), (protocol.BATCH, 0xFFFFFFFF)]
+        assert frames[0][2] == b'3 4'
+        assert frames[1][2] == b''
+        assert list(protocol.decode_results(protocol.batch_areas(frames[2][2]))) == [3.0, 6.0]
+
+
+def test_partial_frame_waits_for_rest():
+    decoder = FrameDecoder()
+    data = protocol.encode_area(7, 1, 2)
+    assert decoder.feed(data[:protocol.FRAME_HEADER.size + 1]) == []
+    assert decoder.feed(data[protocol.FRAME_HEADER.size + 1:]) == [(protocol.AREA, 7, b'1 2')]
+
+
+def test_frame_limits():
+    with pytest.raises(protocol.ProtocolError):
+        protocol.encode_frame(protocol.AREA, 1, b'x' * (protocol.MAX_PAYLOAD + 1))
+    with pytest.raises(protocol.ProtocolError):
+        FrameDecoder(max_size=8).feed(protocol.encode_frame(protocol.AREA, 1, b'x' * 9))
+    # Длина проверяется по заголовку, не дожидаясь данных
+    with pytest.raises(protocol.ProtocolError):
+        FrameDecoder().feed(protocol.FRAME_HEADER.pack(protocol.MAX_PAYLOAD + 1, 1, protocol.BATCH))
+
+
+def test_batch_errors():
+    with pytest.raises(protocol.ProtocolError):
+        protocol.encode_batch(1, [1.0, 2.0], [1.0])
+    with pytest.raises(protocol.ProtocolError):
+        protocol.batch_areas(b'x' * 17)
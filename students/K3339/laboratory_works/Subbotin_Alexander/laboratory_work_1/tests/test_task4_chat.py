@@ -0,0 +1,110 @@
+import os
+import sys
+
+import pytest
+
+from conftest import import_task
+
+history = import_task('task4', 'history')
+# Тот же protocol, что импортировала история: иначе ProtocolError будет другим классом
+protocol = sys.modules['protocol']
+ChatHistory = history.ChatHistory
+FrameDecoder = protocol.FrameDecoder
+
+
+def test_frames_split_anywhere():
+    """Кадры собираются при любом разбиении, многобайтовые символы не ломаются"""
+    texts = ['привет', '', 'x' * 1000, '🙂 эмодзи']
+    data = protocol.encode_messages(texts)
+    for size in (1, 2, 3, 7, len(data)):
+        decoder = FrameDecoder()
+        messages = []
+        for i in range(0, len(data), size):
+            messages += decoder.feed(data[i:i + size])
+        assert messages == texts
+        assert decoder.pending == 0
+
+
+def test_partial_frame_is_pending():
+    decoder = FrameDecoder()
+    data = protocol.encode_message('сообщение')
+    assert decoder.feed(data[:-2]) == []
+    assert decoder.pending == len(data) - 2
+    assert decoder.feed(data[-2:]) == ['сообщение']
+
+
+def test_frame_limits():
+    with pytest.raises(protocol.ProtocolError):
+        protocol.encode_message('x' * (protocol.MAX_MESSAGE_SIZE + 1))
+    with pytest.raises(protocol.ProtocolError):
+        FrameDecoder(max_size=10).feed(protocol.encode_message('x' * 11))
+    # Длина проверяется по заголовку, не дожидаясь тела
+    with pytest.raises(protocol.ProtocolError):
+        FrameDecoder().feed(protocol.FRAME_HEADER.pack(protocol.MAX_MESSAGE_SIZE + 1))
+
+
+def test_invalid_utf8():
+    with pytest.raises(protocol.ProtocolError):
+        FrameDecoder().feed(protocol.FRAME_HEADER.pack(2) + b'\xff\xfe')
+
+
+def test_text_limit_leaves_room_for_sender_name():
+    assert protocol.MAX_TEXT_SIZE < protocol.MAX_MESSAGE_SIZE
+    text = 'x' * protocol.MAX_TEXT_SIZE
+    protocol.encode_message(f"[{'я' * 32}]: {text}")
+
+
+def test_history_keeps_last_messages():
+    chat = ChatHistory(capacity=3)
+    for i in range(10):
+        chat.append(str(i))
+    assert len(chat) == 3
+    assert chat.recent(10) == ['7', '8', '9']
+    assert chat.recent(2) == ['8', '9']
+    assert chat.recent(0) == []
+
+
+def test_history_rejects_capacity_below_one():
+    with pytest.raises(ValueError):
+        ChatHistory(capacity=0)
+
+
+def test_history_survives_restart(tmp_path):
+    chat = ChatHistory(capacity=5, path=str(tmp_path))
+    chat.extend([f'сообщение {i}' for i in range(12)])
+    chat.close()
+    # На диске только два последних сегмента
+    assert len([name for name in os.listdir(tmp_path) if name.startswith('history.')]) == 2
+
+    chat = ChatHistory(capacity=5, path=str(tmp_path))
+    assert chat.recent(5) == [f'сообщение {i}' for i in range(7, 12)]
+    chat.append('после перезапуска')
+    chat.close()
+    assert ChatHistory(capacity=5, path=str(tmp_path)).recent(1) == ['после перезапуска']
+
+
+def test_history_torn_frame_is_truncated(tmp_path):
+    chat = ChatHistory(capacity=10, path=str(tmp_path))
+    chat.extend(['первое', 'второе'])
+    chat.close()
+    (segment,) = os.listdir(tmp_path)
+    path = os.path.join(tmp_path, segment)
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) - 3)
+
+    chat = ChatHistory(capacity=10, path=str(tmp_path))
+    assert chat.recent(10) == ['первое']
+    chat.append('третье')
+    chat.close()
+    assert ChatHistory(capacity=10, path=str(tmp_path)).recent(10) == ['первое', 'третье']
+
+
+def test_history_rejects_oversized_message(tmp_path):
+    """Сообщение, которое нельзя отправить кадром, не сохраняется ни в памяти, ни на диске"""
+    chat = ChatHistory(capacity=10, path=str(tmp_path))
+    chat.append('первое')
+    with pytest.raises(protocol.ProtocolError):
+        chat.extend(['второе', 'x' * (protocol.MAX_MESSAGE_SIZE + 1)])
+    assert chat.recent(10) == ['первое']
+    chat.close()
+    assert ChatHistory(capacity=10, path=str(tmp_path)).recent(10) == ['первое']
@@ -0,0 +1,103 @@
+import os
+import threading
+
+import pytest
+
+from conftest import import_task
+
+grades_store = import_task('task5', 'grades_store')
+LogGradesStore = grades_store.LogGradesStore
+
+
+def segment_files(path):
+    return sorted(name for name in os.listdir(path) if name.startswith('log.'))
+
+
+@pytest.mark.parametrize('commit', grades_store.COMMIT_MODES)
+def test_replay_after_restart(tmp_path, commit):
+    store = LogGradesStore(str(tmp_path), commit)
+    store.add('Математика', '5')
+    store.add('Физика', '4')
+    store.add('Математика', '3')
+    store.close()
+
+    store = LogGradesStore(str(tmp_path), commit)
+    assert store.snapshot() == {'Математика': ['5', '3'], 'Физика': ['4']}
+    # Новые записи продолжают последовательность после проигранных
+    store.add('Физика', '5')
+    store.close()
+    assert LogGradesStore(str(tmp_path)).get('Физика') == ['4', '5']
+
+
+def test_torn_tail_is_truncated(tmp_path):
+    """Оборванная последняя запись отбрасывается и отрезается с диска"""
+    store = LogGradesStore(str(tmp_path))
+    store.add('Математика', '5')
+    store.add('Физика', '4')
+    store.close()
+    (segment,) = segment_files(tmp_path)
+    path = os.path.join(tmp_path, segment)
+    whole = os.path.getsize(path)
+    with open(path, 'r+b') as f:
+        f.truncate(whole - 3)
+
+    store = LogGradesStore(str(tmp_path))
+    assert store.snapshot() == {'Математика': ['5']}
+    store.add('Химия', '5')
+    store.close()
+
+    assert LogGradesStore(str(tmp_path)).snapshot() == {'Математика': ['5'], 'Химия': ['5']}
+
+
+def test_corrupted_record_stops_replay(tmp_path):
+    """Запись с неверным CRC и всё после неё не проигрываются"""
+    store = LogGradesStore(str(tmp_path))
+    store.add('Математика', '5')
+    store.add('Физика', '4')
+    store.close()
+    (segment,) = segment_files(tmp_path)
+    path = os.path.join(tmp_path, segment)
+    with open(path, 'r+b') as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 0xFF]))
+
+    assert LogGradesStore(str(tmp_path)).snapshot() == {'Математика': ['5']}
+
+
+def test_snapshot_and_compaction(tmp_path):
+    store = LogGradesStore(str(tmp_path), snapshot_every=1000)
+    for i in range(10):
+        store.add(f'Дисциплина {i % 3}', str(i))
+    store.compact()
+    store.add('После снимка', '5')
+    store.close()
+
+    assert os.path.exists(os.path.join(tmp_path, 'snapshot'))
+    assert segment_files(tmp_path) == ['log.2']
+    restored = LogGradesStore(str(tmp_path)).snapshot()
+    assert restored['Дисциплина 0'] == ['0', '3', '6', '9']
+    assert restored['После снимка'] == ['5']
+
+
+def test_group_commit_shares_fsync(tmp_path):
+    store = LogGradesStore(str(tmp_path), 'group')
+    threads = [threading.Thread(target=lambda i=i: [store.add('Математика', f'{i}.{j}') for j in range(20)])
+               for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    store.close()
+    assert len(store.get('Математика')) == 160
+    assert 1 <= store.fsyncs <= 160
+    assert len(LogGradesStore(str(tmp_path)).get('Математика')) == 160
+
+
+def test_too_long_values_are_rejected(tmp_path):
+    store = LogGradesStore(str(tmp_path))
+    with pytest.raises(ValueError):
+        store.add('x' * 0x10000, '5')
+    store.close()
+    assert LogGradesStore(str(tmp_path)).snapshot() == {}
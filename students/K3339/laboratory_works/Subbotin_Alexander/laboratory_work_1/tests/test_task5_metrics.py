@@ -0,0 +1,61 @@
+import random
+
+from conftest import import_task
+
+metrics = import_task('task5', 'metrics')
+Histogram = metrics.Histogram
+
+
+def sample_values():
+    rng = random.Random(1)
+    values = list(range(0, 4096))
+    values += [1 << bits for bits in range(metrics.MAX_VALUE_BITS)]
+    values += [(1 << bits) - 1 for bits in range(1, metrics.MAX_VALUE_BITS + 1)]
+    values += [rng.randrange(metrics.MAX_VALUE) for _ in range(10_000)]
+    return values
+
+
+def test_bucket_bounds_contain_value():
+    """Значение не больше верхней границы своей корзины и больше границы предыдущей"""
+    for value in sample_values():
+        index = Histogram.index(value)
+        assert value <= Histogram.upper_bound(index)
+        if index:
+            assert value > Histogram.upper_bound(index - 1)
+
+
+def test_relative_error():
+    for value in sample_values():
+        bound = Histogram.upper_bound(Histogram.index(value))
+        assert bound - value <= max(1, value) / Histogram.HALF
+
+
+def test_bounds_are_increasing():
+    bounds = [Histogram.upper_bound(index) for index in range(Histogram.index(metrics.MAX_VALUE))]
+    assert bounds == sorted(set(bounds))
+
+
+def test_record_matches_index():
+    histogram = Histogram()
+    for value in sample_values():
+        # float в секундах может округлиться на микросекунду вниз
+        indexes = {Histogram.index(value), Histogram.index(max(0, value - 1))}
+        before = sum(histogram.counts[index] for index in indexes)
+        histogram.record(value / 1_000_000)
+        assert sum(histogram.counts[index] for index in indexes) == before + 1
+
+
+def test_huge_values_go_to_last_bucket():
+    histogram = Histogram()
+    histogram.record(metrics.MAX_VALUE * 4 / 1_000_000)
+    assert histogram.counts[-1] == 1
+
+
+def test_percentiles():
+    histogram = Histogram()
+    for value in range(1, 1001):
+        histogram.record(value / 1_000_000)
+    p50, p99, p100 = histogram.percentiles([0.5, 0.99, 1.0])
+    assert 500e-6 <= p50 <= 500e-6 * (1 + 1 / 64)
+    assert 990e-6 <= p99 <= 990e-6 * (1 + 1 / 64)
+    assert p100 == 1000e-6
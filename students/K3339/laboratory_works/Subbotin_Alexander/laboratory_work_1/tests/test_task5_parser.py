@@ -0,0 +1,117 @@
+import pytest
+
+from conftest import import_task
+
+server = import_task('task5', 'server')
+HTTPError = server.HTTPError
+RequestParser = server.RequestParser
+
+
+def post(body, path='/'):
+    return b'POST %s HTTP/1.1\r\nHost: x\r\nContent-Length: %d\r\n\r\n%s' % (path.encode(), len(body), body)
+
+
+def feed_bytewise(parser, data):
+    requests = []
+    for i in range(len(data)):
+        requests += parser.feed(data[i:i + 1])
+    return requests
+
+
+def test_pipelined_requests_in_one_chunk():
+    """Несколько запросов в одном куске разбираются по порядку"""
+    data = b'GET /a HTTP/1.1\r\n\r\n' + post(b'subject=Math&grade=5') + b'GET /b HTTP/1.0\r\n\r\n'
+    requests = RequestParser().feed(data)
+    assert [(req['method'], req['path']) for req in requests] == [('GET', '/a'), ('POST', '/'), ('GET', '/b')]
+    assert requests[1]['body'] == 'subject=Math&grade=5'
+    assert requests[2]['protocol'] == 'HTTP/1.0'
+
+
+def test_split_request_does_not_depend_on_chunking():
+    """Запрос, пришедший по байту, разбирается так же, как целиком"""
+    data = post('оценка=5'.encode('utf-8')) + b'GET / HTTP/1.1\r\nX-A: 1\r\nX-A: 2\r\n\r\n'
+    parser = RequestParser()
+    assert feed_bytewise(parser, data) == RequestParser().feed(data)
+    assert not parser.has_partial_request()
+
+
+def test_repeated_headers_are_joined():
+    (req,) = RequestParser().feed(b'GET / HTTP/1.1\r\nX-A: 1\r\nx-a: 2\r\n\r\n')
+    assert req['headers']['x-a'] == '1, 2'
+
+
+def test_partial_request_stays_in_buffer():
+    parser = RequestParser()
+    assert parser.feed(b'POST / HTTP/1.1\r\nContent-Length: 5\r\n\r\nab') == []
+    assert parser.has_partial_request()
+    (req,) = parser.feed(b'cde')
+    assert req['body'] == 'abcde'
+    assert not parser.has_partial_request()
+
+
+def test_chunked_body():
+    data = (b'POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n'
+            b'5;ext=1\r\nhello\r\n6 \r\n world\r\nA\r\n0123456789\r\n0\r\nX-Trailer: 1\r\n\r\n'
+            b'GET /next HTTP/1.1\r\n\r\n')
+    requests = feed_bytewise(RequestParser(), data)
+    assert requests[0]['body'] == 'hello world0123456789'
+    assert requests[1]['path'] == '/next'
+
+
+@pytest.mark.parametrize('size', [b'1_0', b' 5', b'+5', b'-5', b'0x5', b'\xd9\xa3', b''])
+def test_chunk_size_must_be_hex_digits(size):
+    data = b'POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n' + size + b'\r\n'
+    with pytest.raises(HTTPError) as err:
+        RequestParser().feed(data)
+    assert err.value.status.startswith('400')
+
+
+@pytest.mark.parametrize('length', ['²', '1_0', '+5', '-1', ' ', '٣'])
+def test_content_length_must_be_ascii_digits(length):
+    data = b'POST / HTTP/1.1\r\nContent-Length: ' + length.encode('utf-8') + b'\r\n\r\n'
+    with pytest.raises(HTTPError) as err:
+        RequestParser().feed(data)
+    assert err.value.status.startswith('400')
+
+
+def test_content_length_with_transfer_encoding_is_rejected():
+    data = b'POST / HTTP/1.1\r\nContent-Length: 5\r\nTransfer-Encoding: chunked\r\n\r\n'
+    with pytest.raises(HTTPError) as err:
+        RequestParser().feed(data)
+    assert err.value.status.startswith('400')
+
+
+def test_header_limit():
+    parser = RequestParser(max_header_size=1024)
+    with pytest.raises(HTTPError) as err:
+        parser.feed(b'GET / HTTP/1.1\r\nX-Big: ' + b'a' * 2048)
+    assert err.value.status.startswith('431')
+
+
+def test_body_limits():
+    parser = RequestParser(max_body_size=10)
+    with pytest.raises(HTTPError) as err:
+        parser.feed(b'POST / HTTP/1.1\r\nContent-Length: 11\r\n\r\n')
+    assert err.value.status.startswith('413')
+
+    chunked = b'POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n8\r\n12345678\r\n8\r\n'
+    with pytest.raises(HTTPError) as err:
+        RequestParser(max_body_size=10).feed(chunked)
+    assert err.value.status.startswith('413')
+
+
+def test_unsupported_version():
+    with pytest.raises(HTTPError) as err:
+        RequestParser().feed(b'GET / HTTP/2.0\r\n\r\n')
+    assert err.value.status.startswith('505')
+
+
+def test_error_after_pipelined_requests_is_deferred():
+    """Запросы перед некорректным возвращаются, ошибка поднимается после ответа на них"""
+    parser = RequestParser()
+    requests = parser.feed(b'GET /a HTTP/1.1\r\n\r\nGET /b HTTP/1.1\r\n\r\nBROKEN\r\n\r\n')
+    assert [req['path'] for req in requests] == ['/a', '/b']
+    with pytest.raises(HTTPError):
+        parser.raise_pending_error()
+    with pytest.raises(HTTPError):
+        parser.feed(b'GET / HTTP/1.1\r\n\r\n')
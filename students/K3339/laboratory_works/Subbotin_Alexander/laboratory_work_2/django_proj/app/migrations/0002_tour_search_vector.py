@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:00
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tour',
+            name='search_vector',
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=(
+                    django.contrib.postgres.search.SearchVector('title', config='simple', weight='A')
+                    + django.contrib.postgres.search.SearchVector('city', config='simple', weight='A')
+                    + django.contrib.postgres.search.SearchVector('agency', config='simple', weight='B')
+                    + django.contrib.postgres.search.SearchVector('description', config='simple', weight='C')
+                ),
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='tour',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='app_tour_search_vector_gin'),
+        ),
+    ]
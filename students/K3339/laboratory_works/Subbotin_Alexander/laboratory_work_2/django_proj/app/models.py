@@ -2,6 +2,13 @@ from django.db import models
 from django.conf import settings
 from django.utils import timezone
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+
+
+# 'simple' config: tours mix Russian, English and Japanese text,
+# words are matched by prefix without stemming (see TourListView).
+SEARCH_CONFIG = 'simple'
 
 
 class UserProfile(models.Model):
@@ -21,7 +28,22 @@ class Tour(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2)
     city = models.CharField(max_length=100)
     payment_terms = models.TextField(blank=True, null=True, help_text="Условия оплаты")
+    # Maintained by PostgreSQL on every insert/update
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('title', weight='A', config=SEARCH_CONFIG)
+            + SearchVector('city', weight='A', config=SEARCH_CONFIG)
+            + SearchVector('agency', weight='B', config=SEARCH_CONFIG)
+            + SearchVector('description', weight='C', config=SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
 
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='app_tour_search_vector_gin'),
+        ]
 
     def __str__(self):
         return f"{self.title} — {self.city} ({self.start_date} — {self.end_date})"
@@ -1,3 +1,5 @@
+import re
+
 from django.db import models
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy, reverse
@@ -8,11 +10,20 @@ from django.contrib.auth.decorators import login_required
 from django.db.models import Count, Sum
 from django.views.generic.edit import FormMixin
 from django.contrib import messages
+from django.contrib.postgres.search import SearchQuery, SearchRank
 
-from .models import Tour, Reservation
+from .models import Tour, Reservation, SEARCH_CONFIG
 from .forms import ReviewForm, RegisterForm, ProfileForm
 
 
+def build_search_query(text):
+    """Turn user input into a prefix tsquery ("париж & муз:*"), None if no words."""
+    words = re.findall(r'\w+', text.lower())
+    if not words:
+        return None
+    return SearchQuery(' & '.join(f'{word}:*' for word in words), search_type='raw', config=SEARCH_CONFIG)
+
+
 def register(request):
     if request.user.is_authenticated:
         return redirect('about')
@@ -73,13 +84,12 @@ class TourListView(ListView):
     def get_queryset(self):
         qs = super().get_queryset()
         q = self.request.GET.get('q')
-        if q:
-            qs = qs.filter(
-                models.Q(title__icontains=q) |
-                models.Q(agency__icontains=q) |
-                models.Q(city__icontains=q) |
-                models.Q(description__icontains=q)
-            )
+        query = build_search_query(q) if q else None
+        if query is not None:
+            # GIN index on search_vector, best matches first
+            return qs.filter(search_vector=query).annotate(
+                rank=SearchRank(models.F('search_vector'), query)
+            ).order_by('-rank', 'start_date')
         return qs.order_by('start_date')
     
 
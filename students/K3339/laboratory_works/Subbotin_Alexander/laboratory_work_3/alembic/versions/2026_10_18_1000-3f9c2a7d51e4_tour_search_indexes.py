@@ -0,0 +1,58 @@
+"""tour search indexes
+
+Adds the generated `tours.search_vector` column with its GIN index,
+a pg_trgm GIN index for ILIKE '%x%' city filters and the keyset
+pagination indexes.
+
+Tables are created by `init_db` on application startup, which runs after
+`alembic upgrade head` in docker-entrypoint.sh. On a fresh database this
+migration only installs the pg_trgm extension, create_all then builds the
+column and indexes from the model. On databases created before the search
+column existed it adds them in place.
+
+Revision ID: 3f9c2a7d51e4
+Revises:
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.db.models.tour import TOUR_SEARCH_VECTOR_SQL
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a7d51e4'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    if not _has_table("tours"):
+        return
+
+    op.execute(
+        "ALTER TABLE tours ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({TOUR_SEARCH_VECTOR_SQL}) STORED"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_tours_search_vector ON tours USING gin (search_vector)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_tours_city_trgm ON tours USING gin (city gin_trgm_ops)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_tours_start_date_id ON tours (start_date, id)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_tours_price_id ON tours (price, id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_tours_price_id")
+    op.execute("DROP INDEX IF EXISTS ix_tours_start_date_id")
+    op.execute("DROP INDEX IF EXISTS ix_tours_city_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_tours_search_vector")
+    op.execute("ALTER TABLE tours DROP COLUMN IF EXISTS search_vector")
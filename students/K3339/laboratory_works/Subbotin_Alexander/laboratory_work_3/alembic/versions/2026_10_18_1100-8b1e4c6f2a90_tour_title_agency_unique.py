@@ -0,0 +1,39 @@
+"""tour title/agency unique index
+
+Adds the unique `(title, agency)` index the bulk tours importer relies on
+for `INSERT ... ON CONFLICT DO NOTHING`. The previous importer already
+skipped existing (title, agency) pairs, duplicates can only come from
+tours created manually through the API; they have to be resolved before
+upgrading.
+
+Revision ID: 8b1e4c6f2a90
+Revises: 3f9c2a7d51e4
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b1e4c6f2a90'
+down_revision: Union[str, None] = '3f9c2a7d51e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    if not _has_table("tours"):
+        return
+
+    op.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_tours_title_agency ON tours (title, agency)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS uq_tours_title_agency")
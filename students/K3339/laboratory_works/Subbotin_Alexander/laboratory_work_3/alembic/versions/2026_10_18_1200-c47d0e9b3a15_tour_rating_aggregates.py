@@ -0,0 +1,58 @@
+"""tour rating aggregates
+
+Adds denormalized `tours.review_count` / `tours.rating_sum`, the generated
+`tours.average_rating` column and (column, id) indexes for sorting tours by
+rating. Existing reviews are counted once here; afterwards the review CRUD
+functions keep the columns up to date.
+
+Revision ID: c47d0e9b3a15
+Revises: 8b1e4c6f2a90
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.db.models.tour import TOUR_AVERAGE_RATING_SQL
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c47d0e9b3a15'
+down_revision: Union[str, None] = '8b1e4c6f2a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    if not _has_table("tours"):
+        return
+
+    op.execute("ALTER TABLE tours ADD COLUMN IF NOT EXISTS review_count integer NOT NULL DEFAULT 0")
+    op.execute("ALTER TABLE tours ADD COLUMN IF NOT EXISTS rating_sum integer NOT NULL DEFAULT 0")
+    if _has_table("reviews"):
+        op.execute(
+            "UPDATE tours SET review_count = r.review_count, rating_sum = r.rating_sum "
+            "FROM (SELECT tour_id, count(*) AS review_count, sum(rating) AS rating_sum "
+            "      FROM reviews GROUP BY tour_id) AS r "
+            "WHERE tours.id = r.tour_id"
+        )
+    op.execute(
+        "ALTER TABLE tours ADD COLUMN IF NOT EXISTS average_rating double precision "
+        f"GENERATED ALWAYS AS ({TOUR_AVERAGE_RATING_SQL}) STORED"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_tours_average_rating_id ON tours (average_rating, id)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_tours_review_count_id ON tours (review_count, id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_tours_review_count_id")
+    op.execute("DROP INDEX IF EXISTS ix_tours_average_rating_id")
+    op.execute("ALTER TABLE tours DROP COLUMN IF EXISTS average_rating")
+    op.execute("ALTER TABLE tours DROP COLUMN IF EXISTS rating_sum")
+    op.execute("ALTER TABLE tours DROP COLUMN IF EXISTS review_count")
@@ -4,8 +4,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 
 from app.core.database import get_async_session
-from app.core.settings.security import verify_password, create_access_token, decode_token, get_password_hash
+from app.core.settings.security import verify_password_async, create_access_token, decode_token
 from app.core.settings.config import settings
+from app.core.user_cache import user_cache
 from app.api.schemas import UserCreate, UserResponse, Token, UserProfileCreate, UserProfileResponse, UserUpdate, PasswordChange
 from app.core.db import crud
 
@@ -32,10 +33,18 @@ async def get_current_user(
     if username is None:
         raise credentials_exception
     
+    if settings.USER_CACHE_ENABLED:
+        cached_user = await user_cache.get(username)
+        if cached_user is not None:
+            return cached_user
+        generation = user_cache.generation(username)
+    
     user = await crud.get_user_by_username(db, username=username)
     if user is None:
         raise credentials_exception
     
+    if settings.USER_CACHE_ENABLED:
+        return await user_cache.set(user, generation)
     return user
 
 
@@ -104,7 +113,7 @@ async def login(
     - **password**: пароль
     """
     user = await crud.get_user_by_username(db, username=form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -219,8 +228,9 @@ async def change_password(
     """
     Смена пароля текущего пользователя.
     """
-    # Проверяем текущий пароль
-    if not verify_password(password_data.current_password, current_user.hashed_password):
+    # Проверяем текущий пароль; хеш не хранится в кеше пользователей
+    user = await crud.get_user_by_id(db, current_user.id)
+    if not user or not await verify_password_async(password_data.current_password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
@@ -234,3 +244,30 @@ async def change_password(
     )
     
     return {"message": "Password changed successfully"}
+
+
+@router.put("/users/{user_id}/admin", response_model=UserResponse)
+async def set_user_admin(
+    user_id: int,
+    is_admin: bool,
+    db: AsyncSession = Depends(get_async_session),
+    current_admin = Depends(get_current_admin)
+):
+    """
+    [ADMIN] Выдача или снятие прав администратора.
+    
+    - **is_admin**: новое значение флага администратора
+    """
+    if user_id == current_admin.id and not is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="You cannot revoke your own admin rights"
+        )
+    
+    user = await crud.update_user_admin(db, user_id=user_id, is_admin=is_admin)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    return user
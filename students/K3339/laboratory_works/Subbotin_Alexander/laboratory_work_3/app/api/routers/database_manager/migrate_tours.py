@@ -5,6 +5,7 @@ from fastapi import Depends, status
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.schemas.database import MigrationPipelineParams
 from app.core.database import get_async_session
 from app.core.db.services import migrate_tours
 from . import database_manage_router
@@ -18,15 +19,23 @@ logger = logging.getLogger(__name__)
     summary="Запустить миграцию туров"
 )
 async def migrate_tours_endpoint(
+        params: MigrationPipelineParams = Depends(),
         db: AsyncSession = Depends(get_async_session),
 ) -> JSONResponse:
     """
-    Migrates tours from JSON files to the database.
+    Migrates tours from JSON (array or NDJSON) files to the database.
+    :param params: Migration limit and whether to clear the database first.
     :param db: Async SQLAlchemy-session.
     """
-    result = None
     try:
-        result = await migrate_tours(db=db)
-        return JSONResponse({"message": f"Successfully processed {result} tours."})
+        report = await migrate_tours(
+            db=db,
+            migration_limit=params.migration_limit,
+            clear_database_first=params.clear_database_first,
+        )
+        return JSONResponse({
+            "message": f"Successfully processed {report.processed} tours.",
+            **report.to_dict(),
+        })
     except ValueError as error:
         return JSONResponse({"error": str(error)}, status_code=status.HTTP_400_BAD_REQUEST)
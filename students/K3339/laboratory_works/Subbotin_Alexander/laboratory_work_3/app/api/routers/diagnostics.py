@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends
+
+from app.api.schemas import PoolStatus, UserCacheStats
+from app.api.routers.auth import get_current_admin
+from app.core.database import get_pool_status
+from app.core.user_cache import user_cache
+
+router = APIRouter(prefix="/diagnostics", tags=["Diagnostics"])
+
+
+@router.get("/db-pool", response_model=PoolStatus)
+async def db_pool_status(
+    current_user = Depends(get_current_admin)
+):
+    """
+    [ADMIN] Состояние пула соединений с базой данных.
+    
+    - **checked_out**: соединения, выданные запросам прямо сейчас
+    - **overflow**: соединения сверх pool_size
+    - **avg_wait_ms / max_wait_ms**: время ожидания свободного соединения
+    - **timeouts**: запросы, не дождавшиеся соединения за pool_timeout
+    """
+    return get_pool_status()
+
+
+@router.get("/user-cache", response_model=UserCacheStats)
+async def user_cache_stats(
+    current_user = Depends(get_current_admin)
+):
+    """
+    [ADMIN] Счётчики кеша авторизованных пользователей.
+    
+    - **hit_rate**: доля запросов, обслуженных без обращения к БД
+    - **evictions**: записи, вытесненные по LRU при переполнении
+    - **expirations**: записи, удалённые по истечении TTL
+    - **invalidations**: явные сбросы при изменении пользователя
+    """
+    return user_cache.stats()
@@ -3,13 +3,45 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from app.core.database import get_async_session
-from app.api.schemas import ReservationCreate, ReservationUpdate, ReservationWithTour, ReservationWithTourAndUser, AdminStats
+from app.api.schemas import (
+    ReservationCreate,
+    ReservationUpdate,
+    ReservationWithTour,
+    ReservationWithTourAndUser,
+    ReservationBulkStatusUpdate,
+    ReservationBulkStatusResult,
+    AdminStats,
+    TourSalesStats,
+    CitySalesStats,
+)
 from app.core.db import crud
 from app.api.routers.auth import get_current_user, get_current_admin
 
 router = APIRouter(prefix="/reservations", tags=["Reservations"])
 
 
+async def _get_own_reservation(db: AsyncSession, reservation_id: int, user_id: int, action: str):
+    """
+    Load a reservation of the current user or raise 404/403.
+
+    Write endpoints check ownership in the WHERE clause of their statement;
+    this extra query only runs when that statement matched nothing, to
+    report the reason.
+    """
+    reservation = await crud.get_reservation_by_id(db, reservation_id)
+    if not reservation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Reservation not found"
+        )
+    if reservation.user_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Not authorized to {action} this reservation"
+        )
+    return reservation
+
+
 @router.post("/", response_model=ReservationWithTour, status_code=status.HTTP_201_CREATED)
 async def create_reservation(
     reservation_data: ReservationCreate,
@@ -24,32 +56,23 @@ async def create_reservation(
     - **tour_id**: ID тура для бронирования
     - **notes**: дополнительные заметки
     """
-    # Проверяем, существует ли тур
-    tour = await crud.get_tour_by_id(db, reservation_data.tour_id)
-    if not tour:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Tour not found"
-        )
-    
-    # Проверяем, не бронировал ли пользователь уже этот тур
-    existing_reservation = await crud.get_user_reservation_for_tour(
-        db, user_id=current_user.id, tour_id=reservation_data.tour_id
-    )
-    if existing_reservation:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="You have already booked this tour"
-        )
-    
     reservation = await crud.create_reservation(
         db, 
         user_id=current_user.id,
         reservation_data=reservation_data.model_dump()
     )
-    
-    # Перезагружаем с tour
-    reservation = await crud.get_reservation_by_id(db, reservation.id)
+    if not reservation:
+        # Тур не найден или уже забронирован - уточняем причину
+        tour = await crud.get_tour_by_id(db, reservation_data.tour_id)
+        if not tour:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Tour not found"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="You have already booked this tour"
+        )
     return reservation
 
 
@@ -115,27 +138,18 @@ async def update_reservation(
     
     Пользователь может обновлять только свои бронирования.
     """
-    reservation = await crud.get_reservation_by_id(db, reservation_id)
-    if not reservation:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Reservation not found"
-        )
-    
-    if reservation.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to update this reservation"
-        )
+    update_data = {k: v for k, v in reservation_data.model_dump(exclude_unset=True).items() if v is not None}
+    if not update_data:
+        return await _get_own_reservation(db, reservation_id, current_user.id, action="access")
     
     updated_reservation = await crud.update_reservation(
         db, 
         reservation_id,
-        reservation_data.model_dump(exclude_unset=True)
+        update_data,
+        user_id=current_user.id
     )
-    
-    # Перезагружаем с tour
-    updated_reservation = await crud.get_reservation_by_id(db, reservation_id)
+    if not updated_reservation:
+        await _get_own_reservation(db, reservation_id, current_user.id, action="update")
     return updated_reservation
 
 
@@ -151,30 +165,14 @@ async def delete_reservation(
     Пользователь может удалять только свои бронирования со статусом "ожидает".
     Нельзя удалять подтвержденные или отклоненные бронирования.
     """
-    reservation = await crud.get_reservation_by_id(db, reservation_id)
-    if not reservation:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Reservation not found"
-        )
-    
-    if reservation.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to delete this reservation"
-        )
-    
-    # Проверяем статус - можно удалить только ожидающие брони
-    if reservation.status != 'pending':
+    deleted = await crud.delete_reservation(db, reservation_id, user_id=current_user.id, status='pending')
+    if not deleted:
+        await _get_own_reservation(db, reservation_id, current_user.id, action="delete")
+        # Проверяем статус - можно удалить только ожидающие брони
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot delete confirmed or rejected reservations"
         )
-    
-    await crud.delete_reservation(db, reservation_id)
-    return None
-    
-    await crud.delete_reservation(db, reservation_id)
     return None
 
 
@@ -221,20 +219,12 @@ async def confirm_reservation(
     """
     [ADMIN] Подтверждение бронирования.
     """
-    reservation = await crud.get_reservation_by_id(db, reservation_id)
-    if not reservation:
+    updated_reservation = await crud.update_reservation(db, reservation_id, {"status": "confirmed"})
+    if not updated_reservation:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Reservation not found"
         )
-    
-    updated_reservation = await crud.update_reservation(
-        db, 
-        reservation_id,
-        {"status": "confirmed"}
-    )
-    
-    updated_reservation = await crud.get_reservation_by_id(db, reservation_id)
     return updated_reservation
 
 
@@ -247,21 +237,35 @@ async def reject_reservation(
     """
     [ADMIN] Отклонение бронирования.
     """
-    reservation = await crud.get_reservation_by_id(db, reservation_id)
-    if not reservation:
+    updated_reservation = await crud.update_reservation(db, reservation_id, {"status": "rejected"})
+    if not updated_reservation:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Reservation not found"
         )
+    return updated_reservation
+
+
+@router.post("/admin/bulk", response_model=ReservationBulkStatusResult)
+async def bulk_update_reservation_status(
+    bulk_data: ReservationBulkStatusUpdate,
+    db: AsyncSession = Depends(get_async_session),
+    current_user = Depends(get_current_admin)
+):
+    """
+    [ADMIN] Массовое изменение статуса бронирований одним запросом.
     
-    updated_reservation = await crud.update_reservation(
-        db, 
-        reservation_id,
-        {"status": "rejected"}
-    )
+    - **ids**: ID бронирований (до 5000)
+    - **status**: новый статус (pending/confirmed/rejected)
     
-    updated_reservation = await crud.get_reservation_by_id(db, reservation_id)
-    return updated_reservation
+    Для каждого ID возвращается результат: updated, unchanged (статус уже такой)
+    или not_found.
+    """
+    results = await crud.bulk_update_reservation_status(db, bulk_data.ids, bulk_data.status)
+    counts = {"updated": 0, "unchanged": 0, "not_found": 0}
+    for item in results:
+        counts[item["result"]] += 1
+    return {"status": bulk_data.status, **counts, "results": results}
 
 
 @router.get("/admin/stats", response_model=AdminStats)
@@ -276,6 +280,48 @@ async def get_admin_stats(
     - confirmed_reservations: количество подтверждённых бронирований
     - total_revenue: общая сумма выручки
     - total_customers: количество уникальных клиентов
+    
+    Значения читаются из таблицы `sales_stats`, которая обновляется при
+    подтверждении/отмене бронирований.
     """
     stats = await crud.get_admin_stats(db)
     return stats
+
+
+@router.get("/admin/stats/tours", response_model=List[TourSalesStats])
+async def get_tour_sales_stats(
+    limit: int = Query(100, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_session),
+    current_user = Depends(get_current_admin)
+):
+    """
+    [ADMIN] Статистика продаж по турам (по убыванию выручки).
+    
+    - **limit**: количество туров на странице
+    - **offset**: смещение для пагинации
+    """
+    return await crud.get_tour_sales_stats(db, limit=limit, offset=offset)
+
+
+@router.get("/admin/stats/cities", response_model=List[CitySalesStats])
+async def get_city_sales_stats(
+    db: AsyncSession = Depends(get_async_session),
+    current_user = Depends(get_current_admin)
+):
+    """
+    [ADMIN] Статистика продаж по городам (по убыванию выручки).
+    """
+    return await crud.get_city_sales_stats(db)
+
+
+@router.post("/admin/stats/reconcile", response_model=AdminStats)
+async def reconcile_sales_stats(
+    db: AsyncSession = Depends(get_async_session),
+    current_user = Depends(get_current_admin)
+):
+    """
+    [ADMIN] Пересчёт статистики продаж по таблице бронирований.
+    """
+    stats = await crud.reconcile_sales_stats(db)
+    return AdminStats.model_validate(stats, from_attributes=True)
@@ -1,14 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import List, Optional, Literal
 
 from app.core.database import get_async_session
+from app.core.pagination import encode_cursor, decode_cursor
 from app.api.schemas import TourCreate, TourUpdate, TourResponse
 from app.core.db import crud
 from app.api.routers.auth import get_current_user, get_current_admin
 
 router = APIRouter(prefix="/tours", tags=["Tours"])
 
+TourSort = Literal[
+    "start_date", "-start_date", "price", "-price",
+    "rating", "-rating", "review_count", "-review_count", "id", "-id",
+]
+
 
 @router.post("/", response_model=TourResponse, status_code=status.HTTP_201_CREATED)
 async def create_tour(
@@ -28,25 +35,84 @@ async def create_tour(
     - **city**: город
     - **payment_terms**: условия оплаты (опционально)
     """
-    tour = await crud.create_tour(db, tour_data.model_dump())
+    try:
+        tour = await crud.create_tour(db, tour_data.model_dump())
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Tour with this title and agency already exists"
+        )
     return tour
 
 
 @router.get("/", response_model=List[TourResponse])
 async def get_tours(
+    response: Response,
     limit: int = Query(100, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы (из заголовка X-Next-Cursor)"),
+    sort: TourSort = Query("start_date", description="Ключ сортировки, '-' - по убыванию"),
     city: Optional[str] = Query(None, description="Фильтр по городу"),
     db: AsyncSession = Depends(get_async_session)
 ):
     """
     Получение списка всех туров с пагинацией и фильтрацией.
     
+    - **limit**: количество туров на странице (1-100)
+    - **offset**: смещение для пагинации (устаревший режим, медленный на глубоких страницах)
+    - **cursor**: курсор следующей страницы; сортировка берётся из курсора
+    - **sort**: ключ сортировки (start_date, price, rating, review_count, id; с префиксом '-' - по убыванию),
+      `-rating` - самые высоко оценённые туры
+    - **city**: фильтр по городу (опционально)
+    
+    Если есть следующая страница, её курсор возвращается в заголовке `X-Next-Cursor`.
+    """
+    after = None
+    if cursor:
+        if offset:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="cursor and offset cannot be used together"
+            )
+        try:
+            sort, after = decode_cursor(cursor)
+            if sort not in crud.TOUR_SORT_KEYS:
+                raise ValueError(f"Unknown sort key: {sort}")
+            tours = await crud.get_tours(db, limit=limit, city=city, sort=sort, after=after)
+        except (ValueError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    else:
+        tours = await crud.get_tours(db, limit=limit, offset=offset, city=city, sort=sort)
+
+    if len(tours) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(sort, crud.tour_sort_values(tours[-1], sort))
+    return tours
+
+
+@router.get("/search", response_model=List[TourResponse])
+async def search_tours(
+    q: str = Query(..., min_length=1, max_length=200, description="Поисковый запрос"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    city: Optional[str] = Query(None, description="Фильтр по городу"),
+    db: AsyncSession = Depends(get_async_session)
+):
+    """
+    Полнотекстовый поиск туров с ранжированием по релевантности.
+    
+    Ищет по названию, городу, агентству и описанию; слова запроса
+    сопоставляются по префиксу.
+    
+    - **q**: поисковый запрос
     - **limit**: количество туров на странице (1-100)
     - **offset**: смещение для пагинации
     - **city**: фильтр по городу (опционально)
     """
-    tours = await crud.get_tours(db, limit=limit, offset=offset, city=city)
+    tours = await crud.search_tours(db, q, limit=limit, offset=offset, city=city)
     return tours
 
 
@@ -79,7 +145,14 @@ async def update_tour(
     
     Можно обновить любые поля тура.
     """
-    tour = await crud.update_tour(db, tour_id, tour_data.model_dump(exclude_unset=True))
+    try:
+        tour = await crud.update_tour(db, tour_id, tour_data.model_dump(exclude_unset=True))
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Tour with this title and agency already exists"
+        )
     if not tour:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
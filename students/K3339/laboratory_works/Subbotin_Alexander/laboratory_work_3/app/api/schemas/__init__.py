@@ -31,7 +31,12 @@ from app.api.schemas.reservation import (
     ReservationResponse,
     ReservationWithTour,
     ReservationWithTourAndUser,
+    ReservationBulkStatusUpdate,
+    ReservationBulkItemResult,
+    ReservationBulkStatusResult,
     AdminStats,
+    TourSalesStats,
+    CitySalesStats,
 )
 from app.api.schemas.review import (
     ReviewBase,
@@ -40,6 +45,10 @@ from app.api.schemas.review import (
     ReviewResponse,
     ReviewWithUser,
 )
+from app.api.schemas.diagnostics import (
+    PoolStatus,
+    UserCacheStats,
+)
 
 __all__ = [
     # User schemas
@@ -68,6 +77,13 @@ __all__ = [
     "ReservationUpdate",
     "ReservationResponse",
     "ReservationWithTour",
+    "ReservationWithTourAndUser",
+    "ReservationBulkStatusUpdate",
+    "ReservationBulkItemResult",
+    "ReservationBulkStatusResult",
+    "AdminStats",
+    "TourSalesStats",
+    "CitySalesStats",
     
     # Review schemas
     "ReviewBase",
@@ -75,4 +91,8 @@ __all__ = [
     "ReviewUpdate",
     "ReviewResponse",
     "ReviewWithUser",
+    
+    # Diagnostics schemas
+    "PoolStatus",
+    "UserCacheStats",
 ]
@@ -4,9 +4,9 @@ from pydantic import BaseModel, Field
 class MigrationPipelineParams(BaseModel):
     """Parameters schema for migration pipeline"""
     clear_database_first: bool = Field(
-        True,
+        False,
         description="Нужно ли очистить базу перед запуском миграции",
-        json_schema_extra={"example": True},
+        json_schema_extra={"example": False},
     )
     migration_limit: int = Field(
         10_000,
@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class PoolStatus(BaseModel):
+    """Database connection pool state"""
+    pool_size: int
+    max_overflow: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    timeout_seconds: float
+    checkouts: int
+    timeouts: int
+    avg_wait_ms: float
+    max_wait_ms: float
+
+
+class UserCacheStats(BaseModel):
+    """Authenticated user cache counters"""
+    size: int
+    maxsize: int
+    ttl_seconds: float
+    shared_backend: Optional[str] = None
+    hits: int
+    shared_hits: int
+    misses: int
+    hit_rate: float
+    evictions: int
+    expirations: int
+    invalidations: int
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, conint
 from datetime import datetime
-from typing import Optional, Literal
+from typing import List, Optional, Literal
 
 
 class ReservationBase(BaseModel):
@@ -47,6 +47,32 @@ class ReservationWithTourAndUser(ReservationWithTour):
         from_attributes = True
 
 
+RESERVATION_BULK_MAX_IDS = 5000
+# reservations.id is an int4 column
+RESERVATION_MAX_ID = 2**31 - 1
+
+
+class ReservationBulkStatusUpdate(BaseModel):
+    """Schema for bulk status change by admin"""
+    ids: List[conint(ge=1, le=RESERVATION_MAX_ID)] = Field(..., min_length=1, max_length=RESERVATION_BULK_MAX_IDS)
+    status: Literal['pending', 'confirmed', 'rejected']
+
+
+class ReservationBulkItemResult(BaseModel):
+    id: int
+    result: Literal['updated', 'unchanged', 'not_found']
+    previous_status: Optional[str] = None
+
+
+class ReservationBulkStatusResult(BaseModel):
+    """Per-id results of a bulk status change"""
+    status: str
+    updated: int
+    unchanged: int
+    not_found: int
+    results: List[ReservationBulkItemResult]
+
+
 class AdminStats(BaseModel):
     """Statistics for admin panel"""
     confirmed_reservations: int
@@ -54,6 +80,29 @@ class AdminStats(BaseModel):
     total_customers: int
 
 
+class TourSalesStats(BaseModel):
+    """Per-tour sales breakdown for admin panel"""
+    tour_id: int
+    title: str
+    city: str
+    confirmed_reservations: int
+    revenue: float
+
+    class Config:
+        from_attributes = True
+
+
+class CitySalesStats(BaseModel):
+    """Per-city sales breakdown for admin panel"""
+    city: str
+    tours: int
+    confirmed_reservations: int
+    revenue: float
+
+    class Config:
+        from_attributes = True
+
+
 from app.api.schemas.tour import TourResponse
 ReservationWithTour.model_rebuild()
 ReservationWithTourAndUser.model_rebuild()
@@ -31,6 +31,8 @@ class TourUpdate(BaseModel):
 
 class TourResponse(TourBase):
     id: int
+    review_count: int = 0
+    average_rating: float = Field(0.0, description="Средняя оценка (0 - нет отзывов)")
 
     class Config:
         from_attributes = True
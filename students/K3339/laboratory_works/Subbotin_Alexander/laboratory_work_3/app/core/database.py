@@ -1,14 +1,119 @@
 import logging
+import threading
+import time
+from sqlalchemy import exc, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from typing import AsyncGenerator, Any
 from app.core.settings.config import settings
 
 logger = logging.getLogger(__name__)
 
+
+class PoolWaitStats:
+    """
+    Accumulates time spent waiting for a pooled connection and, separately,
+    time spent opening new ones.
+
+    Checkouts happen from the event loop and from greenlet-spawned sync
+    code, so updates are guarded by a lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.timeouts = 0
+        self.connects = 0
+        self.connect_errors = 0
+        self.total_connect = 0.0
+        self.max_connect = 0.0
+
+    def record(self, wait: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def record_connect(self, elapsed: float, failed: bool = False):
+        with self._lock:
+            if failed:
+                self.connect_errors += 1
+                return
+            self.connects += 1
+            self.total_connect += elapsed
+            self.max_connect = max(self.max_connect, elapsed)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+                "connects": self.connects,
+                "connect_errors": self.connect_errors,
+                "avg_connect_ms": round(self.total_connect / self.connects * 1000, 3) if self.connects else 0.0,
+                "max_connect_ms": round(self.max_connect * 1000, 3),
+            }
+
+
+pool_wait_stats = PoolWaitStats()
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that records how long each checkout waited.
+
+    When the pool opens an overflow connection inside the checkout, the
+    connect time is recorded on its own and not counted as waiting. Only
+    the pool's TimeoutError counts as a timeout; connection errors are
+    counted as connect_errors.
+    """
+
+    def _create_connection(self):
+        started = time.perf_counter()
+        try:
+            record = super()._create_connection()
+        except Exception:
+            pool_wait_stats.record_connect(time.perf_counter() - started, failed=True)
+            raise
+        elapsed = time.perf_counter() - started
+        pool_wait_stats.record_connect(elapsed)
+        # Read back (once) by _do_get of the checkout that created it
+        record._connect_seconds = elapsed
+        return record
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            pool_wait_stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        connect = conn.__dict__.pop("_connect_seconds", 0.0)
+        pool_wait_stats.record(time.perf_counter() - started - connect)
+        return conn
+
+
 engine = create_async_engine(
     settings.DATABASE_URL,
-    echo=True,
-    future=True
+    echo=settings.DB_ECHO,
+    future=True,
+    poolclass=InstrumentedAsyncPool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    connect_args={"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
 )
 
 async_session_local = async_sessionmaker(
@@ -18,6 +123,26 @@ async_session_local = async_sessionmaker(
 )
 
 
+def get_pool_status() -> dict:
+    """
+    Current connection pool state for diagnostics.
+
+    Returns:
+        dict: Pool configuration, checked-out/overflow counters and
+              checkout wait statistics
+    """
+    pool = engine.pool
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "timeout_seconds": pool.timeout(),
+        **pool_wait_stats.snapshot(),
+    }
+
+
 async def get_async_session() -> AsyncGenerator[AsyncSession, Any]:
     """
     Dependency for getting async database session.
@@ -42,9 +167,12 @@ async def init_db():
     from app.core.db.models.tour import Tour
     from app.core.db.models.reservation import Reservation
     from app.core.db.models.review import Review
+    from app.core.db.models.sales_stats import SalesStats, TourSalesStats, CustomerSalesStats
     
     logger.info("Creating database tables...")
     async with engine.begin() as conn:
+        # Trigram operator classes used by tour indexes
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
     logger.info("Database tables created successfully")
@@ -9,12 +9,13 @@ All CRUD functions are organized by model type (user, tour, reservation, review)
 from app.core.db.crud.user.create_user import create_user
 from app.core.db.crud.user.get_user import get_user_by_id, get_user_by_username, get_user_by_email
 from app.core.db.crud.user.profile import create_user_profile, get_user_profile, update_user_profile
-from app.core.db.crud.user.update_user import update_user, update_user_password
+from app.core.db.crud.user.update_user import update_user, update_user_password, update_user_admin
 
 # Tour CRUD operations
 from app.core.db.crud.tour.create_tour import create_tour
 from app.core.db.crud.tour.get_tour import get_tour_by_id
-from app.core.db.crud.tour.get_all_tours import get_all_tours
+from app.core.db.crud.tour.get_all_tours import get_all_tours, tour_sort_values, TOUR_SORT_KEYS
+from app.core.db.crud.tour.search_tours import search_tours
 from app.core.db.crud.tour.update_tour import update_tour
 from app.core.db.crud.tour.delete_tour import delete_tour
 
@@ -27,8 +28,14 @@ from app.core.db.crud.reservation.get_confirmed_reservation import get_confirmed
 from app.core.db.crud.reservation.get_user_reservation_for_tour import get_user_reservation_for_tour
 from app.core.db.crud.reservation.get_admin_stats import get_admin_stats
 from app.core.db.crud.reservation.update_reservation import update_reservation
+from app.core.db.crud.reservation.bulk_update_reservation_status import bulk_update_reservation_status
 from app.core.db.crud.reservation.delete_reservation import delete_reservation
 
+# Sales stats operations
+from app.core.db.crud.sales_stats.apply_sales_deltas import apply_sales_deltas, apply_tour_price_change
+from app.core.db.crud.sales_stats.reconcile_sales_stats import reconcile_sales_stats
+from app.core.db.crud.sales_stats.get_sales_stats import get_tour_sales_stats, get_city_sales_stats
+
 # Review CRUD operations
 from app.core.db.crud.review.create_review import create_review
 from app.core.db.crud.review.get_review import get_review_by_id
@@ -52,12 +59,16 @@ __all__ = [
     "update_user_profile",
     "update_user",
     "update_user_password",
+    "update_user_admin",
     
     # Tour operations
     "create_tour",
     "get_tour_by_id",
     "get_all_tours",
     "get_tours",  # alias
+    "tour_sort_values",
+    "TOUR_SORT_KEYS",
+    "search_tours",
     "update_tour",
     "delete_tour",
     
@@ -71,8 +82,16 @@ __all__ = [
     "get_user_reservation_for_tour",
     "get_admin_stats",
     "update_reservation",
+    "bulk_update_reservation_status",
     "delete_reservation",
     
+    # Sales stats operations
+    "apply_sales_deltas",
+    "apply_tour_price_change",
+    "reconcile_sales_stats",
+    "get_tour_sales_stats",
+    "get_city_sales_stats",
+    
     # Review operations
     "create_review",
     "get_review_by_id",
@@ -0,0 +1,76 @@
+import logging
+from sqlalchemy import select, update, any_, literal, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db.models.reservation import Reservation
+from app.core.db.models.tour import Tour
+from app.core.db.crud.sales_stats.apply_sales_deltas import apply_sales_deltas, status_delta
+
+logger = logging.getLogger(__name__)
+
+
+async def bulk_update_reservation_status(db: AsyncSession, reservation_ids: list[int], status: str) -> list[dict]:
+    """
+    Set the status of many reservations with one set-based statement.
+
+    The ids are sent as a single array parameter. One statement locks the
+    matching rows, updates those whose status differs and reports every
+    requested id; the sales stats are adjusted in the same transaction.
+
+    Args:
+        db: Async SQLAlchemy session
+        reservation_ids: Reservation IDs to update (duplicates are ignored)
+        status: Target status ('pending', 'confirmed' or 'rejected')
+
+    Returns:
+        list[dict]: One item per unique id, in request order:
+        {"id", "result": "updated" | "unchanged" | "not_found", "previous_status"}
+
+    Example:
+        >>> results = await bulk_update_reservation_status(db, [1, 2, 999], "confirmed")
+        >>> [r["result"] for r in results]
+        ['updated', 'unchanged', 'not_found']
+    """
+    ids = list(dict.fromkeys(reservation_ids))
+    logger.info(f"Bulk updating {len(ids)} reservations to status: {status}")
+
+    # Rows are locked in id order, so overlapping bulk updates cannot deadlock
+    old = (
+        select(Reservation.id, Reservation.status.label("old_status"))
+        .where(Reservation.id == any_(literal(ids, ARRAY(Integer))))
+        .order_by(Reservation.id)
+        .with_for_update()
+        .cte("old")
+    )
+    updated = (
+        update(Reservation)
+        .where(Reservation.id == old.c.id, Reservation.tour_id == Tour.id, old.c.old_status != status)
+        .values(status=status)
+        .returning(Reservation.id, Reservation.tour_id, Reservation.user_id, Tour.price)
+        .cte("updated")
+    )
+    stmt = (
+        select(old.c.id, old.c.old_status, updated.c.tour_id, updated.c.user_id, updated.c.price)
+        .outerjoin(updated, updated.c.id == old.c.id)
+    )
+    rows = {row.id: row for row in (await db.execute(stmt)).all()}
+
+    changes = [
+        (row.tour_id, row.user_id, row.price, status_delta(row.old_status, status))
+        for row in rows.values() if row.tour_id is not None
+    ]
+    await apply_sales_deltas(db, changes)
+    await db.commit()
+
+    results = []
+    for reservation_id in ids:
+        row = rows.get(reservation_id)
+        if row is None:
+            results.append({"id": reservation_id, "result": "not_found", "previous_status": None})
+        else:
+            result = "updated" if row.tour_id is not None else "unchanged"
+            results.append({"id": reservation_id, "result": result, "previous_status": row.old_status})
+
+    logger.info(f"Bulk update to {status}: {len(changes)} updated, {len(ids) - len(rows)} not found")
+    return results
@@ -1,37 +1,73 @@
 import logging
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import select, insert, exists, literal
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.core.db.models.reservation import Reservation
+from app.core.db.models.tour import Tour
+from app.core.db.crud.sales_stats.apply_sales_deltas import apply_sales_deltas
 
 logger = logging.getLogger(__name__)
 
 
-async def create_reservation(db: AsyncSession, user_id: int, reservation_data: dict) -> Reservation:
+async def create_reservation(db: AsyncSession, user_id: int, reservation_data: dict) -> Optional[Reservation]:
     """
     Create a new reservation for a user.
+
+    One INSERT ... SELECT FROM tours statement checks that the tour exists
+    and that the user has no reservation for it yet; the tour is then
+    loaded from the same transaction, so the result can be serialized with
+    its tour without reloading.
     
     Args:
         db: Async SQLAlchemy session
         user_id: ID of the user making the reservation
-        reservation_data: Dictionary containing reservation information (tour_id, guests, notes, confirmed)
+        reservation_data: Dictionary containing reservation information (tour_id, notes, status)
     
     Returns:
-        Reservation: Created reservation instance
+        Optional[Reservation]: Created reservation with tour loaded, None if the
+        tour does not exist or the user already has a reservation for it
         
     Example:
         >>> reservation_data = {
         ...     "tour_id": 1,
-        ...     "guests": 2,
         ...     "notes": "Need vegetarian meals",
-        ...     "confirmed": False
         ... }
         >>> reservation = await create_reservation(db, user_id=5, reservation_data=reservation_data)
-        >>> print(f"Reservation {reservation.id} created for {reservation.guests} guests")
+        >>> if reservation:
+        ...     print(f"Reservation {reservation.id} created for {reservation.tour.title}")
     """
     logger.info(f"Creating reservation for user ID: {user_id}")
-    reservation = Reservation(user_id=user_id, **reservation_data)
-    db.add(reservation)
+    tour_id = reservation_data["tour_id"]
+    status = reservation_data.get("status") or 'pending'
+
+    already_booked = exists().where(Reservation.user_id == user_id, Reservation.tour_id == tour_id)
+    source = (
+        select(
+            Tour.id,
+            literal(user_id),
+            literal(reservation_data.get("notes"), Reservation.notes.type),
+            literal(status),
+            literal(datetime.utcnow()),
+        )
+        .where(Tour.id == tour_id, ~already_booked)
+    )
+    stmt = (
+        insert(Reservation)
+        .from_select(["tour_id", "user_id", "notes", "status", "created_at"], source)
+        .returning(Reservation)
+    )
+    reservation = (await db.execute(stmt)).scalar_one_or_none()
+    if reservation is None:
+        logger.warning(f"Reservation not created: tour {tour_id} not found or already booked by user {user_id}")
+        return None
+
+    tour = await db.get(Tour, tour_id)
+    set_committed_value(reservation, "tour", tour)
+    if reservation.status == 'confirmed':
+        await apply_sales_deltas(db, [(tour_id, user_id, tour.price, 1)])
     await db.commit()
-    await db.refresh(reservation)
     logger.info(f"Reservation created successfully (ID: {reservation.id})")
     return reservation
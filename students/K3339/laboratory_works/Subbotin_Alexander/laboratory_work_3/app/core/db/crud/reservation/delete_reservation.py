@@ -1,25 +1,39 @@
 import logging
+from typing import Optional
 from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db.models.reservation import Reservation
+from app.core.db.models.tour import Tour
+from app.core.db.crud.sales_stats.apply_sales_deltas import apply_sales_deltas
 
 logger = logging.getLogger(__name__)
 
 
-async def delete_reservation(db: AsyncSession, reservation_id: int) -> bool:
+async def delete_reservation(
+    db: AsyncSession,
+    reservation_id: int,
+    user_id: Optional[int] = None,
+    status: Optional[str] = None
+) -> bool:
     """
     Delete a reservation by its ID.
+
+    Ownership and status conditions are part of the DELETE statement, so
+    no separate SELECT is needed to check them.
     
     Args:
         db: Async SQLAlchemy session
         reservation_id: Reservation ID to delete
+        user_id: If given, only a reservation owned by this user is deleted
+        status: If given, only a reservation with this status is deleted
     
     Returns:
-        bool: True if reservation was deleted, False if reservation was not found
+        bool: True if reservation was deleted, False if it was not found or
+        did not match `user_id` / `status`
         
     Example:
-        >>> deleted = await delete_reservation(db, 1)
+        >>> deleted = await delete_reservation(db, 1, user_id=5, status="pending")
         >>> if deleted:
         ...     print("Reservation cancelled successfully")
         ... else:
@@ -27,11 +41,21 @@ async def delete_reservation(db: AsyncSession, reservation_id: int) -> bool:
     """
     logger.info(f"Deleting reservation ID: {reservation_id}")
     
-    stmt = delete(Reservation).where(Reservation.id == reservation_id)
-    result = await db.execute(stmt)
+    stmt = (
+        delete(Reservation)
+        .where(Reservation.id == reservation_id, Reservation.tour_id == Tour.id)
+        .returning(Reservation.tour_id, Reservation.user_id, Reservation.status, Tour.price)
+    )
+    if user_id is not None:
+        stmt = stmt.where(Reservation.user_id == user_id)
+    if status is not None:
+        stmt = stmt.where(Reservation.status == status)
+    row = (await db.execute(stmt)).one_or_none()
+    if row is not None and row.status == 'confirmed':
+        await apply_sales_deltas(db, [(row.tour_id, row.user_id, row.price, -1)])
     await db.commit()
     
-    deleted = result.rowcount > 0
+    deleted = row is not None
     
     if deleted:
         logger.info(f"Reservation ID {reservation_id} deleted successfully")
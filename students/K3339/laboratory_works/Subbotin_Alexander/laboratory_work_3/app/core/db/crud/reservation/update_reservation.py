@@ -1,30 +1,45 @@
 import logging
 from typing import Optional
-from sqlalchemy import update
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.core.db.models.reservation import Reservation
+from app.core.db.models.tour import Tour
+from app.core.db.crud.sales_stats.apply_sales_deltas import apply_sales_deltas, status_delta
 
 logger = logging.getLogger(__name__)
 
 
-async def update_reservation(db: AsyncSession, reservation_id: int, reservation_data: dict) -> Optional[Reservation]:
+async def update_reservation(
+    db: AsyncSession,
+    reservation_id: int,
+    reservation_data: dict,
+    user_id: Optional[int] = None
+) -> Optional[Reservation]:
     """
     Update a reservation's information.
+
+    A single UPDATE ... FROM tours ... RETURNING statement returns the
+    updated reservation, its tour and the previous status, so the caller
+    gets the reservation with `tour` loaded without reloading it, and the
+    sales stats are adjusted in the same transaction when the status flips
+    to or from 'confirmed'.
     
     Args:
         db: Async SQLAlchemy session
         reservation_id: Reservation ID to update
         reservation_data: Dictionary with fields to update (None values are ignored)
+        user_id: If given, only a reservation owned by this user is updated
     
     Returns:
-        Optional[Reservation]: Updated reservation instance if found, None otherwise
+        Optional[Reservation]: Updated reservation with tour loaded, None if not
+        found, not owned by `user_id` or there is nothing to update
         
     Example:
-        >>> update_data = {"guests": 3, "confirmed": True}
-        >>> reservation = await update_reservation(db, 1, update_data)
+        >>> reservation = await update_reservation(db, 1, {"notes": "Window seat"}, user_id=5)
         >>> if reservation:
-        ...     print(f"Reservation updated: {reservation.guests} guests, confirmed: {reservation.confirmed}")
+        ...     print(f"Reservation for {reservation.tour.title}: {reservation.status}")
     """
     logger.info(f"Updating reservation ID: {reservation_id}")
     
@@ -35,19 +50,31 @@ async def update_reservation(db: AsyncSession, reservation_id: int, reservation_
         logger.warning(f"No data to update for reservation ID: {reservation_id}")
         return None
     
+    old = select(Reservation.id, Reservation.status.label("old_status")).where(Reservation.id == reservation_id)
+    if user_id is not None:
+        old = old.where(Reservation.user_id == user_id)
+    old = old.with_for_update().cte("old")
     stmt = (
         update(Reservation)
-        .where(Reservation.id == reservation_id)
+        .where(Reservation.id == old.c.id, Reservation.tour_id == Tour.id)
         .values(**reservation_data)
-        .returning(Reservation)
+        .returning(Reservation, Tour, old.c.old_status)
+        .execution_options(synchronize_session=False, populate_existing=True)
     )
-    result = await db.execute(stmt)
+    row = (await db.execute(stmt)).one_or_none()
+    
+    updated_reservation = None
+    if row is not None:
+        updated_reservation, tour, old_status = row
+        set_committed_value(updated_reservation, "tour", tour)
+        delta = status_delta(old_status, updated_reservation.status)
+        if delta:
+            await apply_sales_deltas(db, [(tour.id, updated_reservation.user_id, tour.price, delta)])
     await db.commit()
     
-    updated_reservation = result.scalar_one_or_none()
     if updated_reservation:
         logger.info(f"Reservation ID {reservation_id} updated successfully")
     else:
-        logger.warning(f"Reservation ID {reservation_id} not found")
+        logger.warning(f"Reservation ID {reservation_id} not found" + (f" for user ID: {user_id}" if user_id else ""))
     
     return updated_reservation
@@ -2,6 +2,7 @@ import logging
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db.models.review import Review
+from app.core.db.crud.review.tour_rating import apply_tour_rating_delta
 
 logger = logging.getLogger(__name__)
 
@@ -9,6 +10,8 @@ logger = logging.getLogger(__name__)
 async def create_review(db: AsyncSession, user_id: int, review_data: dict) -> Review:
     """
     Create a new review for a tour.
+
+    The tour's review_count / rating_sum are updated in the same transaction.
     
     Args:
         db: Async SQLAlchemy session
@@ -30,6 +33,8 @@ async def create_review(db: AsyncSession, user_id: int, review_data: dict) -> Re
     logger.info(f"Creating review for user ID: {user_id}")
     review = Review(user_id=user_id, **review_data)
     db.add(review)
+    await db.flush()
+    await apply_tour_rating_delta(db, review.tour_id, 1, review.rating)
     await db.commit()
     await db.refresh(review)
     logger.info(f"Review created successfully (ID: {review.id})")
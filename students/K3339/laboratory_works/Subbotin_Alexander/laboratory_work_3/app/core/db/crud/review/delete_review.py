@@ -3,6 +3,7 @@ from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db.models.review import Review
+from app.core.db.crud.review.tour_rating import apply_tour_rating_delta
 
 logger = logging.getLogger(__name__)
 
@@ -10,6 +11,8 @@ logger = logging.getLogger(__name__)
 async def delete_review(db: AsyncSession, review_id: int) -> bool:
     """
     Delete a review by its ID.
+
+    The tour's review_count / rating_sum are updated in the same transaction.
     
     Args:
         db: Async SQLAlchemy session
@@ -27,11 +30,13 @@ async def delete_review(db: AsyncSession, review_id: int) -> bool:
     """
     logger.info(f"Deleting review ID: {review_id}")
     
-    stmt = delete(Review).where(Review.id == review_id)
-    result = await db.execute(stmt)
+    stmt = delete(Review).where(Review.id == review_id).returning(Review.tour_id, Review.rating)
+    row = (await db.execute(stmt)).one_or_none()
+    if row is not None:
+        await apply_tour_rating_delta(db, row.tour_id, -1, -row.rating)
     await db.commit()
     
-    deleted = result.rowcount > 0
+    deleted = row is not None
     
     if deleted:
         logger.info(f"Review ID {review_id} deleted successfully")
@@ -0,0 +1,34 @@
+import logging
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db.models.tour import Tour
+
+logger = logging.getLogger(__name__)
+
+
+async def apply_tour_rating_delta(db: AsyncSession, tour_id: int, count_delta: int, rating_delta: int) -> None:
+    """
+    Adjust the denormalized review aggregates of a tour.
+
+    Does not commit: called by the review CRUD functions before their commit,
+    so reviews and tour aggregates change in one transaction. PostgreSQL
+    recomputes the generated `average_rating` column.
+
+    Args:
+        db: Async SQLAlchemy session
+        tour_id: Tour the review belongs to
+        count_delta: Change of review_count (+1 create, -1 delete, 0 update)
+        rating_delta: Change of rating_sum
+    """
+    if not count_delta and not rating_delta:
+        return
+    await db.execute(
+        update(Tour)
+        .where(Tour.id == tour_id)
+        .values(
+            review_count=Tour.review_count + count_delta,
+            rating_sum=Tour.rating_sum + rating_delta,
+        )
+    )
+    logger.debug(f"Tour ID {tour_id} rating aggregates: {count_delta:+d} reviews, {rating_delta:+d} rating")
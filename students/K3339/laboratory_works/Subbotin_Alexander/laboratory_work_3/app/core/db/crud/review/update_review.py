@@ -1,10 +1,11 @@
 import logging
 from typing import Optional
 from datetime import datetime
-from sqlalchemy import update
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db.models.review import Review
+from app.core.db.crud.review.tour_rating import apply_tour_rating_delta
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +13,9 @@ logger = logging.getLogger(__name__)
 async def update_review(db: AsyncSession, review_id: int, review_data: dict) -> Optional[Review]:
     """
     Update a review's information.
+
+    The previous rating is returned by the UPDATE itself, the tour's
+    rating_sum is adjusted in the same transaction.
     
     Args:
         db: Async SQLAlchemy session
@@ -39,16 +43,27 @@ async def update_review(db: AsyncSession, review_id: int, review_data: dict) ->
     # Set updated_at timestamp
     review_data['updated_at'] = datetime.utcnow()
     
+    old = (
+        select(Review.id, Review.rating.label("old_rating"))
+        .where(Review.id == review_id)
+        .with_for_update()
+        .cte("old")
+    )
     stmt = (
         update(Review)
-        .where(Review.id == review_id)
+        .where(Review.id == old.c.id)
         .values(**review_data)
-        .returning(Review)
+        .returning(Review, old.c.old_rating)
+        .execution_options(synchronize_session=False, populate_existing=True)
     )
-    result = await db.execute(stmt)
+    row = (await db.execute(stmt)).one_or_none()
+    
+    updated_review = None
+    if row is not None:
+        updated_review, old_rating = row
+        await apply_tour_rating_delta(db, updated_review.tour_id, 0, updated_review.rating - old_rating)
     await db.commit()
     
-    updated_review = result.scalar_one_or_none()
     if updated_review:
         logger.info(f"Review ID {review_id} updated successfully")
     else:
@@ -0,0 +1,149 @@
+import logging
+from typing import Iterable
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db.models.sales_stats import SalesStats, TourSalesStats, CustomerSalesStats, SALES_STATS_ID
+
+logger = logging.getLogger(__name__)
+
+# (tour_id, user_id, tour_price, delta) where delta is +1 when a reservation
+# becomes confirmed and -1 when a confirmed one is rejected, reset or deleted.
+SalesDelta = tuple[int, int, float, int]
+
+
+def status_delta(old_status: str | None, new_status: str | None) -> int:
+    """Change of the confirmed reservations count for a status transition."""
+    return (new_status == "confirmed") - (old_status == "confirmed")
+
+
+async def _add_to_totals(db: AsyncSession, confirmed_delta: int = 0, revenue_delta: float = 0.0) -> None:
+    """Upsert the totals row, which also takes its row lock."""
+    totals = insert(SalesStats).values(
+        id=SALES_STATS_ID,
+        confirmed_reservations=confirmed_delta,
+        total_revenue=revenue_delta,
+        total_customers=0,
+    )
+    totals = totals.on_conflict_do_update(
+        index_elements=[SalesStats.id],
+        set_={
+            "confirmed_reservations": SalesStats.confirmed_reservations + totals.excluded.confirmed_reservations,
+            "total_revenue": SalesStats.total_revenue + totals.excluded.total_revenue,
+            "updated_at": func.now(),
+        },
+    )
+    await db.execute(totals)
+
+
+async def apply_sales_deltas(db: AsyncSession, changes: Iterable[SalesDelta]) -> None:
+    """
+    Apply confirmed-reservation changes to the sales stats tables.
+
+    Does not commit: call it in the transaction that changed the reservations,
+    so the stats and the reservations are committed (or rolled back) together.
+    The totals row is locked first, crud.reconcile_sales_stats takes the same
+    lock, so a rebuild never interleaves with a delta.
+
+    Args:
+        db: Async SQLAlchemy session
+        changes: (tour_id, user_id, tour_price, delta) tuples, zero deltas are skipped
+
+    Example:
+        >>> await apply_sales_deltas(db, [(tour.id, user_id, tour.price, +1)])
+        >>> await db.commit()
+    """
+    per_tour: dict[int, list] = {}
+    per_user: dict[int, int] = {}
+    for tour_id, user_id, price, delta in changes:
+        if not delta:
+            continue
+        tour_item = per_tour.setdefault(tour_id, [0, 0.0])
+        tour_item[0] += delta
+        tour_item[1] += delta * price
+        per_user[user_id] = per_user.get(user_id, 0) + delta
+
+    per_tour = {tour_id: item for tour_id, item in per_tour.items() if item[0]}
+    per_user = {user_id: delta for user_id, delta in per_user.items() if delta}
+    if not per_tour:
+        return
+
+    # 1. Totals (locks the single stats row)
+    confirmed_delta = sum(item[0] for item in per_tour.values())
+    revenue_delta = sum(item[1] for item in per_tour.values())
+    await _add_to_totals(db, confirmed_delta, revenue_delta)
+
+    # 2. Per-tour counters
+    tours = insert(TourSalesStats).values([
+        {"tour_id": tour_id, "confirmed_reservations": count, "revenue": revenue}
+        for tour_id, (count, revenue) in sorted(per_tour.items())
+    ])
+    tours = tours.on_conflict_do_update(
+        index_elements=[TourSalesStats.tour_id],
+        set_={
+            "confirmed_reservations": TourSalesStats.confirmed_reservations + tours.excluded.confirmed_reservations,
+            "revenue": TourSalesStats.revenue + tours.excluded.revenue,
+        },
+    )
+    await db.execute(tours)
+
+    # 3. Per-customer counters; a customer is counted while above zero
+    customers_delta = 0
+    if per_user:
+        customers = insert(CustomerSalesStats).values([
+            {"user_id": user_id, "confirmed_reservations": delta}
+            for user_id, delta in sorted(per_user.items())
+        ])
+        customers = customers.on_conflict_do_update(
+            index_elements=[CustomerSalesStats.user_id],
+            set_={
+                "confirmed_reservations": (
+                    CustomerSalesStats.confirmed_reservations + customers.excluded.confirmed_reservations
+                ),
+            },
+        ).returning(CustomerSalesStats.user_id, CustomerSalesStats.confirmed_reservations)
+        for user_id, confirmed in (await db.execute(customers)).all():
+            before = confirmed - per_user[user_id]
+            customers_delta += (confirmed > 0) - (before > 0)
+
+    if customers_delta:
+        await db.execute(
+            update(SalesStats)
+            .where(SalesStats.id == SALES_STATS_ID)
+            .values(total_customers=SalesStats.total_customers + customers_delta)
+        )
+
+    logger.debug(
+        f"Sales stats delta applied: {confirmed_delta:+d} reservations, "
+        f"{revenue_delta:+.2f} revenue, {customers_delta:+d} customers"
+    )
+
+
+async def apply_tour_price_change(db: AsyncSession, tour_id: int, price: float) -> None:
+    """
+    Re-price the revenue of a tour's confirmed reservations.
+
+    Revenue is counted at the current tour price (as the reconcile query
+    does), so a price update moves the per-tour and total revenue. Does
+    not commit.
+
+    Args:
+        db: Async SQLAlchemy session
+        tour_id: Tour whose price changed
+        price: New tour price
+    """
+    await _add_to_totals(db)
+    row = (await db.execute(
+        select(TourSalesStats.confirmed_reservations, TourSalesStats.revenue)
+        .where(TourSalesStats.tour_id == tour_id)
+        .with_for_update()
+    )).one_or_none()
+    if row is None or not row.confirmed_reservations:
+        return
+
+    revenue = row.confirmed_reservations * price
+    await db.execute(
+        update(TourSalesStats).where(TourSalesStats.tour_id == tour_id).values(revenue=revenue)
+    )
+    await _add_to_totals(db, revenue_delta=revenue - row.revenue)
@@ -0,0 +1,74 @@
+import logging
+from typing import Sequence
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db.models.tour import Tour
+from app.core.db.models.sales_stats import TourSalesStats
+
+logger = logging.getLogger(__name__)
+
+
+async def get_tour_sales_stats(db: AsyncSession, limit: int = 100, offset: int = 0) -> Sequence:
+    """
+    Per-tour sales breakdown, best-selling tours first.
+
+    Args:
+        db: Async SQLAlchemy session
+        limit: Maximum number of tours to return
+        offset: Number of tours to skip
+
+    Returns:
+        Sequence of rows (tour_id, title, city, confirmed_reservations, revenue)
+
+    Example:
+        >>> for row in await get_tour_sales_stats(db, limit=10):
+        ...     print(row.title, row.revenue)
+    """
+    stmt = (
+        select(
+            TourSalesStats.tour_id,
+            Tour.title,
+            Tour.city,
+            TourSalesStats.confirmed_reservations,
+            TourSalesStats.revenue,
+        )
+        .join(Tour, TourSalesStats.tour_id == Tour.id)
+        .where(TourSalesStats.confirmed_reservations > 0)
+        .order_by(TourSalesStats.revenue.desc(), TourSalesStats.tour_id)
+        .limit(limit)
+        .offset(offset)
+    )
+    result = await db.execute(stmt)
+    return result.all()
+
+
+async def get_city_sales_stats(db: AsyncSession) -> Sequence:
+    """
+    Per-city sales breakdown, aggregated from the per-tour stats rows
+    (one row per sold tour, not per reservation).
+
+    Args:
+        db: Async SQLAlchemy session
+
+    Returns:
+        Sequence of rows (city, tours, confirmed_reservations, revenue)
+
+    Example:
+        >>> for row in await get_city_sales_stats(db):
+        ...     print(row.city, row.confirmed_reservations)
+    """
+    stmt = (
+        select(
+            Tour.city,
+            func.count().label("tours"),
+            func.sum(TourSalesStats.confirmed_reservations).label("confirmed_reservations"),
+            func.sum(TourSalesStats.revenue).label("revenue"),
+        )
+        .join(Tour, TourSalesStats.tour_id == Tour.id)
+        .where(TourSalesStats.confirmed_reservations > 0)
+        .group_by(Tour.city)
+        .order_by(func.sum(TourSalesStats.revenue).desc())
+    )
+    result = await db.execute(stmt)
+    return result.all()
@@ -0,0 +1,80 @@
+import logging
+from sqlalchemy import select, delete, insert, update, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db.models.reservation import Reservation
+from app.core.db.models.tour import Tour
+from app.core.db.models.sales_stats import SalesStats, TourSalesStats, CustomerSalesStats, SALES_STATS_ID
+
+logger = logging.getLogger(__name__)
+
+
+async def reconcile_sales_stats(db: AsyncSession) -> SalesStats:
+    """
+    Rebuild the sales stats tables from the reservations table.
+
+    Repairs drift of the incrementally maintained counters (e.g. after tour
+    price changes or manual SQL). The totals row is locked first, the same
+    order as crud.apply_sales_deltas, so concurrent status changes wait for
+    the rebuild and are applied on top of it.
+
+    Args:
+        db: Async SQLAlchemy session
+
+    Returns:
+        SalesStats: Rebuilt totals row
+
+    Example:
+        >>> stats = await reconcile_sales_stats(db)
+        >>> print(stats.confirmed_reservations, stats.total_revenue)
+    """
+    logger.info("Reconciling sales stats")
+
+    lock = pg_insert(SalesStats).values(id=SALES_STATS_ID)
+    lock = lock.on_conflict_do_update(index_elements=[SalesStats.id], set_={"updated_at": func.now()})
+    await db.execute(lock)
+
+    confirmed = Reservation.status == 'confirmed'
+
+    await db.execute(delete(TourSalesStats))
+    await db.execute(insert(TourSalesStats).from_select(
+        ["tour_id", "confirmed_reservations", "revenue"],
+        select(Reservation.tour_id, func.count(), func.sum(Tour.price))
+        .join(Tour, Reservation.tour_id == Tour.id)
+        .where(confirmed)
+        .group_by(Reservation.tour_id),
+    ))
+
+    await db.execute(delete(CustomerSalesStats))
+    await db.execute(insert(CustomerSalesStats).from_select(
+        ["user_id", "confirmed_reservations"],
+        select(Reservation.user_id, func.count())
+        .where(confirmed)
+        .group_by(Reservation.user_id),
+    ))
+
+    # Totals from the freshly built per-tour / per-user rows
+    confirmed_total, revenue_total = (await db.execute(select(
+        func.coalesce(func.sum(TourSalesStats.confirmed_reservations), 0),
+        func.coalesce(func.sum(TourSalesStats.revenue), 0.0),
+    ))).one()
+    customers_total = await db.scalar(select(func.count()).select_from(CustomerSalesStats))
+    await db.execute(
+        update(SalesStats)
+        .where(SalesStats.id == SALES_STATS_ID)
+        .values(
+            confirmed_reservations=confirmed_total,
+            total_revenue=revenue_total,
+            total_customers=customers_total,
+            reconciled_at=func.now(),
+        )
+    )
+    await db.commit()
+
+    stats = await db.get(SalesStats, SALES_STATS_ID, populate_existing=True)
+    logger.info(
+        f"Sales stats reconciled: {stats.confirmed_reservations} reservations, "
+        f"{stats.total_revenue} revenue, {stats.total_customers} customers"
+    )
+    return stats
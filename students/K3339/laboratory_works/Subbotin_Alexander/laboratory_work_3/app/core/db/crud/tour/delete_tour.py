@@ -1,8 +1,11 @@
 import logging
-from sqlalchemy import delete
+from collections import Counter
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db.models.tour import Tour
+from app.core.db.models.reservation import Reservation
+from app.core.db.crud.sales_stats.apply_sales_deltas import apply_sales_deltas
 
 logger = logging.getLogger(__name__)
 
@@ -27,10 +30,31 @@ async def delete_tour(db: AsyncSession, tour_id: int) -> bool:
     """
     logger.info(f"Deleting tour ID: {tour_id}")
     
+    # Locks are taken in the order the reservation cruds use: the tour (the
+    # reservation insert takes a key share lock on it), the reservations
+    # (by id, like the bulk update), then the stats rows in apply_sales_deltas
+    price = (await db.execute(
+        select(Tour.price).where(Tour.id == tour_id).with_for_update()
+    )).scalar_one_or_none()
+    if price is None:
+        logger.warning(f"Tour ID {tour_id} not found")
+        return False
+
+    # Confirmed reservations are removed by ON DELETE CASCADE, take them out of the sales stats
+    reservations = await db.execute(
+        select(Reservation.user_id, Reservation.status)
+        .where(Reservation.tour_id == tour_id)
+        .order_by(Reservation.id)
+        .with_for_update()
+    )
+    confirmed = Counter(user_id for user_id, status in reservations.all() if status == 'confirmed')
+    changes = [(tour_id, user_id, price, -count) for user_id, count in confirmed.items()]
+    await apply_sales_deltas(db, changes)
+
     stmt = delete(Tour).where(Tour.id == tour_id)
     result = await db.execute(stmt)
     await db.commit()
-    
+
     deleted = result.rowcount > 0
     
     if deleted:
@@ -1,49 +1,152 @@
 import logging
+import math
+from datetime import datetime
 from typing import Sequence, Optional
-from sqlalchemy import select
+from sqlalchemy import BigInteger, DateTime, Float, Integer, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db.models.tour import Tour
 
 logger = logging.getLogger(__name__)
 
+# Sort keys available to clients; "-" prefix means descending order.
+# Every key is backed by a composite (column, id) index on tours.
+TOUR_SORT_COLUMNS = {
+    "start_date": Tour.start_date,
+    "price": Tour.price,
+    "rating": Tour.average_rating,
+    "review_count": Tour.review_count,
+    "id": Tour.id,
+}
+TOUR_SORT_KEYS = tuple(
+    key for field in TOUR_SORT_COLUMNS for key in (field, f"-{field}")
+)
+
+
+def _sort_columns(sort: str) -> tuple:
+    """Return ordered columns for the sort key, always ending with Tour.id as tie-breaker."""
+    field = sort.lstrip("-")
+    if field not in TOUR_SORT_COLUMNS:
+        raise ValueError(f"Unknown sort key: {sort}")
+    column = TOUR_SORT_COLUMNS[field]
+    return (Tour.id,) if column is Tour.id else (column, Tour.id)
+
+
+def tour_sort_values(tour: Tour, sort: str) -> tuple:
+    """
+    Extract keyset values of a tour for the given sort key.
+
+    Args:
+        tour: Tour instance (usually the last row of a page)
+        sort: Sort key used to fetch the page
+
+    Returns:
+        tuple: Values to pass as `after` for the next page
+    """
+    return tuple(getattr(tour, column.key) for column in _sort_columns(sort))
+
+
+# Bounds of the PostgreSQL integer types, keyed by the column type
+INTEGER_RANGES = {
+    BigInteger: (-2**63, 2**63 - 1),
+    Integer: (-2**31, 2**31 - 1),
+}
+
+
+def _check_range(column, value) -> None:
+    """Reject values the column type cannot hold, so they never reach the database."""
+    column_type = type(column.type)
+    if issubclass(column_type, Integer):
+        low, high = INTEGER_RANGES[BigInteger if issubclass(column_type, BigInteger) else Integer]
+        if not low <= value <= high:
+            raise ValueError(f"Cursor value for {column.key} is out of range")
+    elif issubclass(column_type, Float) and not math.isfinite(value):
+        raise ValueError(f"Cursor value {value} is not a finite number")
+    elif issubclass(column_type, DateTime) and not column.type.timezone and value.tzinfo is not None:
+        raise ValueError(f"Cursor value {value.isoformat()} must not have a time zone")
+
+
+def _coerce_after(columns: tuple, after: Sequence) -> tuple:
+    """Convert raw cursor values (e.g. ISO strings) back to column python types."""
+    if len(after) != len(columns):
+        raise ValueError("Cursor does not match sort key")
+    values = []
+    for column, value in zip(columns, after):
+        python_type = column.type.python_type
+        try:
+            if python_type is datetime and isinstance(value, str):
+                value = datetime.fromisoformat(value)
+            elif python_type is int and isinstance(value, float) and not value.is_integer():
+                raise ValueError("not an integer")
+            elif not isinstance(value, python_type):
+                value = python_type(value)
+        except (TypeError, ValueError, ArithmeticError) as e:
+            raise ValueError(f"Invalid cursor value {value!r}: {e}")
+        _check_range(column, value)
+        values.append(value)
+    return tuple(values)
+
 
 async def get_all_tours(
-    db: AsyncSession, 
-    limit: int = 100, 
+    db: AsyncSession,
+    limit: int = 100,
     offset: int = 0,
-    city: Optional[str] = None
+    city: Optional[str] = None,
+    sort: str = "start_date",
+    after: Optional[Sequence] = None
 ) -> Sequence[Tour]:
     """
     Retrieve tours with optional filtering and pagination.
-    
+
+    Tours are always ordered by the sort key with `id` as a tie-breaker, so
+    pages are stable. When `after` is given the page is fetched by keyset
+    (seek) pagination, which uses the (sort column, id) index and costs the
+    same for any page depth; `offset` is kept for backward compatibility.
+
     Args:
         db: Async SQLAlchemy session
         limit: Maximum number of tours to return (default: 100)
         offset: Number of tours to skip for pagination (default: 0)
         city: Optional city filter (case-insensitive partial match)
-    
+        sort: Sort key from TOUR_SORT_KEYS (default: "start_date")
+        after: Sort values of the last tour of the previous page (see tour_sort_values)
+
     Returns:
         Sequence[Tour]: List of tour instances
-        
+
+    Raises:
+        ValueError: If sort key is unknown or `after` does not match it
+
     Example:
         >>> # Get all tours
         >>> tours = await get_all_tours(db)
-        >>> 
+        >>>
         >>> # Get tours in Paris with pagination
         >>> paris_tours = await get_all_tours(db, limit=10, offset=0, city="Paris")
         >>> for tour in paris_tours:
         ...     print(f"{tour.title} - ${tour.price}")
+        >>>
+        >>> # Next page by keyset
+        >>> next_page = await get_all_tours(db, limit=10, after=tour_sort_values(paris_tours[-1], "start_date"))
     """
-    logger.info(f"Fetching tours (limit: {limit}, offset: {offset}, city: {city})")
+    logger.info(f"Fetching tours (limit: {limit}, offset: {offset}, city: {city}, sort: {sort}, after: {after})")
+    columns = _sort_columns(sort)
+    descending = sort.startswith("-")
     stmt = select(Tour)
-    
+
     if city:
         stmt = stmt.where(Tour.city.ilike(f"%{city}%"))
-    
+
+    if after is not None:
+        key = tuple_(*columns)
+        values = tuple_(*_coerce_after(columns, after))
+        stmt = stmt.where(key < values if descending else key > values)
+
+    stmt = stmt.order_by(*(column.desc() if descending else column.asc() for column in columns))
+
     stmt = stmt.limit(limit).offset(offset)
     result = await db.execute(stmt)
     tours = result.scalars().all()
-    
+
     logger.debug(f"Found {len(tours)} tours")
     return tours
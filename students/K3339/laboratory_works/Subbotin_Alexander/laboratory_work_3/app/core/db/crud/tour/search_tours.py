@@ -0,0 +1,75 @@
+import logging
+import re
+from typing import Sequence, Optional
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db.models.tour import Tour, TOUR_SEARCH_CONFIG
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def build_prefix_tsquery(query: str) -> Optional[str]:
+    """
+    Convert free user input into a safe prefix tsquery ("париж & муз:*").
+
+    Every word is matched as a prefix so partial input keeps working the way
+    the old ILIKE filters did. Operators and punctuation are dropped.
+
+    Returns:
+        Optional[str]: tsquery text or None if the input has no words
+    """
+    words = _WORD_RE.findall(query.lower())
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
+
+
+async def search_tours(
+    db: AsyncSession,
+    query: str,
+    limit: int = 20,
+    offset: int = 0,
+    city: Optional[str] = None
+) -> Sequence[Tour]:
+    """
+    Full-text search over tours ranked by relevance.
+
+    Uses the GIN index on `tours.search_vector` (title and city weigh more
+    than agency, agency more than description).
+
+    Args:
+        db: Async SQLAlchemy session
+        query: Free text entered by the user
+        limit: Maximum number of tours to return (default: 20)
+        offset: Number of tours to skip for pagination (default: 0)
+        city: Optional city filter (case-insensitive partial match)
+
+    Returns:
+        Sequence[Tour]: Tours ordered by rank (best match first)
+
+    Example:
+        >>> tours = await search_tours(db, "хоккайдо рамен")
+        >>> for tour in tours:
+        ...     print(tour.title)
+    """
+    logger.info(f"Searching tours (query: {query!r}, limit: {limit}, offset: {offset}, city: {city})")
+    tsquery_text = build_prefix_tsquery(query)
+    if tsquery_text is None:
+        return []
+
+    tsquery = func.to_tsquery(TOUR_SEARCH_CONFIG, tsquery_text)
+    rank = func.ts_rank_cd(Tour.search_vector, tsquery)
+    stmt = select(Tour).where(Tour.search_vector.op("@@")(tsquery))
+
+    if city:
+        stmt = stmt.where(Tour.city.ilike(f"%{city}%"))
+
+    stmt = stmt.order_by(rank.desc(), Tour.id).limit(limit).offset(offset)
+    result = await db.execute(stmt)
+    tours = result.scalars().all()
+
+    logger.debug(f"Found {len(tours)} tours")
+    return tours
@@ -5,6 +5,7 @@ from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db.models.tour import Tour
+from app.core.db.crud.sales_stats.apply_sales_deltas import apply_tour_price_change
 
 logger = logging.getLogger(__name__)
 
@@ -56,9 +57,11 @@ async def update_tour(db: AsyncSession, tour_id: int, tour_data: dict) -> Option
         .returning(Tour)
     )
     result = await db.execute(stmt)
+    updated_tour = result.scalar_one_or_none()
+    if updated_tour and 'price' in tour_data:
+        await apply_tour_price_change(db, tour_id, updated_tour.price)
     await db.commit()
     
-    updated_tour = result.scalar_one_or_none()
     if updated_tour:
         logger.info(f"Tour ID {tour_id} updated successfully")
     else:
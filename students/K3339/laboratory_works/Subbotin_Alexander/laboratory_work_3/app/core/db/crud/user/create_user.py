@@ -2,7 +2,7 @@ import logging
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db.models.user import User
-from app.core.settings.security import get_password_hash
+from app.core.settings.security import get_password_hash_async
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +27,7 @@ async def create_user(db: AsyncSession, username: str, email: str, password: str
         john_doe
     """
     logger.info(f"Creating user: {username}")
-    hashed_password = get_password_hash(password)
+    hashed_password = await get_password_hash_async(password)
     user = User(
         username=username,
         email=email,
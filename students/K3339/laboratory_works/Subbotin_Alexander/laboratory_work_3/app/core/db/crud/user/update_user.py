@@ -1,10 +1,11 @@
 import logging
 from typing import Optional
-from sqlalchemy import update
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db.models.user import User
-from app.core.settings.security import get_password_hash
+from app.core.settings.security import get_password_hash_async
+from app.core.user_cache import user_cache
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +41,11 @@ async def update_user(
         from app.core.db.crud.user.get_user import get_user_by_id
         return await get_user_by_id(db, user_id)
     
+    # Tokens carry the username, so the cache entry of the old name must go too
+    old_username = None
+    if username is not None:
+        old_username = await db.scalar(select(User.username).where(User.id == user_id))
+    
     stmt = (
         update(User)
         .where(User.id == user_id)
@@ -51,6 +57,7 @@ async def update_user(
     
     updated_user = result.scalar_one_or_none()
     if updated_user:
+        await user_cache.invalidate(old_username, updated_user.username)
         logger.info(f"User ID {user_id} updated successfully")
     else:
         logger.warning(f"User ID {user_id} not found for update")
@@ -76,7 +83,7 @@ async def update_user_password(
     """
     logger.info(f"Updating password for user ID: {user_id}")
     
-    hashed_password = get_password_hash(new_password)
+    hashed_password = await get_password_hash_async(new_password)
     
     stmt = (
         update(User)
@@ -89,8 +96,46 @@ async def update_user_password(
     
     updated_user = result.scalar_one_or_none()
     if updated_user:
+        await user_cache.invalidate(updated_user.username)
         logger.info(f"Password updated for user ID {user_id}")
     else:
         logger.warning(f"User ID {user_id} not found for password update")
     
     return updated_user
+
+
+async def update_user_admin(
+    db: AsyncSession,
+    user_id: int,
+    is_admin: bool
+) -> Optional[User]:
+    """
+    Grant or revoke admin rights.
+    
+    Args:
+        db: Async SQLAlchemy session
+        user_id: User ID to update
+        is_admin: New admin flag
+    
+    Returns:
+        Optional[User]: Updated user instance if found, None otherwise
+    """
+    logger.info(f"Setting is_admin={is_admin} for user ID: {user_id}")
+    
+    stmt = (
+        update(User)
+        .where(User.id == user_id)
+        .values(is_admin=is_admin)
+        .returning(User)
+    )
+    result = await db.execute(stmt)
+    await db.commit()
+    
+    updated_user = result.scalar_one_or_none()
+    if updated_user:
+        await user_cache.invalidate(updated_user.username)
+        logger.info(f"Admin flag updated for user ID {user_id}")
+    else:
+        logger.warning(f"User ID {user_id} not found for admin flag update")
+    
+    return updated_user
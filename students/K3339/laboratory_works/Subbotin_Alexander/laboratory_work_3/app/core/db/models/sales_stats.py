@@ -0,0 +1,50 @@
+from datetime import datetime
+
+from sqlalchemy import Integer, Float, DateTime, ForeignKey, func
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.db import Base
+
+SALES_STATS_ID = 1
+
+
+class SalesStats(Base):
+    """
+    Single-row totals behind GET /reservations/admin/stats.
+
+    Maintained incrementally by crud.apply_sales_deltas in the transaction
+    that changes a reservation status, rebuilt by crud.reconcile_sales_stats.
+    """
+    __tablename__ = "sales_stats"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, default=SALES_STATS_ID)
+    confirmed_reservations: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_revenue: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    total_customers: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+    reconciled_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"SalesStats(confirmed={self.confirmed_reservations}, revenue={self.total_revenue})"
+
+
+class TourSalesStats(Base):
+    """Confirmed reservations and revenue per tour (per-tour / per-city breakdowns)."""
+    __tablename__ = "tour_sales_stats"
+
+    tour_id: Mapped[int] = mapped_column(Integer, ForeignKey("tours.id", ondelete="CASCADE"), primary_key=True)
+    confirmed_reservations: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    revenue: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+    def __repr__(self):
+        return f"TourSalesStats(tour_id={self.tour_id}, confirmed={self.confirmed_reservations})"
+
+
+class CustomerSalesStats(Base):
+    """Confirmed reservations per user; total_customers counts users above zero."""
+    __tablename__ = "customer_sales_stats"
+
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    confirmed_reservations: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"CustomerSalesStats(user_id={self.user_id}, confirmed={self.confirmed_reservations})"
@@ -1,7 +1,8 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 
-from sqlalchemy import String, Float, Text, DateTime
+from sqlalchemy import String, Float, Integer, Text, DateTime, Index, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from datetime import datetime
 from app.core.db import Base
@@ -11,9 +12,38 @@ if TYPE_CHECKING:
     from app.core.db.models.reservation import Reservation
     from app.core.db.models.review import Review
 
+# 'simple' config: catalog mixes Russian, English and Japanese, so words are
+# indexed without stemming and matched by prefix (see crud.search_tours).
+TOUR_SEARCH_CONFIG = "simple"
+TOUR_SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{TOUR_SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{TOUR_SEARCH_CONFIG}', coalesce(city, '')), 'A') || "
+    f"setweight(to_tsvector('{TOUR_SEARCH_CONFIG}', coalesce(agency, '')), 'B') || "
+    f"setweight(to_tsvector('{TOUR_SEARCH_CONFIG}', coalesce(description, '')), 'C')"
+)
+# 0 for tours without reviews, so the column is never NULL and works in keyset comparisons
+TOUR_AVERAGE_RATING_SQL = (
+    "CASE WHEN review_count > 0 THEN rating_sum::double precision / review_count ELSE 0 END"
+)
+
 
 class Tour(Base):
     __tablename__ = "tours"
+    __table_args__ = (
+        # Natural key; lets the bulk importer use ON CONFLICT DO NOTHING
+        Index("uq_tours_title_agency", "title", "agency", unique=True),
+        # Composite indexes for keyset pagination (see crud.get_all_tours)
+        Index("ix_tours_start_date_id", "start_date", "id"),
+        Index("ix_tours_price_id", "price", "id"),
+        Index("ix_tours_average_rating_id", "average_rating", "id"),
+        Index("ix_tours_review_count_id", "review_count", "id"),
+        # Full-text search and trigram (ILIKE '%x%') indexes, see crud.search_tours
+        Index("ix_tours_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_tours_city_trgm", "city",
+            postgresql_using="gin", postgresql_ops={"city": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -24,6 +54,20 @@ class Tour(Base):
     price: Mapped[float] = mapped_column(Float, nullable=False)
     city: Mapped[str] = mapped_column(String(100), nullable=False)
     payment_terms: Mapped[str] = mapped_column(Text, nullable=True)
+    # Weighted search document, maintained by PostgreSQL on every insert/update
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(TOUR_SEARCH_VECTOR_SQL, persisted=True),
+        deferred=True,
+    )
+
+    # Review aggregates, maintained by crud.create_review / update_review / delete_review
+    review_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    rating_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    average_rating: Mapped[float] = mapped_column(
+        Float,
+        Computed(TOUR_AVERAGE_RATING_SQL, persisted=True),
+    )
 
     # Relationships
     reservations: Mapped[list["Reservation"]] = relationship("Reservation", back_populates="tour")
@@ -1,11 +1,14 @@
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.user_cache import user_cache
+
 
 async def clear_database(session: AsyncSession) -> None:
     """
     Truncates all tables in the public schema (except alembic_version),
-    cascading to dependent tables.
+    cascading to dependent tables, and drops cached users so that deleted
+    accounts stop authenticating immediately.
 
     :param session: An instance of AsyncSession to execute the SQL command.
     """
@@ -28,3 +31,4 @@ async def clear_database(session: AsyncSession) -> None:
     # Execute the PL/pgSQL block to truncate all tables
     async with session.begin():
         await session.execute(text(plpgsql))
+    await user_cache.clear_all()
@@ -1,29 +1,199 @@
 import json
 import logging
+import time
+from dataclasses import dataclass, asdict
 from pathlib import Path
 from datetime import datetime
+from typing import Iterator, Optional, TextIO
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 
 from app.core.db.models.tour import Tour
+from app.core.db.services.clear_db import clear_database
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 
 logger = logging.getLogger(__name__)
 
+READ_CHUNK_SIZE = 64 * 1024
+# Largest tour object (or NDJSON line) accepted; a malformed element would
+# otherwise be buffered until the end of the file
+MAX_ELEMENT_SIZE = 1024 * 1024
+BATCH_SIZE = 1000
+
+REQUIRED_FIELDS = ("title", "agency", "start_date", "end_date", "price", "city")
+OPTIONAL_FIELDS = ("description", "payment_terms")
+# asyncpg allows at most 32767 bind parameters per statement, one per column of every row
+MAX_BIND_PARAMS = 32767
+MAX_BATCH_SIZE = MAX_BIND_PARAMS // (len(REQUIRED_FIELDS) + len(OPTIONAL_FIELDS))
+
+
+@dataclass
+class TourImportReport:
+    """Result of a tours import run."""
+    processed: int = 0
+    inserted: int = 0
+    skipped_existing: int = 0
+    invalid: int = 0
+    seconds: float = 0.0
+    rows_per_sec: float = 0.0
+    peak_memory_mb: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _peak_memory_mb() -> Optional[float]:
+    """Process memory high-water mark (ru_maxrss is in KiB on Linux)."""
+    if resource is None:
+        return None
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def _iter_json_array(f: TextIO, buf: str) -> Iterator[dict]:
+    """
+    Incrementally decode objects of a top-level JSON array.
+
+    Only one read chunk plus the object being decoded is held in memory,
+    so files much larger than RAM can be imported.
+
+    Raises:
+        ValueError: If an object is not decoded within MAX_ELEMENT_SIZE characters
+    """
+    decoder = json.JSONDecoder()
+    pos = buf.index("[") + 1
+
+    while True:
+        # Skip whitespace and separators, reading more input when needed
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf):
+                break
+            chunk = f.read(READ_CHUNK_SIZE)
+            if not chunk:
+                raise ValueError("Unexpected end of JSON array")
+            buf, pos = chunk, 0
+
+        if buf[pos] == "]":
+            return
+        if buf[pos] != "{":
+            raise ValueError(f"Expected tour object, got {buf[pos]!r}")
+
+        try:
+            obj, pos = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            # Object spans the chunk boundary
+            if len(buf) - pos > MAX_ELEMENT_SIZE:
+                raise ValueError(f"Tour object is malformed or larger than {MAX_ELEMENT_SIZE} characters")
+            chunk = f.read(READ_CHUNK_SIZE)
+            if not chunk:
+                raise
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+
+        yield obj
+
+        if pos > READ_CHUNK_SIZE:
+            buf, pos = buf[pos:], 0
 
-async def migrate_tours(db: AsyncSession, json_file_path: str = None) -> int:
+
+def _iter_ndjson(f: TextIO, first_chunk: str) -> Iterator[dict]:
+    """Decode one tour object per line (NDJSON)."""
+    pending = ""
+    chunk = first_chunk
+    while chunk:
+        lines = (pending + chunk).split("\n")
+        pending = lines.pop()
+        if len(pending) > MAX_ELEMENT_SIZE:
+            raise ValueError(f"NDJSON line is longer than {MAX_ELEMENT_SIZE} characters")
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+        chunk = f.read(READ_CHUNK_SIZE)
+    if pending.strip():
+        yield json.loads(pending)
+
+
+def iter_tours_file(f: TextIO) -> Iterator[dict]:
+    """
+    Stream tour dicts from a JSON array or NDJSON file.
+
+    Raises:
+        ValueError: If the file is not valid JSON / NDJSON
+    """
+    first_chunk = f.read(READ_CHUNK_SIZE)
+    if first_chunk.lstrip().startswith("["):
+        return _iter_json_array(f, first_chunk)
+    return _iter_ndjson(f, first_chunk)
+
+
+def _to_row(tour_data: dict) -> dict:
+    """Validate tour data and convert it to a `tours` row."""
+    if not isinstance(tour_data, dict):
+        raise ValueError("Tour must be an object")
+    missing = [field for field in REQUIRED_FIELDS if tour_data.get(field) in (None, "")]
+    if missing:
+        raise KeyError(", ".join(missing))
+
+    row = {field: tour_data[field] for field in REQUIRED_FIELDS}
+    row.update({field: tour_data.get(field) for field in OPTIONAL_FIELDS})
+    # Convert date strings to naive datetime objects
+    for field in ("start_date", "end_date"):
+        if isinstance(row[field], str):
+            row[field] = datetime.fromisoformat(row[field])
+        if row[field].tzinfo is not None:
+            row[field] = row[field].replace(tzinfo=None)
+    row["price"] = float(row["price"])
+    return row
+
+
+async def _insert_batch(db: AsyncSession, rows: list[dict]) -> int:
+    """Insert rows skipping existing (title, agency) pairs; returns inserted count."""
+    stmt = (
+        insert(Tour)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["title", "agency"])
+        .returning(Tour.id)
+    )
+    result = await db.execute(stmt)
+    inserted = len(result.all())
+    await db.commit()
+    return inserted
+
+
+async def migrate_tours(
+    db: AsyncSession,
+    json_file_path: str = None,
+    migration_limit: Optional[int] = None,
+    clear_database_first: bool = False,
+    batch_size: int = BATCH_SIZE
+) -> TourImportReport:
     """
     Migrate tours from JSON file to database.
-    
+
+    The file is parsed incrementally and rows are written in batches of
+    `batch_size` with `INSERT ... ON CONFLICT (title, agency) DO NOTHING`,
+    so duplicates are skipped by the unique index instead of a SELECT per
+    tour. Every batch is committed: after a parse error the batches written
+    so far stay in the database, and re-running the import is idempotent.
+
     Args:
         db: Async SQLAlchemy session
-        json_file_path: Path to JSON file with tours data (optional)
-    
+        json_file_path: Path to JSON array or NDJSON file with tours data (optional)
+        migration_limit: Maximum number of tours to read from the file (None = all)
+        clear_database_first: Truncate all tables before importing
+        batch_size: Number of rows per INSERT statement (1..MAX_BATCH_SIZE)
+
     Returns:
-        int: Number of tours migrated
-        
+        TourImportReport: Counters, throughput (rows/sec) and memory high-water mark
+
     Raises:
-        ValueError: If JSON file not found or invalid
-        
+        ValueError: If JSON file not found or invalid, or batch_size is out of range
+
     Example JSON structure:
         [
             {
@@ -38,73 +208,70 @@ async def migrate_tours(db: AsyncSession, json_file_path: str = None) -> int:
             }
         ]
     """
+    if not 1 <= batch_size <= MAX_BATCH_SIZE:
+        raise ValueError(f"batch_size must be between 1 and {MAX_BATCH_SIZE}, got {batch_size}")
+
     # Default path to tours.json in project root
     if json_file_path is None:
         project_root = Path(__file__).parent.parent.parent.parent.parent
         json_file_path = project_root / "tours.json"
     else:
         json_file_path = Path(json_file_path)
-    
+
     # Check if file exists
     if not json_file_path.exists():
         error_msg = f"Tours JSON file not found at: {json_file_path}"
         logger.error(error_msg)
         raise ValueError(error_msg)
-    
-    # Read and parse JSON file
+
+    if clear_database_first:
+        logger.info("Clearing database before tours migration")
+        await clear_database(db)
+
+    report = TourImportReport()
+    started = time.perf_counter()
+    batch: list[dict] = []
+
     try:
         with open(json_file_path, 'r', encoding='utf-8') as f:
-            tours_data = json.load(f)
+            for tour_data in iter_tours_file(f):
+                if migration_limit is not None and report.processed >= migration_limit:
+                    break
+                report.processed += 1
+
+                try:
+                    batch.append(_to_row(tour_data))
+                except KeyError as e:
+                    report.invalid += 1
+                    logger.warning(f"Missing required field in tour data: {e}")
+                    continue
+                except (ValueError, TypeError, AttributeError) as e:
+                    report.invalid += 1
+                    logger.warning(f"Invalid tour '{tour_data.get('title', 'Unknown') if isinstance(tour_data, dict) else 'Unknown'}': {e}")
+                    continue
+
+                if len(batch) >= batch_size:
+                    report.inserted += await _insert_batch(db, batch)
+                    batch.clear()
     except json.JSONDecodeError as e:
         error_msg = f"Invalid JSON format in {json_file_path}: {str(e)}"
         logger.error(error_msg)
         raise ValueError(error_msg)
-    except Exception as e:
+    except OSError as e:
         error_msg = f"Error reading file {json_file_path}: {str(e)}"
         logger.error(error_msg)
         raise ValueError(error_msg)
-    
-    if not isinstance(tours_data, list):
-        raise ValueError("JSON file must contain an array of tours")
-    
-    migrated_count = 0
-    
-    # Migrate each tour
-    for tour_data in tours_data:
-        try:
-            # Convert date strings to datetime objects if needed
-            if isinstance(tour_data.get('start_date'), str):
-                tour_data['start_date'] = datetime.fromisoformat(tour_data['start_date'])
-            if isinstance(tour_data.get('end_date'), str):
-                tour_data['end_date'] = datetime.fromisoformat(tour_data['end_date'])
-            
-            # Check if tour already exists (by title and agency)
-            stmt = select(Tour).where(
-                Tour.title == tour_data['title'],
-                Tour.agency == tour_data['agency']
-            )
-            result = await db.execute(stmt)
-            existing_tour = result.scalar_one_or_none()
-            
-            if existing_tour:
-                logger.info(f"Tour '{tour_data['title']}' from '{tour_data['agency']}' already exists, skipping...")
-                continue
-            
-            # Create new tour
-            tour = Tour(**tour_data)
-            db.add(tour)
-            migrated_count += 1
-            logger.info(f"Migrating tour: {tour_data['title']}")
-            
-        except KeyError as e:
-            logger.error(f"Missing required field in tour data: {e}")
-            continue
-        except Exception as e:
-            logger.error(f"Error migrating tour '{tour_data.get('title', 'Unknown')}': {str(e)}")
-            continue
-    
-    # Commit all changes
-    await db.commit()
-    logger.info(f"Successfully migrated {migrated_count} tours")
-    
-    return migrated_count
+
+    if batch:
+        report.inserted += await _insert_batch(db, batch)
+
+    report.seconds = round(time.perf_counter() - started, 3)
+    report.rows_per_sec = round(report.processed / report.seconds, 1) if report.seconds else 0.0
+    report.skipped_existing = report.processed - report.inserted - report.invalid
+    report.peak_memory_mb = _peak_memory_mb()
+
+    logger.info(
+        f"Tours migration finished: {report.inserted} inserted, {report.skipped_existing} existing, "
+        f"{report.invalid} invalid, {report.rows_per_sec} rows/sec, peak memory {report.peak_memory_mb} MB"
+    )
+    return report
@@ -0,0 +1,60 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any
+
+
+def _json_default(value: Any) -> str:
+    """Serialize values that json does not support natively."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Unsupported cursor value: {value!r}")
+
+
+def encode_cursor(sort: str, values: tuple) -> str:
+    """
+    Encode keyset position into an opaque URL-safe cursor.
+
+    Args:
+        sort: Sort key the page was ordered by (e.g. "start_date", "-price")
+        values: Values of the sort columns of the last returned row
+
+    Returns:
+        str: Opaque cursor string
+
+    Example:
+        >>> cursor = encode_cursor("start_date", (datetime(2026, 2, 10), 42))
+        >>> decode_cursor(cursor)
+        ('start_date', ['2026-02-10T00:00:00', 42])
+    """
+    payload = json.dumps({"s": sort, "v": list(values)}, default=_json_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, list]:
+    """
+    Decode cursor produced by encode_cursor.
+
+    Args:
+        cursor: Opaque cursor string
+
+    Returns:
+        tuple[str, list]: Sort key and raw (JSON) values of the last row
+
+    Raises:
+        ValueError: If cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        sort, values = payload["s"], payload["v"]
+    except (ValueError, TypeError, KeyError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+    if not isinstance(sort, str) or not isinstance(values, list):
+        raise ValueError("Invalid cursor payload")
+    # Sort columns are never NULL and hold only numbers, strings and datetimes
+    if any(value is None or isinstance(value, (bool, list, dict)) for value in values):
+        raise ValueError("Invalid cursor values")
+
+    return sort, values
@@ -34,10 +34,36 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = "tour_agency_db"
     POSTGRES_PORT: int = 5432
 
+    # Database engine and connection pool settings
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800
+    DB_STATEMENT_CACHE_SIZE: int = 500
+
     # Security settings
     SECRET_KEY: str = "your-secret-key-change-this-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # bcrypt thread pool: 0 workers hashes on the event loop
+    PASSWORD_HASH_WORKERS: int = 4
+    # Queued + running hash operations before requests are rejected with 503
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # Authenticated user cache settings
+    USER_CACHE_ENABLED: bool = True
+    USER_CACHE_TTL: float = 60.0
+    USER_CACHE_MAXSIZE: int = 10_000
+    # Lifetime of a worker's local copy when a shared backend is used: an
+    # invalidation does not reach other workers' local copies
+    USER_CACHE_LOCAL_TTL: float = 5.0
+    # "none" or "memory" (in-process stand-in for a shared cache)
+    USER_CACHE_SHARED_BACKEND: str = "none"
+
+    # Sales stats: seconds between background rebuilds, 0 disables the job
+    SALES_STATS_RECONCILE_INTERVAL: float = 3600.0
 
     @property
     def DATABASE_URL(self) -> str:
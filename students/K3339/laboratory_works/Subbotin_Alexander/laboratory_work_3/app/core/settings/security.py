@@ -1,3 +1,5 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
@@ -5,6 +7,18 @@ import bcrypt
 from .config import settings
 
 
+class PasswordHasherBusy(Exception):
+    """Raised when too many password hash operations are already queued."""
+
+
+# bcrypt releases the GIL, so a small thread pool runs hashes in parallel
+# without blocking the event loop. PASSWORD_HASH_WORKERS=0 hashes inline.
+# The pool is created on first use, so it is recreated after
+# shutdown_password_hasher (e.g. by the next app lifespan in tests).
+_hash_executor: Optional[ThreadPoolExecutor] = None
+_hash_pending = 0
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(
         plain_password.encode('utf-8'),
@@ -17,6 +31,37 @@ def get_password_hash(password: str) -> str:
         bcrypt.gensalt()
     ).decode('utf-8')
 
+async def _run_hash(func, *args):
+    """Run a bcrypt call in the hash pool, rejecting work beyond the queue limit."""
+    global _hash_executor, _hash_pending
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return func(*args)
+    if _hash_pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise PasswordHasherBusy("Too many concurrent password operations")
+    if _hash_executor is None:
+        _hash_executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt"
+        )
+    _hash_pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, func, *args)
+    finally:
+        _hash_pending -= 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_hash(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_hash(get_password_hash, password)
+
+def shutdown_password_hasher():
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
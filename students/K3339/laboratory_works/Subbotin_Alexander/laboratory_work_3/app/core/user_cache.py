@@ -0,0 +1,263 @@
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, asdict, fields
+from datetime import datetime
+from typing import Optional
+
+from app.core.settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """
+    Read-only snapshot of an authenticated user.
+
+    Returned by get_current_user instead of the ORM instance, so a cached
+    principal is never attached to (or flushed by) a request session.
+    The password hash is deliberately not cached: endpoints that need it
+    load the user from the database.
+    """
+    id: int
+    username: str
+    email: str
+    is_active: bool
+    is_admin: bool
+    created_at: datetime
+
+    @classmethod
+    def from_model(cls, user) -> "CachedUser":
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            is_active=user.is_active,
+            is_admin=user.is_admin,
+            created_at=user.created_at,
+        )
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["created_at"] = self.created_at.isoformat() if self.created_at else None
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CachedUser":
+        # Unknown keys (e.g. entries written by an older version) are ignored
+        known = {field.name: data.get(field.name) for field in fields(cls)}
+        created_at = known["created_at"]
+        return cls(**{**known, "created_at": datetime.fromisoformat(created_at) if created_at else None})
+
+
+class SharedCacheBackend(ABC):
+    """
+    Cache shared between worker processes (e.g. Redis).
+
+    Values are JSON-compatible dicts; implementations handle serialization.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: dict, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove all cached users."""
+        ...
+
+
+class InMemorySharedBackend(SharedCacheBackend):
+    """Process-local stand-in for a shared backend, for development and tests."""
+
+    def __init__(self):
+        self._data: dict[str, tuple[float, dict]] = {}
+
+    async def get(self, key: str) -> Optional[dict]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            self._data.pop(key, None)
+            return None
+        return value
+
+    async def set(self, key: str, value: dict, ttl: float) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    async def clear(self) -> None:
+        self._data.clear()
+
+
+class UserCache:
+    """
+    TTL + LRU cache of authenticated users keyed by token subject (username).
+
+    The local level is a plain OrderedDict: all access happens on the event
+    loop thread, so no locking is needed. An optional shared backend is
+    consulted on local misses. Entries are removed explicitly by the user
+    CRUD functions.
+
+    invalidate() only reaches this process and the shared backend: with
+    several workers, other processes keep their local copy until it
+    expires. Local copies therefore live local_ttl (a few seconds) when a
+    shared backend is plugged in, the full ttl applies to the shared entry.
+
+    A miss is filled from the database after an await, so an invalidate()
+    may run in between; pass the generation() taken before the read to
+    set() and a stale user is not cached.
+
+    Example:
+        >>> user = await user_cache.get("john_doe")
+        >>> if user is None:
+        ...     generation = user_cache.generation("john_doe")
+        ...     user = await user_cache.set(await crud.get_user_by_username(db, "john_doe"), generation)
+    """
+
+    def __init__(self, maxsize: int, ttl: float, shared: Optional[SharedCacheBackend] = None,
+                 local_ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.local_ttl = ttl if local_ttl is None else min(ttl, local_ttl)
+        self.shared = shared
+        self._entries: OrderedDict[str, tuple[float, CachedUser]] = OrderedDict()
+        # Per-username invalidation counters; the epoch is bumped when the
+        # dict is reset, which outdates every generation handed out before
+        self._epoch = 0
+        self._generations: dict[str, int] = {}
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _key(username: str) -> str:
+        return f"user:{username}"
+
+    def _entry_ttl(self) -> float:
+        return self.local_ttl if self.shared is not None else self.ttl
+
+    def _store_local(self, user: CachedUser) -> None:
+        self._entries[user.username] = (time.monotonic() + self._entry_ttl(), user)
+        self._entries.move_to_end(user.username)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get(self, username: str) -> Optional[CachedUser]:
+        item = self._entries.get(username)
+        if item is not None:
+            expires_at, user = item
+            if expires_at >= time.monotonic():
+                self._entries.move_to_end(username)
+                self.hits += 1
+                return user
+            del self._entries[username]
+            self.expirations += 1
+
+        if self.shared is not None:
+            data = await self.shared.get(self._key(username))
+            if data is not None:
+                user = CachedUser.from_dict(data)
+                self._store_local(user)
+                self.shared_hits += 1
+                return user
+
+        self.misses += 1
+        return None
+
+    def generation(self, username: str) -> tuple[int, int]:
+        """Token to pass to set(); it changes when the username is invalidated."""
+        return self._epoch, self._generations.get(username, 0)
+
+    async def set(self, user, generation: Optional[tuple[int, int]] = None) -> CachedUser:
+        """
+        Cache a User model (or CachedUser) and return the cached snapshot.
+
+        If generation is given and the username was invalidated since it was
+        taken, the snapshot is returned without being cached.
+        """
+        cached = user if isinstance(user, CachedUser) else CachedUser.from_model(user)
+        if generation is not None and generation != self.generation(cached.username):
+            logger.debug(f"User cache: stale read of {cached.username} not cached")
+            return cached
+        self._store_local(cached)
+        if self.shared is not None:
+            await self.shared.set(self._key(cached.username), cached.to_dict(), self.ttl)
+        return cached
+
+    async def invalidate(self, *usernames: Optional[str]) -> None:
+        for username in filter(None, usernames):
+            if len(self._generations) >= self.maxsize and username not in self._generations:
+                self._epoch += 1
+                self._generations.clear()
+            self._generations[username] = self._generations.get(username, 0) + 1
+            self._entries.pop(username, None)
+            if self.shared is not None:
+                await self.shared.delete(self._key(username))
+            self.invalidations += 1
+            logger.debug(f"User cache invalidated: {username}")
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._epoch += 1
+        self._generations.clear()
+
+    async def clear_all(self) -> None:
+        """Drop local and shared entries, e.g. after the users table was wiped."""
+        self.clear()
+        if self.shared is not None:
+            await self.shared.clear()
+        logger.info("User cache cleared")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.shared_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "local_ttl_seconds": self._entry_ttl(),
+            "shared_backend": type(self.shared).__name__ if self.shared else None,
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.shared_hits) / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+user_cache = UserCache(
+    maxsize=settings.USER_CACHE_MAXSIZE,
+    ttl=settings.USER_CACHE_TTL,
+    local_ttl=settings.USER_CACHE_LOCAL_TTL,
+)
+
+
+def configure_user_cache(shared: Optional[SharedCacheBackend] = None) -> UserCache:
+    """
+    Plug a shared backend into the user cache (call on application startup).
+
+    Example:
+        >>> configure_user_cache(shared=InMemorySharedBackend())
+    """
+    user_cache.shared = shared
+    user_cache.clear()
+    return user_cache
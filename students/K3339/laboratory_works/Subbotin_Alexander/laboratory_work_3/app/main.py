@@ -1,12 +1,17 @@
+import asyncio
 import logging
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
-from app.api.routers import auth, tours, reservations, reviews
+from app.api.routers import auth, tours, reservations, reviews, diagnostics
 from app.api.routers.database_manager import database_manage_router
 from app.core.database import init_db, close_db, async_session_local
 from app.core.logging_config import setup_logging
+from app.core.settings.config import settings
+from app.core.settings.security import PasswordHasherBusy, shutdown_password_hasher
+from app.core.user_cache import configure_user_cache, InMemorySharedBackend
 from app.core.db import crud
 
 # Setup logging
@@ -38,6 +43,17 @@ async def create_default_admin():
             logger.info("Default admin already exists")
 
 
+async def reconcile_sales_stats_periodically(interval: float):
+    """Rebuild sales stats every `interval` seconds to repair counter drift."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with async_session_local() as db:
+                await crud.reconcile_sales_stats(db)
+        except Exception:
+            logger.exception("Sales stats reconcile failed")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -58,12 +74,28 @@ async def lifespan(app: FastAPI):
     # Create default admin
     await create_default_admin()
     
+    # Build sales stats on first start (no-op when they already exist)
+    async with async_session_local() as db:
+        await crud.get_admin_stats(db)
+    reconcile_task = None
+    if settings.SALES_STATS_RECONCILE_INTERVAL > 0:
+        reconcile_task = asyncio.create_task(
+            reconcile_sales_stats_periodically(settings.SALES_STATS_RECONCILE_INTERVAL)
+        )
+    
+    if settings.USER_CACHE_SHARED_BACKEND == "memory":
+        configure_user_cache(shared=InMemorySharedBackend())
+        logger.info("User cache: in-memory shared backend enabled")
+    
     yield
     
     # Shutdown
     logger.info("Shutting down Tour Agency API...")
+    if reconcile_task is not None:
+        reconcile_task.cancel()
     await close_db()
     logger.info("Database connections closed")
+    shutdown_password_hasher()
 
 
 app = FastAPI(
@@ -82,13 +114,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    """Shed login/registration bursts instead of queueing them without limit."""
+    logger.warning(f"Password hasher busy: {request.method} {request.url.path}")
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(tours.router)
 app.include_router(reservations.router)
 app.include_router(reviews.router)
+app.include_router(diagnostics.router)
 app.include_router(database_manage_router)
 
 
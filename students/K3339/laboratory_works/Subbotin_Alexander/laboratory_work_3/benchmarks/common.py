@@ -0,0 +1,88 @@
+"""
+Shared helpers for local benchmarks.
+
+Benchmarks run against the database configured in `.env` (see Settings)
+and are started from the project root, e.g.:
+
+    python -m benchmarks.tours_pagination --tours 300000
+"""
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db.models.tour import Tour
+
+CITIES = ["Париж", "Рим", "Токио", "Саппоро", "Берлин", "Прага", "Лиссабон", "Стамбул", "Барселона", "Вена"]
+WORDS = ["горы", "море", "музеи", "гастрономия", "фестиваль", "круиз", "замки", "термальные", "источники", "сафари"]
+
+SEED_BATCH_SIZE = 5_000
+
+
+def fake_tour(i: int, rng: random.Random) -> dict:
+    start = datetime(2026, 1, 1) + timedelta(days=rng.randrange(0, 730), hours=rng.randrange(0, 24))
+    city = rng.choice(CITIES)
+    words = " ".join(rng.sample(WORDS, 3))
+    return {
+        "title": f"Тур #{i} {city}: {words}",
+        "agency": f"Agency {rng.randrange(1, 500)}",
+        "description": f"Путешествие в {city}: {words}. " * 3,
+        "start_date": start,
+        "end_date": start + timedelta(days=rng.randrange(2, 15)),
+        "price": round(rng.uniform(100, 250_000), 2),
+        "city": city,
+        "payment_terms": "100% предоплата",
+    }
+
+
+async def seed_tours(db: AsyncSession, count: int, seed: int = 42) -> int:
+    """
+    Make sure the tours table contains at least `count` rows.
+
+    Rows are inserted in batches with executemany, so seeding a few hundred
+    thousand tours takes seconds rather than minutes.
+
+    Returns:
+        int: Number of rows inserted
+    """
+    existing = await db.scalar(select(func.count()).select_from(Tour))
+    missing = count - existing
+    if missing <= 0:
+        return 0
+
+    rng = random.Random(seed)
+    inserted = 0
+    while inserted < missing:
+        size = min(SEED_BATCH_SIZE, missing - inserted)
+        rows = [fake_tour(existing + inserted + i, rng) for i in range(size)]
+        await db.execute(insert(Tour), rows)
+        await db.commit()
+        inserted += size
+        print(f"  seeded {existing + inserted}/{count} tours", end="\r")
+    print()
+    return inserted
+
+
+async def measure(fn: Callable[[], Awaitable], repeat: int = 20, warmup: int = 3) -> dict:
+    """
+    Run async callable several times and return latency stats in milliseconds.
+    """
+    for _ in range(warmup):
+        await fn()
+
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    samples.sort()
+    return {
+        "median": statistics.median(samples),
+        "p95": samples[max(0, int(len(samples) * 0.95) - 1)],
+        "max": samples[-1],
+    }
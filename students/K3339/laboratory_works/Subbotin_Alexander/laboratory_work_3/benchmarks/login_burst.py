@@ -0,0 +1,79 @@
+"""
+Load test: GET /tours latency during a burst of concurrent logins.
+
+Runs against a live server. Start it once with the default bcrypt thread
+pool and once with hashing on the event loop, then compare p99:
+
+    PASSWORD_HASH_WORKERS=4 uvicorn app.main:app --port 8000   # after
+    PASSWORD_HASH_WORKERS=0 uvicorn app.main:app --port 8000   # before
+
+    python -m benchmarks.login_burst --url http://localhost:8000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+async def _login_worker(client: httpx.AsyncClient, username: str, password: str, stop: asyncio.Event, stats: dict):
+    while not stop.is_set():
+        resp = await client.post("/auth/login", data={"username": username, "password": password})
+        stats[resp.status_code] = stats.get(resp.status_code, 0) + 1
+
+
+async def _browse_worker(client: httpx.AsyncClient, stop: asyncio.Event, latencies: list[float]):
+    while not stop.is_set():
+        started = time.perf_counter()
+        resp = await client.get("/tours/", params={"limit": 20})
+        resp.raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+
+
+async def main(url: str, logins: int, browsers: int, duration: float) -> None:
+    limits = httpx.Limits(max_connections=logins + browsers + 5)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        username = f"bench_{uuid.uuid4().hex[:8]}"
+        password = "benchmark-password"
+        resp = await client.post("/auth/register", json={
+            "username": username, "email": f"{username}@example.com", "password": password,
+        })
+        resp.raise_for_status()
+
+        for phase, login_workers in (("idle", 0), ("login burst", logins)):
+            stop = asyncio.Event()
+            latencies: list[float] = []
+            login_stats: dict[int, int] = {}
+            tasks = [asyncio.create_task(_browse_worker(client, stop, latencies)) for _ in range(browsers)]
+            tasks += [
+                asyncio.create_task(_login_worker(client, username, password, stop, login_stats))
+                for _ in range(login_workers)
+            ]
+            await asyncio.sleep(duration)
+            stop.set()
+            await asyncio.gather(*tasks)
+
+            print(f"\n[{phase}] {len(latencies)} GET /tours requests, logins by status: {login_stats or '-'}")
+            print(
+                f"  p50 {statistics.median(latencies):.1f} ms | "
+                f"p95 {_percentile(latencies, 0.95):.1f} ms | "
+                f"p99 {_percentile(latencies, 0.99):.1f} ms | "
+                f"max {max(latencies):.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--logins", type=int, default=20, help="Concurrent login loops")
+    parser.add_argument("--browsers", type=int, default=10, help="Concurrent GET /tours loops")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per phase")
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.logins, args.browsers, args.duration))
@@ -0,0 +1,75 @@
+"""
+Benchmark: streaming bulk tours import.
+
+Generates a tours file (JSON array or NDJSON) with fake data and imports it
+twice with services.migrate_tours: the first run inserts, the second one
+shows the cost of skipping existing (title, agency) pairs. Prints rows/sec
+and the process memory high-water mark, which should stay flat as --tours
+grows.
+
+Usage:
+    python -m benchmarks.tours_import --tours 1000000 --format ndjson
+"""
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+from pathlib import Path
+
+from app.core.database import async_session_local, engine, init_db
+from app.core.db.services import migrate_tours
+from app.core.db.services.migrate_tours import MAX_BATCH_SIZE
+from benchmarks.common import fake_tour
+
+
+def write_tours_file(path: Path, count: int, fmt: str, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        if fmt == "json":
+            f.write("[\n")
+        for i in range(count):
+            tour = fake_tour(i, rng)
+            tour["title"] = f"Импорт {tour['title']}"
+            tour["start_date"] = tour["start_date"].isoformat()
+            tour["end_date"] = tour["end_date"].isoformat()
+            line = json.dumps(tour, ensure_ascii=False)
+            if fmt == "json":
+                f.write(line + (",\n" if i < count - 1 else "\n"))
+            else:
+                f.write(line + "\n")
+        if fmt == "json":
+            f.write("]\n")
+
+
+async def main(tours: int, fmt: str, batch_size: int, clear: bool) -> None:
+    await init_db()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / f"tours.{fmt}"
+        write_tours_file(path, tours, fmt)
+        print(f"Generated {tours} tours, {path.stat().st_size / 1024 / 1024:.1f} MB")
+
+        for run, clear_first in (("first import", clear), ("re-import", False)):
+            async with async_session_local() as db:
+                report = await migrate_tours(
+                    db, str(path), clear_database_first=clear_first, batch_size=batch_size
+                )
+            print(
+                f"[{run}] {report.inserted} inserted, {report.skipped_existing} skipped, "
+                f"{report.invalid} invalid in {report.seconds:.2f} s | "
+                f"{report.rows_per_sec:,.0f} rows/sec | peak RSS {report.peak_memory_mb} MB"
+            )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tours", type=int, default=200_000)
+    parser.add_argument("--format", choices=("json", "ndjson"), default="ndjson")
+    parser.add_argument("--batch-size", type=int, default=1000, help=f"Rows per INSERT (1..{MAX_BATCH_SIZE})")
+    parser.add_argument("--clear", action="store_true", help="Truncate ALL tables before the first import")
+    args = parser.parse_args()
+    if not 1 <= args.batch_size <= MAX_BATCH_SIZE:
+        parser.error(f"--batch-size must be between 1 and {MAX_BATCH_SIZE}")
+    asyncio.run(main(args.tours, args.format, args.batch_size, args.clear))
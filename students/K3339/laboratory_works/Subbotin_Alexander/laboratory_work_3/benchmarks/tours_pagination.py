@@ -0,0 +1,67 @@
+"""
+Benchmark: LIMIT/OFFSET vs keyset (cursor) pagination of GET /tours.
+
+Seeds the tours table and measures the latency of fetching page N with both
+modes. Offset latency grows linearly with the page number, keyset latency
+stays flat because each page is a single index seek.
+
+Usage:
+    python -m benchmarks.tours_pagination --tours 300000 --page-size 100
+"""
+import argparse
+import asyncio
+
+from app.core.database import async_session_local, engine, init_db
+from app.core.db import crud
+from benchmarks.common import measure, seed_tours
+
+PAGES = (1, 10, 100, 1000)
+
+
+async def _cursor_for_page(db, page: int, page_size: int, sort: str):
+    """Walk pages by keyset and return `after` values that start the requested page."""
+    after = None
+    for _ in range(page - 1):
+        tours = await crud.get_all_tours(db, limit=page_size, sort=sort, after=after)
+        after = crud.tour_sort_values(tours[-1], sort)
+    return after
+
+
+async def main(tours: int, page_size: int, sort: str, repeat: int) -> None:
+    await init_db()
+    async with async_session_local() as db:
+        inserted = await seed_tours(db, tours)
+        print(f"Tours seeded: {inserted} new rows (target {tours})")
+
+        print(f"\n{'page':>6} | {'offset median':>14} | {'offset p95':>10} | {'cursor median':>14} | {'cursor p95':>10}")
+        print("-" * 68)
+        for page in PAGES:
+            if page * page_size > tours:
+                break
+            offset = (page - 1) * page_size
+            after = await _cursor_for_page(db, page, page_size, sort)
+
+            offset_stats = await measure(
+                lambda: crud.get_all_tours(db, limit=page_size, offset=offset, sort=sort),
+                repeat=repeat,
+            )
+            cursor_stats = await measure(
+                lambda: crud.get_all_tours(db, limit=page_size, sort=sort, after=after),
+                repeat=repeat,
+            )
+            print(
+                f"{page:>6} | {offset_stats['median']:>11.2f} ms | {offset_stats['p95']:>7.2f} ms | "
+                f"{cursor_stats['median']:>11.2f} ms | {cursor_stats['p95']:>7.2f} ms"
+            )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tours", type=int, default=300_000, help="Minimum number of tours in the table")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--sort", default="start_date", choices=crud.TOUR_SORT_KEYS)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.tours, args.page_size, args.sort, args.repeat))
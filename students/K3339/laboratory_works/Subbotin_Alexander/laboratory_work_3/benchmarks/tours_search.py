@@ -0,0 +1,66 @@
+"""
+Benchmark: full-text tour search vs ILIKE scan.
+
+Seeds the tours table (1M rows by default), refreshes planner statistics and
+measures crud.search_tours against the previous approach of OR-ing ILIKE
+filters over title, agency, city and description.
+
+Usage:
+    python -m benchmarks.tours_search --tours 1000000
+"""
+import argparse
+import asyncio
+
+from sqlalchemy import or_, select, text
+
+from app.core.database import async_session_local, engine, init_db
+from app.core.db import crud
+from app.core.db.models.tour import Tour
+from benchmarks.common import measure, seed_tours
+
+QUERIES = ("сафари", "Саппоро замки", "фестив", "Agency 42", "круиз море гастрономия")
+
+
+async def _ilike_search(db, query: str, limit: int):
+    pattern = f"%{query}%"
+    stmt = select(Tour).where(or_(
+        Tour.title.ilike(pattern),
+        Tour.agency.ilike(pattern),
+        Tour.city.ilike(pattern),
+        Tour.description.ilike(pattern),
+    )).limit(limit)
+    return (await db.execute(stmt)).scalars().all()
+
+
+async def main(tours: int, limit: int, repeat: int, with_ilike: bool) -> None:
+    await init_db()
+    async with async_session_local() as db:
+        inserted = await seed_tours(db, tours)
+        print(f"Tours seeded: {inserted} new rows (target {tours})")
+        await db.execute(text("ANALYZE tours"))
+        await db.commit()
+
+        header = f"{'query':<26} | {'fts median':>11} | {'fts p95':>9}"
+        if with_ilike:
+            header += f" | {'ilike median':>12}"
+        print("\n" + header)
+        print("-" * len(header))
+        for query in QUERIES:
+            fts = await measure(lambda: crud.search_tours(db, query, limit=limit), repeat=repeat)
+            line = f"{query:<26} | {fts['median']:>8.2f} ms | {fts['p95']:>6.2f} ms"
+            if with_ilike:
+                ilike = await measure(lambda: _ilike_search(db, query, limit), repeat=max(3, repeat // 5), warmup=1)
+                line += f" | {ilike['median']:>9.2f} ms"
+            print(line)
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tours", type=int, default=1_000_000, help="Minimum number of tours in the table")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--no-ilike", action="store_true", help="Skip the slow ILIKE baseline")
+    args = parser.parse_args()
+    asyncio.run(main(args.tours, args.limit, args.repeat, not args.no_ilike))
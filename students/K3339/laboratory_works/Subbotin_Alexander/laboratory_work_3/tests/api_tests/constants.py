@@ -3,6 +3,10 @@ NUMBER_OF_PUBLICATION_TO_MIGRATE: int = 10
 ALL_DATABASE_TABLES: set[str] = {
     "tours",
     "users",
+    "user_profiles",
     "reviews",
     "reservations",
+    "sales_stats",
+    "tour_sales_stats",
+    "customer_sales_stats",
 }
\ No newline at end of file
@@ -0,0 +1,80 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from app.core.db import crud
+
+
+class QueryCounter:
+    """Counts SQL statements sent by a session (savepoint bookkeeping excluded)."""
+
+    def __init__(self, session):
+        self.engine = session.bind.sync_engine
+        self.statements: list[str] = []
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith(("SAVEPOINT", "RELEASE", "ROLLBACK")):
+            self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+async def _create_user_and_tour(db_session):
+    name = f"qc_{uuid.uuid4().hex[:8]}"
+    user = await crud.create_user(db_session, username=name, email=f"{name}@example.com", password="password")
+    tour = await crud.create_tour(db_session, {
+        "title": f"Query count {name}",
+        "agency": "Test Agency",
+        "description": None,
+        "start_date": datetime(2026, 6, 1, 10),
+        "end_date": datetime(2026, 6, 8, 10),
+        "price": 1000.0,
+        "city": "Рим",
+        "payment_terms": None,
+    })
+    return user, tour
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_update_reservation_single_statement(db_session):
+    """Reservation update returns the reservation with its tour in one statement"""
+    user, tour = await _create_user_and_tour(db_session)
+    reservation = await crud.create_reservation(db_session, user.id, {"tour_id": tour.id})
+
+    # The endpoint used to load the reservation for the ownership check,
+    # update it and reload it with its tour (3-4 statements); now ownership
+    # is folded into the UPDATE and the tour is returned by it
+    with QueryCounter(db_session) as counter:
+        updated = await crud.update_reservation(db_session, reservation.id, {"notes": "after"}, user_id=user.id)
+        assert updated.tour.title == tour.title
+        assert updated.notes == "after"
+
+    assert counter.count == 1, counter.statements
+
+    # Someone else's reservation is not updated
+    assert await crud.update_reservation(db_session, reservation.id, {"notes": "x"}, user_id=user.id + 1) is None
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_create_reservation_query_count(db_session):
+    """Reservation creation checks tour and duplicates inside the INSERT"""
+    user, tour = await _create_user_and_tour(db_session)
+
+    with QueryCounter(db_session) as counter:
+        reservation = await crud.create_reservation(db_session, user.id, {"tour_id": tour.id})
+        assert reservation.tour.id == tour.id
+
+    # INSERT ... SELECT plus at most one tour lookup (4-5 statements before)
+    assert counter.count <= 2, counter.statements
+    assert await crud.create_reservation(db_session, user.id, {"tour_id": tour.id}) is None